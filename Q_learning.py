@@ -2,50 +2,76 @@ import numpy as np
 import random
 
 class QLearning:
-    def __init__(self, learning_rate=0.1, discount_factor=0.95, epsilon=0.1):
-        # Four components: parent selection, crossover, mutation, replacement
-        # Each component has 4 possible strategies (0,1,2,3)
-        self.num_strategies = 4
-        
-        # Initialize Q-table: state space = 256 (4^4), action space = 16 (4 components * 4 strategies)
-        self.q_table = np.zeros((256, 16))
-        
+    def __init__(self, learning_rate=0.1, discount_factor=0.95, epsilon=0.1, num_components=4, num_strategies=4,
+                 trace_decay=0.0, batch_size=1, allow_noop=True):
+        # Components: parent selection, crossover, mutation, replacement (and optionally the route operator)
+        # Each component has num_strategies possible strategies (0,1,2,3)
+        self.num_strategies = num_strategies
+        self.num_components = num_components
+
+        # Initialize Q-table: state space = 4^components (256 for 4), action space = components * 4 strategies
+        self.q_table = np.zeros((self.num_strategies ** num_components, num_components * self.num_strategies))
+
         self.learning_rate = learning_rate    # How much to update Q-values (0 to 1)
         self.discount_factor = discount_factor  # How much to value future rewards (0 to 1)
         self.epsilon = epsilon    # Exploration rate (0 to 1)
+        self.trace_decay = trace_decay    # Watkins's Q(lambda) eligibility trace decay, 0 is one-step Q-learning
+        self.batch_size = batch_size    # Transitions collected before the Q-table is updated, 1 updates every call
+        self.allow_noop = allow_noop    # Whether an action may set a component to the strategy it already has
+
+        # Place value of every component in the state index, and the component and new strategy of every action
+        self.place = num_strategies ** np.arange(num_components - 1, -1, -1)
+        self.action_component, self.action_strategy = np.divmod(np.arange(self.q_table.shape[1]), num_strategies)
+
+        # Whether every (state, action) changes the state is resolved once, actions then only look up their state's row
+        states = np.arange(len(self.q_table))
+        current = (states[:, None] // self.place[self.action_component]) % num_strategies
+        valid = np.ones(self.q_table.shape, dtype=bool) if allow_noop else current != self.action_strategy
+        # Added to a Q-table row, the mask keeps invalid actions out of the argmax
+        self.mask = np.where(valid, 0.0, -np.inf)
+        self.valid_actions = [np.flatnonzero(row).tolist() for row in valid]
+
+        # Pending transitions; credit[k, t] = (discount * trace_decay)^(t - k) is the share of transition t's
+        # TD error that goes to the earlier transition k in the same window, while the actions in between were greedy
+        self.window = np.zeros(batch_size, dtype=[('state', np.intp), ('action', np.intp), ('reward', np.float64), ('next_state', np.intp),
+                                                  ('greedy', np.bool_)])
+        self.pending = 0
+        lag = np.arange(batch_size)[None, :] - np.arange(batch_size)[:, None]
+        self.credit = np.where(lag >= 0, (discount_factor * trace_decay) ** np.maximum(lag, 0), 0.0)
 
     def get_state_index(self, strategies):
         """Convert current strategies to state index
-        strategies: tuple of (parent_selection, crossover, mutation, replacement)
+        strategies: tuple of (parent_selection, crossover, mutation, replacement[, route])
         each value is 0-3 representing which strategy is currently being used"""
-        p, c, m, r = strategies
-        return p * 64 + c * 16 + m * 4 + r
+        index = 0
+        for strategy in strategies:
+            index = index * self.num_strategies + strategy
+        return index
 
     def get_strategies_from_index(self, index):
         """Convert state index back to strategy numbers"""
-        p = index // 64
-        remainder = index % 64
-        c = remainder // 16
-        remainder = remainder % 16
-        m = remainder // 4
-        r = remainder % 4
-        return (p, c, m, r)
+        strategies = []
+        for _ in range(self.num_components):
+            index, strategy = divmod(index, self.num_strategies)
+            strategies.append(strategy)
+        return tuple(reversed(strategies))
 
     def choose_action(self, current_state):
         """Choose an action using epsilon-greedy strategy
         Returns: (component_to_change, new_strategy_value)"""
         if random.random() < self.epsilon:
             # Exploration: randomly choose component and new strategy
-            component = random.randint(0, 3)  # Choose which component to change
-            new_value = random.randint(0, 3)  # Choose new strategy value
-            return (component, new_value)
+            if self.allow_noop:
+                component = random.randint(0, self.num_components - 1)  # Choose which component to change
+                new_value = random.randint(0, self.num_strategies - 1)  # Choose new strategy value
+                return (component, new_value)
+            action_idx = random.choice(self.valid_actions[self.get_state_index(current_state)])
         else:
             # Exploitation: choose best action based on Q-values
             state_idx = self.get_state_index(current_state)
-            action_idx = np.argmax(self.q_table[state_idx])
-            component = action_idx // 4
-            new_value = action_idx % 4
-            return (component, new_value)
+            q_values = self.q_table[state_idx]
+            action_idx = int(np.argmax(q_values if self.allow_noop else q_values + self.mask[state_idx]))
+        return divmod(action_idx, self.num_strategies)
 
     def get_next_state(self, current_state, action):
         """Apply action to current state to get next state"""
@@ -55,27 +81,56 @@ class QLearning:
         return tuple(next_state)
 
     def update(self, current_state, action, reward, next_state):
-        """Update Q-value based on action and reward"""
-        # Get indices
-        current_idx = self.get_state_index(current_state)
-        next_idx = self.get_state_index(next_state)
+        """Record a transition; the Q-table is updated once batch_size transitions are pending"""
         component, new_value = action
-        action_idx = component * 4 + new_value
-
-        # Current Q-value
-        current_q = self.q_table[current_idx][action_idx]
-        
-        # Maximum Q-value for next state
-        next_max_q = np.max(self.q_table[next_idx])
-        
-        # Update Q-value using Q-learning formula
-        new_q = current_q + self.learning_rate * (
-            reward + self.discount_factor * next_max_q - current_q)
-        
-        self.q_table[current_idx][action_idx] = new_q
+        state_idx = self.get_state_index(current_state)
+        action_idx = component * self.num_strategies + new_value
+        next_idx = self.get_state_index(next_state)
+        if self.batch_size == 1:
+            # One-step update of a single cell, cheaper than a window of one
+            current_q = self.q_table[state_idx, action_idx]
+            next_max_q = self.q_table[next_idx].max()
+            self.q_table[state_idx, action_idx] = current_q + self.learning_rate * (
+                reward + self.discount_factor * next_max_q - current_q)
+            return
+        # An exploratory action that is not (one of) the best cuts the traces of the transitions before it
+        q_values = self.q_table[state_idx] if self.allow_noop else self.q_table[state_idx] + self.mask[state_idx]
+        greedy = self.q_table[state_idx, action_idx] >= q_values.max()
+        self.window[self.pending] = (state_idx, action_idx, reward, next_idx, greedy)
+        self.pending += 1
+        if self.pending == self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Update the Q-values of all pending transitions at once"""
+        if not self.pending:
+            return
+        transitions = self.window[:self.pending]
+        states, actions = transitions['state'], transitions['action']
+
+        # TD errors of the whole window, against the Q-values from before it
+        td_error = (transitions['reward'] + self.discount_factor * self.q_table[transitions['next_state']].max(axis=1)
+                    - self.q_table[states, actions])
+
+        # Watkins's Q(lambda): every transition also takes the decayed TD errors of the later ones in the window, up to
+        # the next non-greedy action, where the traces are cut; repeated (state, action) pairs add up
+        explored = np.cumsum(~transitions['greedy'])
+        credit = np.where(explored[None, :] == explored[:, None], self.credit[:self.pending, :self.pending], 0.0) @ td_error
+        np.add.at(self.q_table, (states, actions), self.learning_rate * credit)
+        self.pending = 0
+
+    def state(self):
+        """Copy of the Q-table and the pending transitions, for checkpoints"""
+        return {'q_table': self.q_table.copy(), 'window': self.window[:self.pending].copy()}
+
+    def restore(self, state):
+        self.q_table[:] = state['q_table']
+        self.pending = len(state['window'])
+        self.window[:self.pending] = state['window']
 
     def get_best_strategies(self):
         """Get the best performing combination of strategies"""
+        self.flush()
         # Find state with highest Q-value
         best_state_idx = np.argmax(np.max(self.q_table, axis=1))
-        return self.get_strategies_from_index(best_state_idx)
\ No newline at end of file
+        return self.get_strategies_from_index(best_state_idx)
@@ -0,0 +1,59 @@
+# Description: Benchmark of the MST route construction paths in route_generator.
+
+'''File Contains:
+    1. mst_weight function: This function is used to calculate the total edge length of an MST adjacency list.
+    2. benchmark_coordinates function: This function is used to time every MST construction on one set of coordinates.
+    3. main function: This function is used to run the benchmark on benchmark files and on random instances.'''
+
+
+# Importing required libraries
+import argparse
+import random
+import time
+from typing import List, Tuple
+from route_generator import construct_mst, construct_mst_dense, construct_mst_fast, dfs_traversal, calculate_total_distance, euclidean_distance
+from ttp_benchmark_solver import read_benchmark_file
+
+
+# mst_weight function is used to calculate the total edge length of an MST adjacency list
+def mst_weight(adj_list: List[List[int]], coordinates: List[Tuple[float, float]]) -> float:
+    return sum(euclidean_distance(coordinates[a], coordinates[b]) for a in range(len(adj_list)) for b in adj_list[a] if a < b)
+
+
+# benchmark_coordinates function is used to time every MST construction on one set of coordinates
+def benchmark_coordinates(label: str, coordinates: List[Tuple[float, float]], reference_limit: int):
+    constructions = [("heap (current)", construct_mst), ("dense prim", construct_mst_dense), ("k-d tree", construct_mst_fast)]
+    for construction_name, construct in constructions:
+        # The original construction is O(n^2 log n), skip it on the large instances
+        if construct is construct_mst and len(coordinates) > reference_limit:
+            print(f"{label:>24} | {construction_name:>15} | skipped (n > {reference_limit})")
+            continue
+
+        start_time = time.perf_counter()
+        adj_list = construct(coordinates)
+        elapsed = time.perf_counter() - start_time
+
+        route = dfs_traversal(adj_list)
+        route.append(route[0])
+        print(f"{label:>24} | {construction_name:>15} | {elapsed:9.3f}s | MST {mst_weight(adj_list, coordinates):14.1f} | tour {calculate_total_distance(route, coordinates):14.1f}")
+
+
+# main function is used to run the benchmark on benchmark files and on random instances
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark of the MST route construction')
+    parser.add_argument('--files', nargs='+', default=['DATASET/eil76.txt', 'DATASET/A280.txt', 'DATASET/dsj1000.txt'], help='Input benchmark files')
+    parser.add_argument('--random-sizes', nargs='*', type=int, default=[5000, 33810], help='Sizes of random uniform instances')
+    parser.add_argument('--reference-limit', type=int, default=2000, help='Largest instance the current construction is timed on')
+    args = parser.parse_args()
+
+    for file in args.files:
+        benchmark_coordinates(file, read_benchmark_file(file)['cities'], args.reference_limit)
+
+    rng = random.Random(0)
+    for size in args.random_sizes:
+        coordinates = [(rng.uniform(0, 1e6), rng.uniform(0, 1e6)) for _ in range(size)]
+        benchmark_coordinates(f"random-{size}", coordinates, args.reference_limit)
+
+
+if __name__ == "__main__":
+    main()
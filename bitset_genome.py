@@ -0,0 +1,158 @@
+# Description: This file contains the compact bitset genome for picking plans, backed by NumPy packed bits.
+
+'''File Contains:
+    1. PackedPlan class: This class is used to store a picking plan as packed bits (1 bit per item instead of a Python int).
+    2. ByteTables class: This class is used to sum item weights or profits of packed plans with per-byte lookup tables.
+    3. pack_population function: This function is used to pack a whole population matrix into row views of one packed array.
+    4. as_genome function: This function is used to convert a boolean plan into the same genome type as a reference plan.
+    5. plans_from_matrix function: This function is used to convert a boolean plan matrix into plans of the same genome type as a reference plan.'''
+
+''' Inside PackedPlan class
+    1. from_list / from_bool functions: These functions are used to build a packed plan from a 0/1 list or a boolean array.
+    2. to_bool / to_list functions: These functions are used to unpack the plan.
+    3. __getitem__ / __setitem__ functions: These functions give list-style access, so list-based operator code still works
+       (a slice is unpacked into a new list, a copy rather than a view; zero-copy access is per plan, see pack_population).
+    4. range_mask / random_mask functions: These functions are used to build packed crossover masks.
+    5. blend function: This function is used to take the bits under a mask from another plan (bitwise crossover).
+    6. flip function: This function is used to flip the given bit indices in place.'''
+
+
+# Importing required libraries
+import random
+import numpy as np
+from typing import List
+
+# Number of set bits of every byte value
+POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+# PackedPlan class is used to store a picking plan as packed bits (1 bit per item instead of a Python int)
+class PackedPlan:
+    __slots__ = ('bits', 'length')
+
+    # bits is little-endian packed, bit i of the plan is bit (i % 8) of byte i // 8
+    def __init__(self, bits: np.ndarray, length: int):
+        self.bits = bits
+        self.length = length
+
+    @classmethod
+    def from_bool(cls, picked: np.ndarray) -> 'PackedPlan':
+        picked = np.asarray(picked, dtype=bool)
+        return cls(np.packbits(picked, bitorder='little'), len(picked))
+
+    @classmethod
+    def from_list(cls, picking_plan: List[int]) -> 'PackedPlan':
+        # Same picked test as the list genome: only a value of exactly 1 is picked
+        return cls.from_bool(np.asarray(picking_plan) == 1)
+
+    def to_bool(self) -> np.ndarray:
+        return np.unpackbits(self.bits, count=self.length, bitorder='little').astype(bool)
+
+    def to_list(self) -> List[int]:
+        return np.unpackbits(self.bits, count=self.length, bitorder='little').tolist()
+
+    def __array__(self, dtype=None, copy=None):
+        unpacked = np.unpackbits(self.bits, count=self.length, bitorder='little')
+        return unpacked if dtype is None else unpacked.astype(dtype)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __getitem__(self, index):
+        # List code shuffles, reverses and concatenates the slices it takes, so a slice is an unpacked copy
+        if isinstance(index, slice):
+            return self.to_list()[index]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("picking plan index out of range")
+        return int(self.bits[index >> 3] >> (index & 7)) & 1
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            picked = self.to_bool()
+            picked[index] = np.asarray(value) == 1
+            self.bits[:] = np.packbits(picked, bitorder='little')
+            return
+        if index < 0:
+            index += self.length
+        if value == 1:
+            self.bits[index >> 3] |= np.uint8(1 << (index & 7))
+        else:
+            self.bits[index >> 3] &= np.uint8(~(1 << (index & 7)) & 0xFF)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PackedPlan):
+            return self.length == other.length and np.array_equal(self.bits, other.bits)
+        return self.to_list() == list(other)
+
+    def __repr__(self) -> str:
+        return f"PackedPlan({''.join(map(str, self.to_list()))})"
+
+    def copy(self) -> 'PackedPlan':
+        return PackedPlan(self.bits.copy(), self.length)
+
+    def count(self) -> int:
+        """Number of picked items (popcount)."""
+        return int(POPCOUNT[self.bits].sum())
+
+    def nonzero(self) -> np.ndarray:
+        return np.flatnonzero(self.to_bool())
+
+    def range_mask(self, start: int, end: int) -> np.ndarray:
+        """Packed mask with the bits start..end-1 set."""
+        picked = np.zeros(self.length, dtype=bool)
+        picked[start:end] = True
+        return np.packbits(picked, bitorder='little')
+
+    def random_mask(self) -> np.ndarray:
+        """Packed mask with every bit set with probability 0.5, drawn from the random module."""
+        return np.frombuffer(random.randbytes(len(self.bits)), dtype=np.uint8).copy()
+
+    def blend(self, other: 'PackedPlan', mask: np.ndarray) -> 'PackedPlan':
+        """New plan with the bits of other where mask is set and the bits of self elsewhere."""
+        return PackedPlan((self.bits & ~mask) | (other.bits & mask), self.length)
+
+    def flip(self, indices) -> None:
+        indices = np.asarray(indices, dtype=np.intp)
+        np.bitwise_xor.at(self.bits, indices >> 3, (1 << (indices & 7)).astype(np.uint8))
+
+
+# ByteTables class is used to sum item weights or profits of packed plans with per-byte lookup tables
+class ByteTables:
+    def __init__(self, values: np.ndarray):
+        # table[j, b] is the sum of the values of the items whose bits are set in byte value b at byte position j
+        num_bytes = (len(values) + 7) // 8
+        padded = np.zeros(num_bytes * 8)
+        padded[:len(values)] = values
+        bit_matrix = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1, bitorder='little').astype(np.float64)
+        self.table = padded.reshape(num_bytes, 8) @ bit_matrix.T
+        self.positions = np.arange(num_bytes)
+
+    def total(self, bits: np.ndarray) -> np.ndarray:
+        """Sum for one packed plan (1-D bits) or for each row of a packed matrix."""
+        return self.table[self.positions, bits].sum(axis=-1)
+
+
+# pack_population function is used to pack a whole population matrix into row views of one packed array
+def pack_population(picking_plans: np.ndarray) -> List[PackedPlan]:
+    packed = np.packbits(np.asarray(picking_plans, dtype=bool), axis=1, bitorder='little')
+    # Every plan is a zero-copy view of its row
+    return [PackedPlan(row, picking_plans.shape[1]) for row in packed]
+
+
+# as_genome function is used to convert a boolean plan into the same genome type as a reference plan
+def as_genome(picked: np.ndarray, reference):
+    if isinstance(reference, PackedPlan):
+        return PackedPlan.from_bool(picked)
+    return np.asarray(picked, dtype=int).tolist()
+
+
+# plans_from_matrix function is used to convert a boolean plan matrix into plans of the same genome type as a reference plan
+def plans_from_matrix(picking_plans: np.ndarray, reference) -> list:
+    if isinstance(reference, PackedPlan):
+        return pack_population(picking_plans)
+    return np.asarray(picking_plans, dtype=int).tolist()
@@ -0,0 +1,143 @@
+# Description: This file contains the checkpoints of long GA runs: periodic, atomic snapshots of the run state and loading them back for a resume.
+
+'''File Contains:
+    1. Checkpointer class: This class is used to decide when a checkpoint is due and write it, on the result writer thread when one is given.
+    2. load_checkpoint function: This function is used to read the latest complete checkpoint of a directory.
+    3. rng_state function: This function is used to capture the Python and NumPy random number generator states.
+    4. restore_rng_state function: This function is used to put captured random number generator states back.'''
+
+''' Inside Checkpointer class
+    1. due function: This function is used to check, with one clock read, whether the interval has passed.
+    2. save function: This function is used to write a checkpoint: a full snapshot of the run state, plus the static parts that changed since the last one.'''
+
+
+# Importing required libraries
+import json
+import os
+import pickle
+import random
+import time
+import numpy as np
+from typing import Dict, Tuple
+
+# Seconds between checkpoints
+DEFAULT_INTERVAL = 5.0
+
+# The manifest names the part files of the latest complete checkpoint, replacing it commits a checkpoint
+MANIFEST = 'checkpoint.json'
+CHECKPOINT_VERSION = 5
+
+
+# Checkpointer class is used to decide when a checkpoint is due and write it, on the result writer thread when one is given
+class Checkpointer:
+    def __init__(self, path: str, interval: float = DEFAULT_INTERVAL, writer=None):
+        """path is a directory holding the manifest and the part files it names.
+        Every part is written to a new file and the manifest is replaced last (write, fsync, rename), so a run killed
+        mid-write leaves the previous checkpoint intact. Files no manifest names any more are removed afterwards."""
+        self.path = path
+        self.interval = interval
+        self.writer = writer
+        os.makedirs(path, exist_ok=True)
+        self.sequence = _latest_sequence(path)
+        # Last written value and file of every static part
+        self._written = {}
+        self._last = time.monotonic()
+
+    def due(self) -> bool:
+        return time.monotonic() - self._last >= self.interval
+
+    def save(self, generation: int, state: Dict, static: Dict = None, meta: Dict = None):
+        """state is a full snapshot, pickled whole every time: the population matrix (packed bits), its cached scores and
+        the Pareto archive included, so one save costs a pass over them however few rows changed since the last one.
+        A static part (e.g. the route) is only written when it differs from the value written last.
+        Values are pickled on the writer thread, so the caller must pass copies it does not change afterwards.
+        meta is stored in the manifest as JSON."""
+        self._last = time.monotonic()
+        self.sequence += 1
+        files, writes = {}, []
+        for name, value in (static or {}).items():
+            previous = self._written.get(name)
+            if previous is not None and _same(previous[0], value):
+                files[name] = previous[1]
+                continue
+            filename = f'{name}-{self.sequence}.pkl'
+            self._written[name] = (value, filename)
+            files[name] = filename
+            writes.append((filename, value))
+        files['state'] = f'state-{self.sequence}.pkl'
+        writes.append((files['state'], state))
+
+        manifest = {'version': CHECKPOINT_VERSION, 'sequence': self.sequence, 'generation': generation, 'files': files, 'meta': meta or {}}
+        if self.writer is not None:
+            self.writer.submit(_write_checkpoint, self.path, writes, manifest)
+        else:
+            _write_checkpoint(self.path, writes, manifest)
+
+
+# Static parts are compared by value; lists and arrays of the size of a route compare in microseconds
+def _same(previous, value) -> bool:
+    if previous is value:
+        return True
+    try:
+        return bool(np.array_equal(previous, value))
+    except (TypeError, ValueError):
+        return False
+
+
+# Sequence number of the checkpoint a directory already holds, so a resumed run keeps counting up
+def _latest_sequence(path: str) -> int:
+    try:
+        with open(os.path.join(path, MANIFEST), 'r') as f:
+            return json.load(f)['sequence']
+    except (OSError, ValueError, KeyError):
+        return 0
+
+
+# Write a file under a temporary name and rename it over the target once it is on disk
+def _atomic_write(path: str, write):
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+# _write_checkpoint function writes the new part files, then commits them by replacing the manifest
+def _write_checkpoint(path: str, writes, manifest: Dict):
+    for filename, value in writes:
+        _atomic_write(os.path.join(path, filename), lambda f: pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL))
+    _atomic_write(os.path.join(path, MANIFEST), lambda f: f.write(json.dumps(manifest).encode()))
+    referenced = set(manifest['files'].values()) | {MANIFEST}
+    for filename in os.listdir(path):
+        if filename.endswith('.pkl') and filename not in referenced:
+            os.remove(os.path.join(path, filename))
+
+
+# load_checkpoint function is used to read the latest complete checkpoint of a directory
+def load_checkpoint(path: str) -> Tuple[int, Dict, Dict]:
+    """Returns (generation, parts, meta); parts holds the state dictionary's entries and the static parts by name."""
+    with open(os.path.join(path, MANIFEST), 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Checkpoint '{path}' has version {manifest.get('version')}, expected {CHECKPOINT_VERSION}.")
+    parts = {}
+    for name, filename in manifest['files'].items():
+        with open(os.path.join(path, filename), 'rb') as f:
+            value = pickle.load(f)
+        if name == 'state':
+            parts.update(value)
+        else:
+            parts[name] = value
+    return manifest['generation'], parts, manifest['meta']
+
+
+# rng_state function is used to capture the Python and NumPy random number generator states
+def rng_state() -> Dict:
+    return {'python': random.getstate(), 'numpy': np.random.get_state()}
+
+
+# restore_rng_state function is used to put captured random number generator states back
+def restore_rng_state(state: Dict):
+    random.setstate(state['python'])
+    np.random.set_state(state['numpy'])
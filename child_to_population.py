@@ -1,38 +1,132 @@
 import random
-from typing import List
+import numpy as np
+from typing import List, Tuple
+from fitness_index import FitnessIndex
+from population import Population
+from pareto import select_survivors
 
 class ChildToPopulationTypes:
     def __init__(self, ga=None):
         self.ga = ga  # Optional parameter with default None
-
-    def replace(self, method_name: str, population: List[List[int]], fitness_scores: List[float], temp_final_child: List[int]) -> List[List[int]]:
-        method_mapping = {
+        self.replaced_index = None  # Slot overwritten by the last replace call
+        self.replaced_indices = None  # Slots overwritten by the last replace_batch call
+        # Mapping method names to actual methods
+        self.methods = {
             "replace_lowest_fitness": self.replace_lowest_fitness,
             "replace_bottom_20_percent": self.replace_bottom_20_percent,
             "replace_based_on_fitness_probability": self.replace_based_on_fitness_probability,
         }
-        
-        replace_method = method_mapping.get(method_name)
+        self.batch_methods = {
+            "replace_lowest_fitness": self.replace_lowest_fitness_batch,
+            "replace_bottom_20_percent": self.replace_bottom_20_percent_batch,
+            "replace_based_on_fitness_probability": self.replace_based_on_fitness_probability_batch,
+        }
+
+    # The strategies pick slots from a fitness index: the population's own one, or a throwaway one for plain lists
+    def _ranking(self, population, fitness_scores: List[float]) -> FitnessIndex:
+        if isinstance(population, Population) and population.fitness_scores is fitness_scores:
+            return population.ranking()
+        return FitnessIndex(fitness_scores)
+
+    def replace(self, method_name: str, population: List[List[int]], fitness_scores: List[float], temp_final_child: List[int],
+                child_score: Tuple[float, float] = None, weights: List[float] = None) -> List[List[int]]:
+        """Insert the child with the named strategy.
+
+        When child_score (fitness, weight) is given, the cached fitness_scores and weights
+        lists are updated in place for the replaced slot only. Without it the caller has to
+        update the slot itself (Population.set_score keeps the fitness index in step)."""
+        replace_method = self.methods.get(method_name)
         if replace_method:
-            return replace_method(population, fitness_scores, temp_final_child)
+            population = replace_method(population, fitness_scores, temp_final_child)
+            if child_score is not None:
+                self._store_score(population, fitness_scores, weights, self.replaced_index, child_score[0], child_score[1])
+            return population
         raise ValueError(f"Method '{method_name}' not found in method mapping.")
+
+    # Write one slot's scores, through the population when it owns the lists so its fitness index is updated too
+    def _store_score(self, population, fitness_scores: List[float], weights: List[float], index: int, fitness: float, weight: float):
+        if isinstance(population, Population) and population.fitness_scores is fitness_scores and population.weights is weights:
+            population.set_score(index, fitness, weight)
+            return
+        fitness_scores[index] = fitness
+        if weights is not None:
+            weights[index] = weight
     
     def replace_lowest_fitness(self, population: List[List[int]], fitness_scores: List[float], temp_final_child: List[int]) -> List[List[int]]:
-        min_fitness_index = fitness_scores.index(min(fitness_scores))
+        min_fitness_index = self._ranking(population, fitness_scores).lowest()
         population[min_fitness_index] = temp_final_child
+        self.replaced_index = min_fitness_index
         return population
 
     def replace_bottom_20_percent(self, population: List[List[int]], fitness_scores: List[float], temp_final_child: List[int]) -> List[List[int]]:
         bottom_20_percent = int(len(fitness_scores) * 0.2)
-        bottom_indices = sorted(range(len(fitness_scores)), key=lambda i: fitness_scores[i])[:bottom_20_percent]
-        random_index = random.choice(bottom_indices)
+        # A uniform rank among the bottom 20%, looked up in the index instead of sorting the population
+        random_index = self._ranking(population, fitness_scores).at_rank(random.randrange(bottom_20_percent))
         population[random_index] = temp_final_child
+        self.replaced_index = random_index
         return population
 
     def replace_based_on_fitness_probability(self, population: List[List[int]], fitness_scores: List[float], temp_final_child: List[int]) -> List[List[int]]:
-        fitness_weights = [1 / (fitness + 1e-6) for fitness in fitness_scores]
-        total_weight = sum(fitness_weights)
-        selected_index = random.choices(range(len(population)), weights=fitness_weights, k=1)[0]
+        # Weighted by 1 / shifted fitness, drawn from the index's Fenwick tree
+        selected_index = self._ranking(population, fitness_scores).sample_inverse(1)[0]
         population[selected_index] = temp_final_child
+        self.replaced_index = selected_index
+        return population
+
+    def replace_batch(self, method_name: str, population: Population, fitness_scores: List[float], children: np.ndarray,
+                      child_fitness: np.ndarray, child_weights: np.ndarray, weights: List[float] = None):
+        """Insert a batch of children (boolean plan matrix) with the batch version of the named strategy.
+
+        population is a Population, the chosen rows are written in one block and the cached
+        fitness_scores and weights lists are updated in place for those rows only. The best parent is never replaced."""
+        replace_method = self.batch_methods.get(method_name)
+        if replace_method is None:
+            raise ValueError(f"Method '{method_name}' not found in method mapping.")
+        # The best parent always keeps its slot, so at most len(population) - 1 children (the first ones) are placed
+        num_children = min(len(children), len(fitness_scores) - 1)
+        slots, chosen = replace_method(self._ranking(population, fitness_scores), np.asarray(child_fitness[:num_children], dtype=np.float64))
+        population.set_rows(slots, children[chosen])
+        for slot, child in zip(slots.tolist(), chosen.tolist()):
+            self._store_score(population, fitness_scores, weights, slot, float(child_fitness[child]), float(child_weights[child]))
+        self.replaced_indices = slots
         return population
 
+    # Batch Replacement Methods, each returns (slots, children) with children[k] written into slots[k]
+
+    def replace_lowest_fitness_batch(self, ranking: FitnessIndex, child_fitness: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # (mu+lambda) survival: the best len(population) of parents and children stay, parents win ties.
+        # The k-th best child survives exactly when it beats the k-th worst parent
+        child_order = np.argsort(-child_fitness, kind='stable')
+        lowest = np.asarray(ranking.lowest_ranks(len(child_fitness)), dtype=np.intp)
+        survivors = int(np.count_nonzero(child_fitness[child_order] > np.asarray(ranking.fitness)[lowest]))
+        return lowest[:survivors], child_order[:survivors]
+
+    def replace_bottom_20_percent_batch(self, ranking: FitnessIndex, child_fitness: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Distinct ranks drawn from the bottom 20%, widened when the batch is larger than that, up to every rank but the top one
+        num_bottom = min(max(int(len(ranking) * 0.2), len(child_fitness)), len(ranking) - 1)
+        ranks = np.random.choice(num_bottom, len(child_fitness), replace=False)
+        return np.array([ranking.at_rank(rank) for rank in ranks.tolist()], dtype=np.intp), np.arange(len(child_fitness))
+
+    def replace_based_on_fitness_probability_batch(self, ranking: FitnessIndex, child_fitness: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        slots = ranking.sample_inverse(len(child_fitness), exclude=ranking.highest())
+        return np.array(slots, dtype=np.intp), np.arange(len(child_fitness))
+
+    def replace_pareto(self, population: Population, parent_objectives: Tuple[np.ndarray, np.ndarray], children: np.ndarray,
+                       child_objectives: Tuple[np.ndarray, np.ndarray], child_fitness: np.ndarray, child_weights: np.ndarray):
+        """Bi-objective survival: parents and children are ranked by non-dominated front, then crowding distance,
+        and the best len(population) stay. Objectives are (profit, travel time) arrays; the parents' arrays are
+        updated in place for the slots that children take over, like the population's fitness and weight lists."""
+        parent_profit, parent_time = parent_objectives
+        child_profit, child_time = child_objectives
+        num_parents = len(population)
+        survivors = select_survivors(np.concatenate([parent_profit, child_profit]), np.concatenate([parent_time, child_time]), num_parents)
+        # Every child that survives takes the slot of a parent that did not
+        chosen = np.sort(survivors[survivors >= num_parents]) - num_parents
+        slots = np.setdiff1d(np.arange(num_parents), survivors[survivors < num_parents])
+        population.set_rows(slots, children[chosen])
+        for slot, child in zip(slots.tolist(), chosen.tolist()):
+            population.set_score(slot, float(child_fitness[child]), float(child_weights[child]))
+        parent_profit[slots] = child_profit[chosen]
+        parent_time[slots] = child_time[chosen]
+        self.replaced_indices = slots
+        return population
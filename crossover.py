@@ -1,5 +1,7 @@
 import random
+import numpy as np
 from typing import List, Tuple
+from bitset_genome import PackedPlan
 
 class CrossoverMethods:
     def __init__(self):
@@ -9,17 +11,31 @@ class CrossoverMethods:
             "arithmetic": self.arithmetic_crossover,
             "uniform": self.uniform_crossover
         }
+        # Batch versions cross row i of parents1 with row i of parents2 (boolean plan matrices)
+        self.batch_methods = {
+            "single_point": self.single_point_crossover_batch,
+            "two_point": self.two_point_crossover_batch,
+            "arithmetic": self.arithmetic_crossover_batch,
+            "uniform": self.uniform_crossover_batch
+        }
 
     def crossover(self, method_name: str, parent1: Tuple[List[int], List[int]], parent2: Tuple[List[int], List[int]]) -> Tuple[List[int], List[int]]:
         if method_name not in self.methods:
             raise ValueError(f"Crossover method '{method_name}' is not supported.")
         return self.methods[method_name](parent1, parent2)
 
+    def crossover_batch(self, method_name: str, parents1: np.ndarray, parents2: np.ndarray) -> np.ndarray:
+        if method_name not in self.batch_methods:
+            raise ValueError(f"Crossover method '{method_name}' is not supported.")
+        return self.batch_methods[method_name](np.asarray(parents1, dtype=bool), np.asarray(parents2, dtype=bool))
+
     def single_point_crossover(self, parent1: Tuple[List[int], List[int]], parent2: Tuple[List[int], List[int]]) -> Tuple[List[int], List[int]]:
         route1, items1 = parent1
         route2, items2 = parent2
         child_route = route1  # Keep the route static
         crossover_point = random.randint(1, len(items1) - 1)
+        if isinstance(items1, PackedPlan):
+            return child_route, items1.blend(items2, items1.range_mask(crossover_point, len(items1)))
         child_items = items1[:crossover_point] + items2[crossover_point:]
         return child_route, child_items
 
@@ -31,6 +47,8 @@ class CrossoverMethods:
         point2 = random.randint(0, len(items1) - 1)
         if point1 > point2:
             point1, point2 = point2, point1
+        if isinstance(items1, PackedPlan):
+            return child_route, items1.blend(items2, items1.range_mask(point1, point2))
         child_items = (
             items1[:point1] +
             items2[point1:point2] +
@@ -43,6 +61,11 @@ class CrossoverMethods:
         route2, items2 = parent2
         child_route = route1  # Keep the route static
         alpha = random.uniform(0, 1)
+        if isinstance(items1, PackedPlan):
+            # On 0/1 genes round(alpha * a + (1 - alpha) * b) keeps a above 0.5, b below, and a AND b at exactly 0.5
+            if alpha == 0.5:
+                return child_route, PackedPlan(items1.bits & items2.bits, len(items1))
+            return child_route, (items1 if alpha > 0.5 else items2).copy()
         child_items = [
             round(alpha * items1[i] + (1 - alpha) * items2[i])
             for i in range(len(items1))
@@ -53,8 +76,32 @@ class CrossoverMethods:
         route1, items1 = parent1
         route2, items2 = parent2
         child_route = route1  # Keep the route static
+        if isinstance(items1, PackedPlan):
+            return child_route, items1.blend(items2, items1.random_mask())
         child_items = [
             items1[i] if random.random() < 0.5 else items2[i]
             for i in range(len(items1))
         ]
-        return child_route, child_items
\ No newline at end of file
+        return child_route, child_items
+
+    # Batch Crossover Methods, each mirrors the single-child method above for every row
+
+    def single_point_crossover_batch(self, parents1: np.ndarray, parents2: np.ndarray) -> np.ndarray:
+        num_children, num_items = parents1.shape
+        crossover_points = np.random.randint(1, num_items, num_children)
+        return np.where(np.arange(num_items) >= crossover_points[:, None], parents2, parents1)
+
+    def two_point_crossover_batch(self, parents1: np.ndarray, parents2: np.ndarray) -> np.ndarray:
+        num_children, num_items = parents1.shape
+        points = np.sort(np.random.randint(0, num_items, (num_children, 2)), axis=1)
+        positions = np.arange(num_items)
+        from_parent2 = (positions >= points[:, :1]) & (positions < points[:, 1:])
+        return np.where(from_parent2, parents2, parents1)
+
+    def arithmetic_crossover_batch(self, parents1: np.ndarray, parents2: np.ndarray) -> np.ndarray:
+        # round(alpha * a + (1 - alpha) * b) on 0/1 genes: a above 0.5, b below, a AND b at exactly 0.5
+        alpha = np.random.uniform(0, 1, len(parents1))[:, None]
+        return np.where(alpha > 0.5, parents1, np.where(alpha < 0.5, parents2, parents1 & parents2))
+
+    def uniform_crossover_batch(self, parents1: np.ndarray, parents2: np.ndarray) -> np.ndarray:
+        return np.where(np.random.random(parents1.shape) < 0.5, parents1, parents2)
@@ -0,0 +1,163 @@
+# Description: Batch scheduler that runs the Genetic Algorithm over a grid of files, seeds and hyperparameters.
+
+'''File Contains:
+    1. build_grid function: This function is used to expand the dataset files and hyperparameter lists into experiment cells.
+    2. cell_key function: This function is used to build the key that identifies a finished cell in the results file.
+    3. load_completed function: This function is used to read the keys of the cells already in the results file.
+    4. run_cell function: This function is used to run the Genetic Algorithm for one cell inside a worker process.
+    5. run_sweep function: This function is used to dispatch the cells to a process pool and stream each result (or failure) to disk.
+    6. summarize function: This function is used to print the mean and standard deviation of every file and configuration.
+    7. main function: This function is used to parse command line arguments and run the sweep.'''
+
+
+# Importing required libraries
+import argparse
+import contextlib
+import glob
+import itertools
+import json
+import os
+import random
+import statistics
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List
+
+
+# build_grid function is used to expand the dataset files and hyperparameter lists into experiment cells
+def build_grid(files: List[str], seeds: List[int], populations: List[int], mutations: List[float], generations: List[int], objective: str) -> List[Dict]:
+    # Glob patterns are expanded here so the same command works on shells that do not expand them
+    expanded = []
+    for pattern in files:
+        expanded.extend(sorted(glob.glob(pattern)) or [pattern])
+
+    return [
+        {'file': file, 'seed': seed, 'population': population, 'mutation': mutation, 'generations': generation_count, 'objective': objective}
+        for file, population, mutation, generation_count, seed in itertools.product(expanded, populations, mutations, generations, seeds)
+    ]
+
+
+# cell_key function is used to build the key that identifies a finished cell in the results file
+def cell_key(cell: Dict) -> str:
+    return f"{cell['file']}|seed={cell['seed']}|pop={cell['population']}|mut={cell['mutation']}|gen={cell['generations']}|obj={cell['objective']}"
+
+
+# load_completed function is used to read the keys of the cells already in the results file
+def load_completed(output: str) -> set:
+    completed = set()
+    if not os.path.exists(output):
+        return completed
+    with open(output, 'r') as f:
+        for line in f:
+            # A run killed mid-write leaves a partial last line, that cell is simply run again, as is a failed one
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if 'key' in result and result.get('status') != 'failed':
+                completed.add(result['key'])
+    return completed
+
+
+# run_cell function is used to run the Genetic Algorithm for one cell inside a worker process
+def run_cell(cell: Dict) -> Dict:
+    from main import run_genetic_algorithm
+
+    random.seed(cell['seed'])
+    np.random.seed(cell['seed'])
+    start_time = time.time()
+
+    # The per-generation console output of thousands of runs is not kept
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        best_fitness_history, best_fitness, _, max_weight = run_genetic_algorithm(
+            f"{os.path.basename(cell['file'])}-seed{cell['seed']}", cell['file'], cell['population'],
+            cell['mutation'], cell['generations'], cell['objective'])
+
+    return dict(cell, key=cell_key(cell), best_fitness=float(best_fitness), max_weight=float(max_weight),
+                generations_run=best_fitness_history.length, seconds=round(time.time() - start_time, 3))
+
+
+# run_sweep function is used to dispatch the cells to a process pool and stream each result to disk
+def run_sweep(cells: List[Dict], output: str, workers: int):
+    completed = load_completed(output)
+    pending = [cell for cell in cells if cell_key(cell) not in completed]
+    print(f"{len(cells)} cells, {len(cells) - len(pending)} already done, {len(pending)} to run on {workers} workers")
+
+    pending_iter = iter(pending)
+    failed = 0
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        with open(output, 'a') as results_file:
+            # At most two cells per worker are in flight, so a huge grid is never queued up front
+            in_flight = {executor.submit(run_cell, cell): cell for cell in itertools.islice(pending_iter, 2 * workers)}
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    cell = in_flight.pop(future)
+                    # A failed cell is recorded and the sweep goes on, it is run again when the sweep is resumed
+                    try:
+                        result = future.result()
+                    except Exception as error:
+                        result = dict(cell, key=cell_key(cell), status='failed', error=f"{type(error).__name__}: {error}")
+                        broken |= isinstance(error, BrokenProcessPool)
+                    results_file.write(json.dumps(result) + "\n")
+                    results_file.flush()
+                    if result.get('status') == 'failed':
+                        failed += 1
+                        print(f"failed {result['key']}: {result['error']}")
+                    else:
+                        print(f"done {result['key']}: best fitness {result['best_fitness']} in {result['seconds']}s")
+                # A worker that died takes the pool down with it (its other cells fail too), the rest run on a new pool
+                if broken:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = ProcessPoolExecutor(max_workers=workers)
+                in_flight.update({executor.submit(run_cell, cell): cell for cell in itertools.islice(pending_iter, len(done))})
+    finally:
+        executor.shutdown()
+    if failed:
+        print(f"{failed} cells failed, they are run again when the sweep is resumed")
+
+
+# summarize function is used to print the mean and standard deviation of every file and configuration
+def summarize(output: str):
+    groups = {}
+    with open(output, 'r') as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if result.get('status') == 'failed':
+                continue
+            config = (result['file'], result['population'], result['mutation'], result['generations'], result['objective'])
+            groups.setdefault(config, []).append(result['best_fitness'])
+
+    print("File\tPopulation\tMutation\tGenerations\tObjective\tRuns\tAverage\tSD")
+    for (file, population, mutation, generation_count, objective), values in sorted(groups.items()):
+        sd = statistics.stdev(values) if len(values) > 1 else 0.0
+        print(f"{file}\t{population}\t{mutation}\t{generation_count}\t{objective}\t{len(values)}\t{statistics.mean(values):.2f}\t{sd:.2f}")
+
+
+# main function is used to parse command line arguments and run the sweep
+def main():
+    parser = argparse.ArgumentParser(description='Parallel experiment sweep for the TTP Genetic Algorithm')
+    parser.add_argument('--files', nargs='+', default=['DATASET/*.txt'], help='Benchmark files or glob patterns')
+    parser.add_argument('--seeds', nargs='+', type=int, default=[0, 1, 2, 3, 4], help='Random seeds')
+    parser.add_argument('--populations', nargs='+', type=int, default=[200], help='Population sizes')
+    parser.add_argument('--mutations', nargs='+', type=float, default=[0.05], help='Mutation rates')
+    parser.add_argument('--generations', nargs='+', type=int, default=[2000], help='Generation counts')
+    parser.add_argument('--objective', choices=['profit', 'ttp', 'bi'], default='profit', help='Fitness used by every run')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Runs executed at the same time')
+    parser.add_argument('--output', default='sweep_results.jsonl', help='Results file, finished cells in it are skipped')
+    args = parser.parse_args()
+
+    cells = build_grid(args.files, args.seeds, args.populations, args.mutations, args.generations, args.objective)
+    run_sweep(cells, args.output, args.workers)
+    summarize(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,18 @@
 # Description: This file contains the fitness function used to evaluate the fitness of a solution.
 
 '''File Contains:
-    1. calculate_fitness function: This function is used to calculate the fitness of a solution based on the total profit.'''
+    1. calculate_fitness function: This function is used to calculate the fitness of a solution based on the total profit.
+    2. picking_plans_to_matrix function: This function is used to convert the picking plans of a population into a 2-D boolean matrix.
+    3. BatchFitnessEvaluator class: This class is used to calculate the fitness of the whole population in a few array operations.
+    4. TTPObjectiveEvaluator class: This class is used to calculate the full TTP objective (profit minus renting cost of the travel time), or profit and travel time as two objectives.
+    5. calculate_ttp_fitness function: This function is used to calculate the full TTP objective of a single solution.'''
 
 # Importing required libraries
+import numpy as np
 from typing import List, Tuple
 from ttp_solver import TTPSolver
+from bitset_genome import PackedPlan, ByteTables
+from population import Population
 
 # calculate_fitness function is used to calculate the fitness of a solution based on the total profit
 def calculate_fitness(solution: Tuple[List[int], List[int]], ttp_solver: 'TTPSolver', distance: float) -> float:
@@ -23,15 +30,16 @@ def calculate_fitness(solution: Tuple[List[int], List[int]], ttp_solver: 'TTPSol
 
 
 
-    # Process items in picking plan
+    # Process items in picking plan, plan position item_idx holds the item tour_items[item_idx]
+    tour_items = ttp_solver.tour_items(route).items
     for item_idx in range(len(picking_plan)):
         if picking_plan[item_idx] == 1:
-            weight, value = ttp_solver.items[route[item_idx]]
+            value, weight = ttp_solver.items[tour_items[item_idx]]
             if current_weight + weight <= ttp_solver.capacity:
                 current_weight += weight
                 total_value += value
             else:
-                print(f'capacity exceeded at {route[item_idx]}')
+                print(f'capacity exceeded at {ttp_solver.item_index.item_cities[tour_items[item_idx]]}')
 
     # Calculate time based on current weight and given distance
     velocity = max(MIN_VELOCITY, MAX_VELOCITY - (current_weight * VELOCITY_REDUCTION_FACTOR))
@@ -50,4 +58,139 @@ def calculate_fitness(solution: Tuple[List[int], List[int]], ttp_solver: 'TTPSol
     #     weight_penalty = (current_weight - ttp_solver.capacity)  # Adjust penalty factor as needed
     #     total_profit -= weight_penalty
 
-    return max(0, round(total_value, 2)), current_weight
\ No newline at end of file
+    return max(0, round(total_value, 2)), current_weight
+
+
+# picking_plans_to_matrix function is used to convert the picking plans of a population into a 2-D boolean matrix
+def picking_plans_to_matrix(population: List[Tuple[List[int], List[int]]]) -> np.ndarray:
+    # A Population already holds its plans as one matrix
+    if isinstance(population, Population):
+        return population.matrix()
+    if isinstance(population[0][1], PackedPlan):
+        packed = np.stack([picking_plan.bits for _, picking_plan in population])
+        return np.unpackbits(packed, axis=1, count=len(population[0][1]), bitorder='little').astype(bool)
+    # A bit counts as picked only when it is exactly 1, same as calculate_fitness
+    return np.asarray([picking_plan for _, picking_plan in population]) == 1
+
+
+# BatchFitnessEvaluator class is used to calculate the fitness of the whole population in a few array operations
+class BatchFitnessEvaluator:
+
+    # Precompute the per-plan-position weights and values for the shared route
+    def __init__(self, ttp_solver: 'TTPSolver', route: List[int], distance: float):
+        self.ttp_solver = ttp_solver
+        self.route = route
+        self.distance = distance
+
+        # Plan position item_idx holds the item layout.items[item_idx], items are laid out in tour order
+        self.layout = ttp_solver.tour_items(route)
+        position_items = np.asarray(ttp_solver.items, dtype=np.float64)[self.layout.items]
+        self.values = position_items[:, 0]
+        self.weights = position_items[:, 1]
+        # Per-byte lookup tables for packed plans, built on first use
+        self._byte_tables = None
+
+    # evaluate function returns the fitness and the weight of every picking plan in the matrix
+    def evaluate(self, picking_plans: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        picking_plans = np.asarray(picking_plans, dtype=bool)
+        total_weight = picking_plans @ self.weights
+        total_value = picking_plans @ self.values
+
+        # Plans over capacity skip items sequentially in calculate_fitness, so fall back to the scalar path for them
+        for row in np.flatnonzero(total_weight > self.ttp_solver.capacity):
+            total_value[row], total_weight[row] = self._evaluate_sequential(picking_plans[row])
+
+        fitness = np.maximum(0, np.round(total_value, 2))
+        return fitness, total_weight
+
+    # plan_totals function returns the total value and weight of a single picking plan
+    def plan_totals(self, picking_plan: List[int]) -> Tuple[float, float]:
+        if isinstance(picking_plan, PackedPlan):
+            if self._byte_tables is None:
+                self._byte_tables = (ByteTables(self.values), ByteTables(self.weights))
+            value_table, weight_table = self._byte_tables
+            return float(value_table.total(picking_plan.bits)), float(weight_table.total(picking_plan.bits))
+        picked = np.asarray(picking_plan) == 1
+        return float(self.values @ picked), float(self.weights @ picked)
+
+    # flip_delta function returns the value and weight change caused by the given picked-status flips, in O(flips)
+    def flip_delta(self, picking_plan: List[int], flipped_indices: List[int]) -> Tuple[float, float]:
+        delta_value = 0.0
+        delta_weight = 0.0
+        for item_idx in flipped_indices:
+            sign = 1 if picking_plan[item_idx] == 1 else -1
+            delta_value += sign * self.values[item_idx]
+            delta_weight += sign * self.weights[item_idx]
+        return delta_value, delta_weight
+
+    # score function turns incrementally tracked totals of a single plan into its fitness and weight
+    def score(self, picking_plan: List[int], total_value: float, total_weight: float) -> Tuple[float, float]:
+        if total_weight > self.ttp_solver.capacity:
+            total_value, total_weight = self._evaluate_sequential(np.asarray(picking_plan) == 1)
+        return max(0, round(total_value, 2)), total_weight
+
+    # _evaluate_sequential function mirrors the item loop of calculate_fitness for a single plan
+    def _evaluate_sequential(self, picking_plan: np.ndarray) -> Tuple[float, float]:
+        total_value = 0
+        current_weight = 0
+        for item_idx in np.flatnonzero(picking_plan):
+            if current_weight + self.weights[item_idx] <= self.ttp_solver.capacity:
+                current_weight += self.weights[item_idx]
+                total_value += self.values[item_idx]
+        return total_value, current_weight
+
+
+# TTPObjectiveEvaluator class is used to calculate the full TTP objective of the whole population
+class TTPObjectiveEvaluator(BatchFitnessEvaluator):
+
+    # Precompute the per-leg distances and the speed drop per unit of weight
+    def __init__(self, ttp_solver: 'TTPSolver', route: List[int], distance: float):
+        super().__init__(ttp_solver, route, distance)
+
+        # Leg i goes from route[i] to route[i + 1] and is travelled with the weight picked up to tour position i,
+        # which is the prefix sum up to the last plan position of that stop (none before the first item)
+        self.leg_distances = ttp_solver.route_leg_distances(route)
+        self.leg_ends = self.layout.offsets[1:] - 1
+        self.speed_drop = (ttp_solver.max_speed - ttp_solver.min_speed) / ttp_solver.capacity
+
+    # evaluate function returns the TTP objective and the final weight of every picking plan in the matrix
+    def evaluate(self, picking_plans: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        total_value, travel_time, total_weight = self.objectives(picking_plans)
+        objective = total_value - self.ttp_solver.renting_ratio * travel_time
+        return np.round(objective, 2), total_weight
+
+    # objectives function returns the two bi-objective TTP objectives (profit, travel time) and the final weight of every picking plan
+    def objectives(self, picking_plans: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        picking_plans = np.asarray(picking_plans, dtype=bool)
+        total_value = picking_plans @ self.values
+
+        # Prefix sums of the picked weights give the knapsack weight on every leg
+        cumulative_weight = np.cumsum(picking_plans * self.weights, axis=1)
+        travel_time = self.travel_time(self.leg_weights(cumulative_weight))
+        return total_value, travel_time, cumulative_weight[:, -1]
+
+    # score function only needs the tracked profit, the travel time still depends on the weight of every leg (one prefix sum over the plan)
+    def score(self, picking_plan: List[int], total_value: float, total_weight: float) -> Tuple[float, float]:
+        cumulative_weight = np.cumsum((np.asarray(picking_plan) == 1) * self.weights)
+        objective = total_value - self.ttp_solver.renting_ratio * self.travel_time(self.leg_weights(cumulative_weight))
+        return round(float(objective), 2), total_weight
+
+    # leg_weights function turns per-plan-position prefix sums into the knapsack weight on every leg
+    def leg_weights(self, cumulative_weight: np.ndarray) -> np.ndarray:
+        leg_weight = cumulative_weight[..., np.maximum(self.leg_ends, 0)]
+        leg_weight[..., self.leg_ends < 0] = 0
+        return leg_weight
+
+    # travel_time function returns the tour time for the given per-leg knapsack weights
+    def travel_time(self, cumulative_weight: np.ndarray) -> np.ndarray:
+        # Overweight plans are clamped to the minimum speed, repair keeps them feasible anyway
+        speed = np.maximum(self.ttp_solver.min_speed, self.ttp_solver.max_speed - self.speed_drop * cumulative_weight)
+        return (self.leg_distances / speed).sum(axis=-1)
+
+
+# calculate_ttp_fitness function is used to calculate the full TTP objective of a single solution
+def calculate_ttp_fitness(solution: Tuple[List[int], List[int]], ttp_solver: 'TTPSolver', distance: float) -> Tuple[float, float]:
+    route, picking_plan = solution
+    evaluator = TTPObjectiveEvaluator(ttp_solver, route, distance)
+    objective, weight = evaluator.evaluate(np.asarray([picking_plan]) == 1)
+    return float(objective[0]), float(weight[0])
\ No newline at end of file
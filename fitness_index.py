@@ -0,0 +1,176 @@
+# Description: This file contains the fitness index that keeps the population ordered by fitness for the selection and replacement strategies.
+
+'''File Contains:
+    1. FitnessIndex class: This class is used to keep (fitness, index) pairs sorted and inverse and proportional fitness Fenwick trees, all updated per replaced individual.
+    2. WeightTree class: This class is used to keep the prefix sums of per-individual weights in a Fenwick tree under point updates.'''
+
+''' Inside FitnessIndex class
+    1. update function: This function is used to move one individual to its new fitness.
+    2. lowest / highest functions: These functions are used to get the index of the worst and the best individual.
+    3. at_rank function: This function is used to get the index of the individual with the given rank (0 = lowest fitness).
+    4. sample_inverse function: This function is used to draw indices with probability proportional to 1 / shifted fitness.
+    5. sample_proportional / sample_spaced functions: These functions are used to draw indices with probability proportional to shifted fitness (roulette wheel, stochastic universal sampling).'''
+
+
+# Importing required libraries
+import random
+import numpy as np
+from bisect import bisect_left, insort
+from typing import List
+
+# Offset that keeps the inverse weight of a zero (shifted) fitness finite, as in replace_based_on_fitness_probability
+INVERSE_EPSILON = 1e-6
+
+
+# FitnessIndex class is used to keep (fitness, index) pairs sorted and inverse and proportional fitness Fenwick trees, all updated per replaced individual
+class FitnessIndex:
+    def __init__(self, fitness_scores: List[float]):
+        """fitness_scores is copied: later changes have to go through update, the copy is the back-pointer
+        from an index to its entry in the sorted list."""
+        self.fitness = [float(fitness) for fitness in fitness_scores]
+        # Sorted by fitness, ties by index, so order[0] is what fitness_scores.index(min(...)) returns
+        self.order = sorted((fitness, index) for index, fitness in enumerate(self.fitness))
+
+        # Fenwick trees over the 'inverse' and 'proportional' weights, built on first use and dropped (then rebuilt
+        # lazily) when the shift, the lowest negative fitness, moves
+        self._trees = {}
+
+    def __len__(self) -> int:
+        return len(self.fitness)
+
+    def update(self, index: int, fitness: float):
+        """O(log n) search plus a C-level list shift to re-position one individual, and one O(log n) update per tree."""
+        fitness = float(fitness)
+        old = self.fitness[index]
+        if fitness == old:
+            return
+        del self.order[bisect_left(self.order, (old, index))]
+        insort(self.order, (fitness, index))
+        self.fitness[index] = fitness
+
+        for kind, tree in list(self._trees.items()):
+            if self._shift() != tree.shift or not tree.set(index, self._weight(kind, fitness, tree.shift)):
+                del self._trees[kind]
+
+    def lowest(self) -> int:
+        return self.order[0][1]
+
+    def highest(self) -> int:
+        # The first index with the top fitness, as fitness_scores.index(max(...)) returns
+        return self.order[bisect_left(self.order, (self.order[-1][0], -1))][1]
+
+    def at_rank(self, rank: int) -> int:
+        return self.order[rank][1]
+
+    def lowest_ranks(self, count: int) -> List[int]:
+        return [index for _, index in self.order[:count]]
+
+    # Weight of one individual: 1 / shifted fitness for the replacement, the shifted fitness itself for the roulette wheel
+    def _weight(self, kind: str, fitness: float, shift: float) -> float:
+        if kind == 'inverse':
+            return 1 / (fitness + shift + INVERSE_EPSILON)
+        return fitness + shift
+
+    # Proportional weights must not be negative while the TTP objective can be, so scores are shifted by the lowest fitness when it is below zero
+    def _shift(self) -> float:
+        return -min(self.order[0][0], 0.0)
+
+    def _tree(self, kind: str) -> 'WeightTree':
+        tree = self._trees.get(kind)
+        if tree is None:
+            shift = self._shift()
+            shifted = np.asarray(self.fitness) + shift
+            weights = 1 / (shifted + INVERSE_EPSILON) if kind == 'inverse' else shifted
+            tree = self._trees[kind] = WeightTree(weights, shift)
+        return tree
+
+    def sample_inverse(self, count: int = 1, exclude: int = None) -> List[int]:
+        """count distinct indices, each drawn with probability proportional to its inverse fitness among the ones
+        not drawn yet, never the exclude index. One draw is a uniform number and an O(log n) descent, like random.choices
+        over cumulative weights."""
+        tree = self._tree('inverse')
+        excluded = [] if exclude is None else [exclude]
+        count = min(count, len(self.fitness) - len(excluded))
+        for index in excluded:
+            tree.add(index, -tree.weights[index])
+        chosen = []
+        while len(chosen) < count:
+            index = tree.find(random.random() * tree.total())
+            if index in chosen or index in excluded:
+                # Only reachable through the rounding left by a removed weight
+                continue
+            chosen.append(index)
+            # Drawn indices leave the tree until the batch is complete
+            tree.add(index, -tree.weights[index])
+        for index in chosen + excluded:
+            tree.add(index, tree.weights[index])
+        return chosen
+
+    def sample_proportional(self, count: int) -> List[int]:
+        """count independent roulette wheel draws, each index with probability proportional to its shifted fitness.
+        One O(log n) descent per draw; when every shifted score is zero the draws are uniform."""
+        tree = self._tree('proportional')
+        total = tree.total()
+        if total <= 0:
+            return np.random.randint(0, len(self.fitness), count).tolist()
+        return [tree.find(target) for target in (np.random.random(count) * total).tolist()]
+
+    def sample_spaced(self, count: int) -> List[int]:
+        """Stochastic universal sampling: one spin of the same wheel, with count pointers total / count apart."""
+        tree = self._tree('proportional')
+        total = tree.total()
+        if total <= 0:
+            return np.random.randint(0, len(self.fitness), count).tolist()
+        spacing = total / count
+        pointers = np.random.uniform(0, spacing) + spacing * np.arange(count)
+        return [tree.find(pointer) for pointer in pointers.tolist()]
+
+
+# WeightTree class is used to keep the prefix sums of per-individual weights in a Fenwick tree under point updates
+class WeightTree:
+    def __init__(self, weights: np.ndarray, shift: float):
+        """shift is the fitness shift the weights were computed with, the owner drops the tree when it moves."""
+        # tree[i] (1-based) holds the sum of the weights in (i - lowbit(i), i]
+        cumulative = np.concatenate([[0.0], np.cumsum(weights)])
+        positions = np.arange(1, len(weights) + 1)
+        self.tree = [0.0] + (cumulative[positions] - cumulative[positions - (positions & -positions)]).tolist()
+        self.weights = np.asarray(weights, dtype=np.float64).tolist()
+        self.shift = shift
+        self.updates = 0
+
+    def set(self, index: int, weight: float) -> bool:
+        """Change one weight. Returns False, leaving the tree stale, once the updates since the build outnumber the
+        weights: point updates accumulate rounding error, so the owner rebuilds the tree to keep the sums exact enough."""
+        self.updates += 1
+        if self.updates > len(self.weights):
+            return False
+        self.add(index, weight - self.weights[index])
+        self.weights[index] = weight
+        return True
+
+    # Adds to the prefix sums only, sample_inverse uses it to take drawn indices out for the rest of a batch
+    def add(self, index: int, delta: float):
+        position = index + 1
+        while position < len(self.tree):
+            self.tree[position] += delta
+            position += position & -position
+
+    # Sum of all weights still in the tree
+    def total(self) -> float:
+        total, position = 0.0, len(self.weights)
+        while position:
+            total += self.tree[position]
+            position -= position & -position
+        return total
+
+    # Smallest index whose prefix weight is above target, a binary descent of the tree
+    def find(self, target: float) -> int:
+        position = 0
+        step = 1 << (len(self.weights).bit_length() - 1)
+        while step:
+            following = position + step
+            if following < len(self.tree) and self.tree[following] <= target:
+                position = following
+                target -= self.tree[following]
+            step >>= 1
+        return min(position, len(self.weights) - 1)
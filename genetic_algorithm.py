@@ -3,93 +3,147 @@
 '''File Contains:
 1. GeneticAlgorithm class: This class
     - Initializes the genetic algorithm with population size, mutation rate, and number of generations.    
-    - Initializes the population with random picking plans and routes.
+    - Initializes the population with greedy (PackIterative-style) or random picking plans on one shared route.
+    - Builds the selection, crossover, mutation, replacement and route operators once, as an operator pipeline.
     - Selects parents using tournament selection.
-    - Performs crossover and mutation operations.'''
+    - Performs crossover and mutation operations.
+    - Repairs overweight picking plans with the repair operator.
+    - Breeds a batch of children at once for the (mu+lambda) generation mode.
+    - Improves the shared route with the route operators.'''
 
 '''2. check_weight_status function: This function is used to check if the weight exceeds the capacity and 
-                                if it does, it removes the items with the highest weight.'''
+                                if it does, it removes the items with the highest weight (single-call wrapper of RepairOperator).'''
 
 # Importing required libraries
 import random
-from typing import List, Tuple
-from route_generator import generate_route, calculate_total_distance
+import numpy as np
+from typing import Callable, List, Tuple
+from population import Population
+from seeding import seed_picking_plans
+from fitness_function import BatchFitnessEvaluator
+from route_generator import generate_route
 from ttp_solver import TTPSolver
-from crossover import CrossoverMethods
-from mutation import MutationTypes
-from parent_selection import ParentSelectionStrategies
+from operator_pipeline import OperatorPipeline
+from repair import RepairOperator
 
 # check_weight_status function is used to check if the weight exceeds the capacity and if it does, it removes the items with the highest weight
-def check_weight_status(picking_plan: List[int], items, ttp_solver: 'TTPSolver', route):
-        
-        weights = [item[0] for item in items]
-        weights = [weights[i] for i in route]
-
-        total_weight = sum([weights[i] for i in range(len(picking_plan)) if picking_plan[i] == 1])
-
-        if total_weight > ttp_solver.capacity:
-            selected_indices = [i for i in range(len(picking_plan)) if picking_plan[i] == 1]
-            sorted_indices = sorted(selected_indices, key=lambda x: weights[x], reverse=True)
-            for idx in sorted_indices:
-                if total_weight <= ttp_solver.capacity:
-                    break
-                picking_plan[idx] = 0
-                total_weight -= weights[idx]
-
-        return picking_plan, total_weight
+def check_weight_status(picking_plan: List[int], items, ttp_solver: 'TTPSolver', route, total_weight: float = None, removed_indices: List[int] = None):
+        # The per-position weights come from an evaluator of the route; the GA loop keeps one and calls GeneticAlgorithm.repair instead
+        evaluator = BatchFitnessEvaluator(ttp_solver, route, 0)
+        return RepairOperator(ttp_solver).repair(picking_plan, evaluator, total_weight, removed_indices)
 
 
 # GeneticAlgorithm class is used to implement the genetic algorithm for solving the TTP problem
 class GeneticAlgorithm:
+    # Operators the Q-learning state indexes into: state = (selection, crossover, mutation, replacement, route operator)
+    SELECTION_STRATEGIES = ["truncation_selection", "roulette_wheel_selection", "stochastic_universal_sampling", "tournament_top_10"]
+    CROSSOVER_STRATEGIES = ["single_point", "two_point", "arithmetic", "uniform"]
+    MUTATION_STRATEGIES = ["bit_flip_mutation", "gaussian_mutation", "inversion_mutation", "scramble_mutation"]
+    ROUTE_STRATEGIES = ["keep_route", "two_opt", "or_opt", "two_opt_bitflip"]
+    REPLACEMENT_STRATEGIES = ["replace_bottom_20_percent", "replace_lowest_fitness", "replace_based_on_fitness_probability", "replace_lowest_fitness"]
 
     # Initialize the genetic algorithm with population size, mutation rate, and number of generations
-    def __init__(self, population_size: int, mutation_rate: float, generations: int):
+    def __init__(self, population_size: int, mutation_rate: float, generations: int, genome: str = 'list', seeding: str = 'greedy',
+                 repair: str = 'heaviest'):
         self.population_size = population_size
+        # 'list' keeps picking plans as lists of 0/1, 'packed' stores them as PackedPlan bitsets
+        self.genome = genome
+        # 'greedy' starts from PackIterative-style plans, 'random' from repaired random plans
+        self.seeding = seeding
+        # Drop ordering of the repair operator: 'heaviest', 'ratio' or 'distance_ratio'
+        self.repair_ordering = repair
+        self.repair_operator = None
         self.mutation_rate = mutation_rate
         self.generations = generations
-
-
-    # Initialize the population with random picking plans and routes
-    def initialize_population(self, num_cities, num_items: int, items, ttp_solver) -> List[Tuple[List[int], List[int]]]:
-        population = []
-        route = generate_route(num_cities)
-        distance = calculate_total_distance(route,num_cities)
-        for _ in range(self.population_size):
-            picking_plan = [random.randint(0, 1) for _ in range(num_items)]
-            
-            # check weight status checks if the weight exceeds the capacity and if it does, it removes the items with the highest weight
-            final_picking_plan, weight = check_weight_status(picking_plan, items, ttp_solver, route)
-            population.append((route, final_picking_plan))
-
-        return population, distance
+        # Picked-status changes of the last mutate call, so the caller can update the child's fitness incrementally
+        self.flipped_indices = []
+        # Operators resolved per Q-learning state, built once the TTP instance is known
+        self.pipeline = None
+        # The pipeline's route optimizer, it keeps the don't-look bits between generations
+        self.route_optimizer = None
+
+
+    # Initialize the population with greedy or random picking plans on one shared route
+    def initialize_population(self, num_cities, num_items: int, items, ttp_solver, evaluator_class=BatchFitnessEvaluator,
+                              instrument_evaluator: Callable = None) -> Tuple[Population, float]:
+        """instrument_evaluator is applied to the evaluator the seeding scores its plans with, so a run budget or
+        profiler counts those evaluations too."""
+        route = generate_route(num_cities, ttp_solver.neighbour_table())
+        distance = ttp_solver.tour_length(route)
+        self.get_pipeline(ttp_solver)
+        evaluator = evaluator_class(ttp_solver, route, distance)
+        if instrument_evaluator is not None:
+            instrument_evaluator(evaluator)
+        if self.seeding == 'greedy':
+            # The greedy plans are packed within capacity, so no repair is needed
+            picking_plans = seed_picking_plans(ttp_solver, evaluator, self.population_size)
+            return Population.from_matrix(route, picking_plans, self.genome), distance
+
+        picking_plans = np.zeros((self.population_size, num_items), dtype=bool)
+        for index in range(self.population_size):
+            picking_plans[index] = [random.randint(0, 1) for _ in range(num_items)]
+
+        # The repair operator drops items from every overweight plan in one pass over the matrix
+        picking_plans, _ = self.get_repair_operator(ttp_solver).repair_matrix(picking_plans, evaluator)
+
+        # The route is stored once for the whole population, the plans as one matrix (packed bits for the 'packed' genome)
+        return Population.from_matrix(route, picking_plans, self.genome), distance
     
     
-    # truncation_selection
+    # The operators are built once per run, on the instance the population was initialized for
+    def get_pipeline(self, ttp_solver: 'TTPSolver' = None) -> OperatorPipeline:
+        if self.pipeline is None:
+            if ttp_solver is None:
+                raise ValueError("The operator pipeline needs the TTP instance, initialize the population first.")
+            self.pipeline = OperatorPipeline(self, ttp_solver)
+            self.route_optimizer = self.pipeline.route_optimizer
+        return self.pipeline
 
-    def select_parents(self, population: List[List[int]], fitness_scores: List[float], evolution ,strategy_index) -> List[Tuple[List[int], List[int]]]:
-        selector = ParentSelectionStrategies()
-        # strategy = ["truncation_selection", "tournament_top_10", "roulette_wheel_selection", "tournament_selection", "rank_selection", "stochastic_universal_sampling"]
-        strategy = ["truncation_selection", "roulette_wheel_selection", "stochastic_universal_sampling", "tournament_top_10"]
-        method_name = strategy[strategy_index]
-        selected_parents = selector.call_method(method_name, population, fitness_scores)
-        return selected_parents
+
+    def select_parents(self, population: Population, fitness_scores: List[float], evolution ,strategy_index) -> List[Tuple[List[int], List[int]]]:
+        # The kernels return indices, the parents are views of their population rows
+        ranking = population.ranking() if population.fitness_scores is fitness_scores else fitness_scores
+        selected_indices = self.get_pipeline().selection[strategy_index][0](ranking)
+        return [population[i] for i in selected_indices]
 
 
 
     def mutate(self, solution: Tuple[List[int], List[int]], evolution, strategy_index) -> Tuple[List[int], List[int]]:
-        mutation_types = MutationTypes(mutation_rate=self.mutation_rate)
-        # strategy = ["bit_flip_mutation", "random_item_swap_mutation","scramble_mutation","inversion_mutation","reset_mutation","block_flip_mutation", "gaussian_mutation"] 
-        strategy = ["bit_flip_mutation","gaussian_mutation", "inversion_mutation", "scramble_mutation"]
-        mutation_name = strategy[strategy_index]
-        mutated_solution = mutation_types.apply_mutation(mutation_name, solution)
+        pipeline = self.get_pipeline()
+        mutated_solution = pipeline.mutation[strategy_index][0](solution)
+        self.flipped_indices = pipeline.mutation_types.flipped_indices
         return mutated_solution
 
 
-    # Two Point Crossover
     def crossover(self, parent1: Tuple[List[int], List[int]], parent2: Tuple[List[int], List[int]], evolution, strategy_index) -> Tuple[List[int], List[int]]:
-        crossover_methods = CrossoverMethods()
-        # strategy = ["single_point", "two_point", "uniform","arithmetic"]
-        strategy = ["single_point", "two_point","arithmetic", "uniform"]
-        method_name = strategy[strategy_index]
-        child = crossover_methods.crossover(method_name, parent1, parent2)
-        return child
\ No newline at end of file
+        return self.get_pipeline().crossover[strategy_index][0](parent1, parent2)
+
+
+    # Breed num_offspring children as matrix operations: selection, crossover, mutation, repair and evaluation are one pass each
+    def breed(self, population: Population, evaluator, ttp_solver: 'TTPSolver', num_offspring: int, strategy_state) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the boolean children matrix with the fitness and weight of every child.
+        strategy_state is the Q-learning state, its first three components pick the operators for the whole batch."""
+        stage = self.get_pipeline(ttp_solver)[strategy_state]
+        pairs = stage.select_batch(population.ranking(), num_offspring)
+        children = stage.crossover_batch(population.rows(pairs[:, 0]), population.rows(pairs[:, 1]))
+        children = stage.mutate_batch(children)
+        children, _ = self.get_repair_operator(ttp_solver).repair_matrix(children, evaluator)
+        fitness, weight = evaluator.evaluate(children)
+        return children, fitness, weight
+
+
+    # The repair operator is built once, it keeps the drop keys of the current route between calls
+    def get_repair_operator(self, ttp_solver: 'TTPSolver') -> RepairOperator:
+        if self.repair_operator is None:
+            self.repair_operator = RepairOperator(ttp_solver, self.repair_ordering)
+        return self.repair_operator
+
+
+    # Repair drops items from an overweight child until it fits, the evaluator supplies the per-position weights of its route
+    def repair(self, picking_plan: List[int], evaluator, ttp_solver: 'TTPSolver', total_weight: float = None, removed_indices: List[int] = None) -> Tuple[List[int], float]:
+        return self.get_repair_operator(ttp_solver).repair(picking_plan, evaluator, total_weight, removed_indices)
+
+
+    # Route operators work on the tour shared by the whole population, guided by one picking plan
+    def optimize_route(self, route: List[int], picking_plan: List[int], evolution, strategy_index, ttp_solver: 'TTPSolver') -> Tuple[List[int], List[int]]:
+        return self.get_pipeline(ttp_solver).route[strategy_index](route, picking_plan)
\ No newline at end of file
@@ -0,0 +1,213 @@
+# Description: This file contains the bounded-memory generation history: recent generations in a ring buffer, a downsampled series for plots and an optional memory-mapped spill of every generation.
+
+'''File Contains:
+    1. HistorySeries class: This class is used to hand the downsampled best fitness series of a run to plots and callers.
+    2. RingBuffer class: This class is used to keep the last `capacity` values of a series in a fixed array.
+    3. GeometricSample class: This class is used to keep an evenly spaced sample of a series of any length in a fixed array.
+    4. SpillFile class: This class is used to append every generation record to a file through a memory map of one chunk.
+    5. GenerationHistory class: This class is used to record the per-generation best fitness and max weight of a run in constant memory.
+    6. read_history function: This function is used to load a spilled history back as a memory-mapped record array.'''
+
+''' Inside GenerationHistory class
+    1. record function: This function is used to store one generation in the ring buffer, the sample and the spill file.
+    2. set_last_best function: This function is used to overwrite the best fitness of the latest generation (reverted generations).
+    3. series function: This function is used to get the downsampled best fitness series.
+    4. state / from_state functions: These functions are used to copy the history for a checkpoint and to continue it after a resume.'''
+
+
+# Importing required libraries
+import os
+import numpy as np
+from typing import NamedTuple
+
+# Latest generations kept at full resolution, and samples kept for the plots
+DEFAULT_WINDOW = 512
+DEFAULT_SAMPLES = 2048
+# Records mapped at a time by the spill file
+DEFAULT_CHUNK = 65536
+
+# Columns of the spilled history, one record per generation
+HISTORY_FIELDS = [('generation', np.int64), ('best_fitness', np.float64), ('max_weight', np.float64)]
+
+
+# HistorySeries class is used to hand the downsampled best fitness series of a run to plots and callers
+class HistorySeries(NamedTuple):
+    generations: np.ndarray
+    best_fitness: np.ndarray
+    # Generations recorded, the series itself holds at most the sample capacity of them
+    length: int
+
+
+# RingBuffer class is used to keep the last `capacity` values of a series in a fixed array
+class RingBuffer:
+    def __init__(self, capacity: int, dtype=np.float64):
+        self.values = np.zeros(capacity, dtype=dtype)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return min(self.count, len(self.values))
+
+    def append(self, value):
+        self.values[self.count % len(self.values)] = value
+        self.count += 1
+
+    def set_last(self, value):
+        self.values[(self.count - 1) % len(self.values)] = value
+
+    def last(self, count: int) -> np.ndarray:
+        """The last min(count, len(self)) values, oldest first."""
+        count = min(count, len(self))
+        positions = np.arange(self.count - count, self.count) % len(self.values)
+        return self.values[positions]
+
+
+# GeometricSample class is used to keep an evenly spaced sample of a series of any length in a fixed array
+class GeometricSample:
+    def __init__(self, capacity: int):
+        """Every stride-th point is kept; when all but one slot are filled every other sample is dropped and the stride
+        doubles. The free slot holds the latest point while it is off the stride, so the sample always spans the whole
+        series, first to last point, with between capacity / 2 and capacity points. capacity is at least 2."""
+        self.positions = np.zeros(capacity, dtype=np.int64)
+        self.values = np.zeros(capacity, dtype=np.float64)
+        # Points on the stride, and whether the latest point follows them in the free slot
+        self.size = 0
+        self.tail = False
+        self.stride = 1
+
+    def __len__(self) -> int:
+        return self.size + self.tail
+
+    def append(self, position: int, value: float):
+        self.tail = False
+        if position % self.stride == 0 and self.size == len(self.values) - 1:
+            # Keep the samples on the doubled stride, in place
+            kept = np.flatnonzero(self.positions[:self.size] % (2 * self.stride) == 0)
+            self.size = len(kept)
+            self.positions[:self.size] = self.positions[kept]
+            self.values[:self.size] = self.values[kept]
+            self.stride *= 2
+        self.positions[self.size] = position
+        self.values[self.size] = value
+        if position % self.stride:
+            self.tail = True
+        else:
+            self.size += 1
+
+    def set_last(self, position: int, value: float):
+        if len(self) and self.positions[len(self) - 1] == position:
+            self.values[len(self) - 1] = value
+
+    def sample(self):
+        return self.positions[:len(self)].copy(), self.values[:len(self)].copy()
+
+
+# SpillFile class is used to append every generation record to a file through a memory map of one chunk
+class SpillFile:
+    def __init__(self, path: str, chunk: int = DEFAULT_CHUNK, resume: int = 0):
+        """Only the chunk being filled is mapped, the file grows by a chunk at a time and is cut to the records on close.
+        resume keeps the first `resume` records of an existing file and continues after them."""
+        self.path = path
+        self.dtype = np.dtype(HISTORY_FIELDS)
+        self.chunk = chunk
+        self.count = resume
+        self.start = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # A new history per run, unless it is continued
+        with open(path, 'r+b' if resume else 'wb') as f:
+            f.truncate(resume * self.dtype.itemsize)
+        self._map_chunk()
+
+    def _map_chunk(self):
+        self.start = self.count
+        with open(self.path, 'r+b') as f:
+            f.truncate((self.start + self.chunk) * self.dtype.itemsize)
+        self.records = np.memmap(self.path, dtype=self.dtype, mode='r+', offset=self.start * self.dtype.itemsize, shape=(self.chunk,))
+
+    def append(self, record: tuple):
+        if self.count - self.start == self.chunk:
+            self.records.flush()
+            self._map_chunk()
+        self.records[self.count - self.start] = record
+        self.count += 1
+
+    def set_last(self, field: str, value):
+        self.records[field][self.count - 1 - self.start] = value
+
+    def flush(self):
+        self.records.flush()
+
+    def close(self):
+        self.records.flush()
+        del self.records
+        with open(self.path, 'r+b') as f:
+            f.truncate(self.count * self.dtype.itemsize)
+
+
+# GenerationHistory class is used to record the per-generation best fitness and max weight of a run in constant memory
+class GenerationHistory:
+    def __init__(self, window: int = DEFAULT_WINDOW, samples: int = DEFAULT_SAMPLES, spill: str = None):
+        """window: latest generations kept at full resolution in recent_best (read with recent_best.last), which the
+        sample thins out once the run is longer than its capacity.
+        samples: points kept for the convergence plot.
+        spill: file that receives every generation (HISTORY_FIELDS records), written through a memory map."""
+        self.recent_best = RingBuffer(window)
+        self.sample = GeometricSample(samples)
+        self.spill = SpillFile(spill) if spill else None
+        self.max_weight = float('-inf')
+        self.generation = -1
+
+    def __len__(self) -> int:
+        return self.generation + 1
+
+    def record(self, generation: int, best_fitness: float, max_weight: float):
+        self.generation = generation
+        self.recent_best.append(best_fitness)
+        self.sample.append(generation, best_fitness)
+        self.max_weight = max(self.max_weight, max_weight)
+        if self.spill is not None:
+            self.spill.append((generation, best_fitness, max_weight))
+
+    def set_last_best(self, best_fitness: float):
+        self.recent_best.set_last(best_fitness)
+        self.sample.set_last(self.generation, best_fitness)
+        if self.spill is not None:
+            self.spill.set_last('best_fitness', best_fitness)
+
+    def series(self) -> HistorySeries:
+        generations, best_fitness = self.sample.sample()
+        return HistorySeries(generations, best_fitness, len(self))
+
+    def state(self) -> dict:
+        """Copy of everything but the spill file, which already holds the recorded generations."""
+        if self.spill is not None:
+            self.spill.flush()
+        return {'recent_best': self.recent_best.values.copy(), 'recent_count': self.recent_best.count,
+                'positions': self.sample.positions.copy(), 'values': self.sample.values.copy(), 'size': self.sample.size,
+                'tail': self.sample.tail, 'stride': self.sample.stride, 'max_weight': self.max_weight, 'generation': self.generation}
+
+    @classmethod
+    def from_state(cls, state: dict, spill: str = None) -> 'GenerationHistory':
+        history = cls(len(state['recent_best']), len(state['values']))
+        history.recent_best.values[:] = state['recent_best']
+        history.recent_best.count = state['recent_count']
+        history.sample.positions[:] = state['positions']
+        history.sample.values[:] = state['values']
+        history.sample.size = state['size']
+        history.sample.tail = state['tail']
+        history.sample.stride = state['stride']
+        history.max_weight = state['max_weight']
+        history.generation = state['generation']
+        if spill:
+            history.spill = SpillFile(spill, resume=len(history))
+        return history
+
+    def close(self):
+        if self.spill is not None:
+            self.spill.close()
+
+
+# read_history function is used to load a spilled history back as a memory-mapped record array
+def read_history(path: str) -> np.ndarray:
+    if not os.path.getsize(path):
+        return np.empty(0, dtype=HISTORY_FIELDS)
+    return np.memmap(path, dtype=HISTORY_FIELDS, mode='r')
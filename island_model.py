@@ -0,0 +1,228 @@
+# Description: This file contains the island-model runner that evolves several GA + Q-learning islands in parallel processes.
+
+'''File Contains:
+    1. SharedInstance class: This class is used to put the read-only instance arrays into shared memory once for all islands.
+    2. RingMigration class: This class is used to send elite picking plans to the next island and receive migrants from the previous one.
+    3. island_output_path function: This function is used to give every island its own trace, metrics log and history file.
+    4. run_island_model function: This function is used to run the islands in a process pool and collect the best result.'''
+
+
+# Importing required libraries
+import os
+import queue
+import random
+import traceback
+import multiprocessing as mp
+import numpy as np
+from multiprocessing import shared_memory
+from typing import List, Tuple
+from ttp_solver import TTPSolver
+from ttp_benchmark_solver import load_ttp_solver
+from result_writer import ResultWriter
+
+# Seconds between the checks for islands that died without sending a result
+RESULT_POLL_SECONDS = 1.0
+
+
+# SharedInstance class is used to put the read-only instance arrays into shared memory once for all islands
+class SharedInstance:
+    def __init__(self, ttp_solver: 'TTPSolver'):
+        arrays = {
+            'coordinates': ttp_solver.coordinates,
+            'items': np.asarray(ttp_solver.items, dtype=np.float64),
+            'neighbour_table': ttp_solver.neighbour_table(),
+        }
+        if ttp_solver.assigned_nodes is not None:
+            arrays['assigned_nodes'] = np.asarray(ttp_solver.assigned_nodes)
+        # Large instances have no distance matrix, islands then compute distances on demand
+        if ttp_solver.distance_matrix is not None:
+            arrays['distance_matrix'] = ttp_solver.distance_matrix
+
+        self.blocks = []
+        # Only block names, shapes and dtypes are pickled to the workers
+        self.spec = {}
+        for key, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self.blocks.append(block)
+            self.spec[key] = (block.name, array.shape, array.dtype.str)
+
+        self.scalars = {
+            'capacity': ttp_solver.capacity,
+            'min_speed': ttp_solver.min_speed,
+            'max_speed': ttp_solver.max_speed,
+            'renting_ratio': ttp_solver.renting_ratio,
+            'edge_weight_type': ttp_solver.edge_weight_type,
+        }
+
+    def release(self):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+
+
+# attach_ttp_solver function is used inside a worker to build a TTPSolver on top of the shared blocks
+def attach_ttp_solver(spec: dict, scalars: dict) -> Tuple[TTPSolver, list]:
+    blocks = []
+    arrays = {}
+    for key, (name, shape, dtype) in spec.items():
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    ttp_solver = TTPSolver(
+        cities=arrays['coordinates'],
+        items=arrays['items'],
+        distance_matrix=arrays.get('distance_matrix'),
+        neighbour_table=arrays['neighbour_table'],
+        assigned_nodes=arrays.get('assigned_nodes'),
+        **scalars
+    )
+    # The blocks have to stay open while the arrays are in use
+    return ttp_solver, blocks
+
+
+# RingMigration class is used to send elite picking plans to the next island and receive migrants from the previous one
+class RingMigration:
+    def __init__(self, interval: int, num_migrants: int, inbox, outbox):
+        self.interval = interval
+        self.num_migrants = num_migrants
+        self.inbox = inbox
+        self.outbox = outbox
+
+    def exchange(self, population: List[Tuple[List[int], List[int]]], fitness_scores: List[float]) -> List[Tuple[List[int], List[int]]]:
+        elite_indices = np.argsort(fitness_scores)[::-1][:self.num_migrants]
+        self.outbox.put([(list(population[i][0]), list(population[i][1])) for i in elite_indices])
+
+        # Never wait for the neighbour, migrants that have not arrived yet are picked up next time
+        immigrants = []
+        while True:
+            try:
+                immigrants.extend(self.inbox.get_nowait())
+            except queue.Empty:
+                return immigrants
+
+
+# island_output_path function is used to give every island its own trace, metrics log and history file
+def island_output_path(path: str, island_id: int) -> str:
+    if not path:
+        return path
+    stem, extension = os.path.splitext(path)
+    return f"{stem}_island{island_id + 1}{extension}"
+
+
+# _island_worker function runs one island until its generations are used up and reports the result
+def _island_worker(island_id: int, spec: dict, scalars: dict, config: dict, inbox, outbox, results):
+    """Sends (island_id, None, result) to results, or (island_id, traceback, None) when the island raised."""
+    # Leftover migrants in the pipe must not keep the worker from exiting
+    outbox.cancel_join_thread()
+    random.seed(config['seed'] + island_id)
+    np.random.seed(config['seed'] + island_id)
+
+    try:
+        # Imported here so the module stays importable from main without a cycle
+        from main import run_genetic_algorithm
+
+        ttp_solver, blocks = attach_ttp_solver(spec, scalars)
+        migration = RingMigration(config['migration_interval'], config['num_migrants'], inbox, outbox)
+        # Every island writes its metrics blocks on its own thread
+        writer = ResultWriter()
+        best_fitness_history, best_fitness, best_solution, max_weight = run_genetic_algorithm(
+            f"Island-{island_id + 1}", None, config['population_size'], config['mutation_rate'], config['generations'],
+            config['objective'], ttp_solver=ttp_solver, migration=migration, genome=config['genome'], seeding=config['seeding'],
+            repair=config['repair'], offspring=config['offspring'], profile=island_output_path(config['profile'], island_id),
+            metrics=island_output_path(config['metrics'], island_id), writer=writer,
+            history_spill=island_output_path(config['history'], island_id), q_batch=config['q_batch'], q_lambda=config['q_lambda'],
+            time_limit=config['time_limit'], max_evaluations=config['max_evaluations'], stagnation=config['stagnation'])
+        for error in writer.close():
+            print(f"Island-{island_id + 1} result writer error: {error!r}")
+    except Exception:
+        results.put((island_id, traceback.format_exc(), None))
+        return
+    results.put((island_id, None, (best_fitness_history, best_fitness, (list(best_solution[0]), list(best_solution[1])), max_weight)))
+
+    del ttp_solver
+    for block in blocks:
+        block.close()
+
+
+# _collect_results function waits for the result of every island, and fails as soon as one island raised or died
+def _collect_results(workers: list, results) -> List[tuple]:
+    island_results = {}
+    while len(island_results) < len(workers):
+        try:
+            island_id, error, result = results.get(timeout=RESULT_POLL_SECONDS)
+        except queue.Empty:
+            # A killed or crashed island never sends its result; one that exited cleanly has its result in the pipe already
+            for island_id, worker in enumerate(workers):
+                if island_id not in island_results and worker.exitcode not in (None, 0):
+                    raise RuntimeError(f"Island {island_id + 1} exited with code {worker.exitcode} without a result.")
+            continue
+        if error is not None:
+            raise RuntimeError(f"Island {island_id + 1} failed:\n{error}")
+        island_results[island_id] = result
+    return [island_results[island_id] for island_id in range(len(workers))]
+
+
+# run_island_model function is used to run the islands in a process pool and collect the best result
+def run_island_model(filename: str, num_islands: int, population_size: int, mutation_rate: float, generations: int,
+                     objective: str = 'profit', migration_interval: int = 50, num_migrants: int = 2, seed: int = 0,
+                     time_limit: float = None, max_evaluations: int = None, stagnation: int = None, genome: str = 'list',
+                     seeding: str = 'greedy', repair: str = 'heaviest', offspring: int = 1, profile: str = None, metrics: str = None,
+                     history_spill: str = None, q_batch: int = 1, q_lambda: float = 0.0):
+    """Returns the same (best_fitness_history, best_fitness, best_solution, max_weight) tuple as
+    run_genetic_algorithm, taken from the best island. The GA settings apply to every island; profile, metrics and
+    history_spill get an _islandN suffix per island. Raises RuntimeError, with the island's traceback, when an island
+    fails or dies; the other islands are stopped then."""
+    ttp_solver = load_ttp_solver(filename)
+    shared = SharedInstance(ttp_solver)
+    config = {
+        'population_size': population_size,
+        'mutation_rate': mutation_rate,
+        'generations': generations,
+        'objective': objective,
+        'migration_interval': migration_interval,
+        'num_migrants': num_migrants,
+        'seed': seed,
+        # Budgets apply to every island on its own
+        'time_limit': time_limit,
+        'max_evaluations': max_evaluations,
+        'stagnation': stagnation,
+        'genome': genome,
+        'seeding': seeding,
+        'repair': repair,
+        'offspring': offspring,
+        'profile': profile,
+        'metrics': metrics,
+        'history': history_spill,
+        'q_batch': q_batch,
+        'q_lambda': q_lambda,
+    }
+
+    # Island i sends to inbox i + 1, so the islands form a ring
+    context = mp.get_context()
+    inboxes = [context.Queue() for _ in range(num_islands)]
+    results = context.Queue()
+    workers = [
+        context.Process(target=_island_worker,
+                        args=(i, shared.spec, shared.scalars, config, inboxes[i], inboxes[(i + 1) % num_islands], results))
+        for i in range(num_islands)
+    ]
+    island_results = None
+    try:
+        for worker in workers:
+            worker.start()
+        # Results are drained before joining, a worker blocks on exit until its result is read
+        island_results = _collect_results(workers, results)
+    finally:
+        # After a failure the remaining islands would run to the end for nothing
+        if island_results is None:
+            for worker in workers:
+                if worker.is_alive():
+                    worker.terminate()
+        for worker in workers:
+            worker.join()
+        shared.release()
+
+    best_fitness_history, best_fitness, best_solution, _ = max(island_results, key=lambda result: result[1])
+    max_weight = max(result[3] for result in island_results)
+    return best_fitness_history, best_fitness, best_solution, max_weight
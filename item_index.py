@@ -0,0 +1,79 @@
+# Description: This file contains the item-to-city index that maps cities and tour positions to the items placed there.
+
+'''File Contains:
+    1. TourLayout class: This class is used to hold the item ids of a route in tour order, grouped by tour position.
+    2. ItemIndex class: This class is used to map every city to its item ids in a CSR (offsets + array) layout.'''
+
+''' Inside ItemIndex class
+    1. from_assigned_nodes function: This function is used to build the index from the ASSIGNED NODE NUMBER column.
+    2. items_of_city function: This function is used to get the item ids of one city.
+    3. tour_layout function: This function is used to get the item ids in the order a route visits them.
+    4. city_totals function: This function is used to sum per-item values (e.g. picked weights) per city.'''
+
+
+# Importing required libraries
+import numpy as np
+from typing import List, NamedTuple
+
+
+# TourLayout class is used to hold the item ids of a route in tour order, grouped by tour position
+class TourLayout(NamedTuple):
+    # items[p] is the item id at picking plan position p
+    items: np.ndarray
+    # The items picked up at tour position i are at plan positions offsets[i]..offsets[i + 1] - 1
+    offsets: np.ndarray
+    # stops[p] is the tour position where the item at plan position p is picked up
+    stops: np.ndarray
+
+
+# ItemIndex class is used to map every city to its item ids in a CSR (offsets + array) layout
+class ItemIndex:
+    def __init__(self, item_cities: np.ndarray, num_cities: int):
+        self.item_cities = np.asarray(item_cities, dtype=np.intp)
+        self.num_cities = num_cities
+        self.num_items = len(self.item_cities)
+        if self.num_items and (self.item_cities.min() < 0 or self.item_cities.max() >= num_cities):
+            raise ValueError("Every item has to be assigned to one of the cities.")
+
+        # The items of city c are city_items[city_offsets[c]:city_offsets[c + 1]], in item id order
+        self.city_items = np.argsort(self.item_cities, kind='stable')
+        self.city_offsets = np.zeros(num_cities + 1, dtype=np.intp)
+        np.cumsum(np.bincount(self.item_cities, minlength=num_cities), out=self.city_offsets[1:])
+
+        # Layout of the last route asked for, routes are replaced rather than changed in place
+        self._layout_route = None
+        self._layout = None
+
+    @classmethod
+    def from_assigned_nodes(cls, assigned_nodes: np.ndarray, num_cities: int) -> 'ItemIndex':
+        # Node numbers are 1-based; the dummy item of the depot is listed with node 0
+        return cls(np.maximum(np.asarray(assigned_nodes, dtype=np.intp) - 1, 0), num_cities)
+
+    def items_of_city(self, city: int) -> np.ndarray:
+        return self.city_items[self.city_offsets[city]:self.city_offsets[city + 1]]
+
+    def tour_layout(self, route: List[int]) -> TourLayout:
+        """Item ids in the order the closed route visits their cities, built in O(num_items) array operations."""
+        if route is self._layout_route:
+            return self._layout
+
+        stops = np.asarray(route[:-1], dtype=np.intp)
+        starts = self.city_offsets[stops]
+        counts = self.city_offsets[stops + 1] - starts
+        offsets = np.zeros(len(stops) + 1, dtype=np.intp)
+        np.cumsum(counts, out=offsets[1:])
+
+        # Plan position p belongs to stop s and is item number p - offsets[s] of that city
+        item_stops = np.repeat(np.arange(len(stops)), counts)
+        items = self.city_items[starts[item_stops] + np.arange(offsets[-1]) - offsets[item_stops]]
+
+        self._layout_route = route
+        self._layout = TourLayout(items, offsets, item_stops)
+        return self._layout
+
+    def city_totals(self, item_values: np.ndarray) -> np.ndarray:
+        """Sum of item_values[..., item] over the items of every city, item_values is indexed by item id."""
+        item_values = np.asarray(item_values, dtype=np.float64)
+        totals = np.zeros(item_values.shape[:-1] + (self.num_cities,))
+        np.add.at(totals, (..., self.item_cities), item_values)
+        return totals
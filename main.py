@@ -2,129 +2,329 @@
 
 '''File Contains:
     1. run_genetic_algorithm function: This function is used to run the Genetic Algorithm for the given benchmark file.
-    2. pareto_front_plot function: This function is used to plot the Pareto Front for the given data.
-    3. main function: This function is used to parse command line arguments and run the Genetic Algorithm.'''
+    2. pareto_front_plot function: This function is used to plot the Pareto Front for the given data into an image file.
+    3. run_output_path function: This function is used to give every run of a command line its own trace and metrics log.
+    4. resume_path function: This function is used to check whether a resume directory holds a checkpoint yet.
+    5. archive_plans function: This function is used to offer a batch of scored picking plans to the Pareto archive.
+    6. main function: This function is used to parse command line arguments and run the Genetic Algorithm.'''
 
 
 # Importing required libraries
 import argparse
+import os
 from ttp_solver import TTPSolver
 from genetic_algorithm import GeneticAlgorithm
-from fitness_function import calculate_fitness
-from ttp_benchmark_solver import read_benchmark_file, generate_items
-import matplotlib.pyplot as plt 
-from genetic_algorithm import check_weight_status
+from fitness_function import BatchFitnessEvaluator, TTPObjectiveEvaluator
+from ttp_benchmark_solver import load_ttp_solver
 import random
 import time
-from child_to_population import ChildToPopulationTypes
+import numpy as np
+from typing import List, Tuple
 from Q_learning import QLearning
+from route_optimization import remap_picking_plans
+from island_model import run_island_model
+from run_profiler import RunProfiler
+from result_writer import ResultWriter, MetricsLog
+from plot_results import plot_convergence, plot_pareto
+from pareto import ParetoArchive
+from history import GenerationHistory
+from population import Population
+from run_budget import RunBudget
+from checkpoint import Checkpointer, DEFAULT_INTERVAL, MANIFEST, load_checkpoint, rng_state, restore_rng_state
 
 
 # Runs the Genetic Algorithm for the given benchmark file
-def run_genetic_algorithm(name: str, filename: str, population_size: int, mutation_rate: float, generations: int):
-
-
-
-    # Read benchmark data
-    benchmark_data = read_benchmark_file(filename)
-
-    # Initialize pareto front
-    pareto_front = []
-
-    items = generate_items(f'{filename}')
-
-    # Initialize TTPSolver
-    ttp_solver = TTPSolver(
-        cities=benchmark_data['cities'],
-        items=items,
-        capacity=benchmark_data['capacity'],
-        min_speed=benchmark_data['min_speed'],
-        max_speed=benchmark_data['max_speed'],
-        renting_ratio=benchmark_data['renting_ratio']
-    )
-
+def run_genetic_algorithm(name: str, filename: str, population_size: int, mutation_rate: float, generations: int, objective: str = 'profit',
+                          ttp_solver: TTPSolver = None, migration=None, genome: str = 'list', seeding: str = 'greedy', repair: str = 'heaviest',
+                          offspring: int = 1, profile: str = None, metrics: str = None, writer: ResultWriter = None,
+                          progress_interval: int = 0, history_spill: str = None, checkpoint: str = None,
+                          checkpoint_interval: float = DEFAULT_INTERVAL, resume: str = None, q_batch: int = 1, q_lambda: float = 0.0,
+                          time_limit: float = None, max_evaluations: int = None, stagnation: int = None):
+    """ttp_solver: an already built instance (e.g. on shared memory), filename is not read when given.
+    migration: island-model hook with an `interval` and an `exchange(population, fitness_scores)` method
+    returning immigrant (route, picking_plan) solutions.
+    offspring: children per generation; 1 keeps the steady-state loop, more breeds a (mu+lambda) batch
+    with the operators the Q-learning state picked for the generation.
+    profile: path of a per-generation trace (.jsonl or .csv); no timing is added to the loop when it is None.
+    metrics: directory of the binary per-generation log (best/mean fitness, max weight and every individual's
+    fitness and weight, the data of the convergence and Pareto plots), its blocks are written on writer's thread.
+    progress_interval: print the best fitness every this many generations, 0 keeps the loop silent.
+    history_spill: file that receives the best fitness and max weight of every generation through a memory map;
+    in memory the run only keeps a fixed window of recent generations and a downsampled series, which is returned
+    as the best fitness history.
+    checkpoint: directory that receives a checkpoint every checkpoint_interval seconds (and at the end of the run).
+    resume: checkpoint directory to continue from; the run then goes on from the checkpoint's generation up to
+    `generations`, with the same population, scores, Q-table, strategy state and random number streams.
+    q_batch / q_lambda: the Q-learning controller updates its Q-table once per q_batch generations, crediting every
+    transition of the window with the later TD errors decayed by discount * q_lambda, up to the next non-greedy action
+    (Watkins's Q(lambda) traces).
+    time_limit / max_evaluations / stagnation: the run also stops after this many wall-clock seconds, fitness
+    evaluations, or generations without a new best fitness; the budgets are checked at the start of every generation
+    and the run prints its generations, evaluations, evaluations per second and stop reason.
+    objective 'bi' maximizes profit and minimizes travel time: survivors are picked by Pareto front and crowding
+    distance instead of the Q-learning replacement, the fitness used by selection and the reward is the TTP objective,
+    and every non-dominated solution found is kept in a Pareto archive (written to front.csv in the metrics directory)."""
+    # Initialize TTPSolver from the benchmark data
+    if ttp_solver is None:
+        ttp_solver = load_ttp_solver(filename)
+    items = ttp_solver.items
+
+    # A resumed run rebuilds its state from the checkpoint instead of initializing, and continues at its generation.
+    # Every setting the trajectory depends on is part of the config, generations and the budgets only decide where it stops
+    run_config = {'objective': objective, 'genome': genome, 'population_size': population_size, 'offspring': offspring,
+                  'mutation_rate': mutation_rate, 'seeding': seeding, 'repair': repair, 'q_batch': q_batch, 'q_lambda': q_lambda,
+                  'migration_interval': migration.interval if migration is not None else None,
+                  'num_cities': ttp_solver.num_cities, 'num_items': len(items)}
+    start_generation, resumed = 0, None
+    if resume:
+        start_generation, resumed, resumed_config = load_checkpoint(resume)
+        if resumed_config != run_config:
+            raise ValueError(f"Checkpoint '{resume}' was written by a run with {resumed_config}, not {run_config}.")
+
+
+    # The trace clock starts before initialization, so the first row covers building the population
+    profiler = RunProfiler(profile) if profile else None
+    # So does the clock of the time budget
+    budget = RunBudget(time_limit, max_evaluations, stagnation)
+
+    # Every evaluator of the run, the seeding one included, is counted by the budget (and timed by the profiler)
+    def instrument_evaluator(evaluator):
+        if profiler is not None:
+            profiler.instrument_evaluator(evaluator)
+        return budget.instrument_evaluator(evaluator)
 
     # Initialize Genetic Algorithm
-    ga = GeneticAlgorithm(population_size, mutation_rate, generations)
-
-    # Initialize population
-    population, distance = ga.initialize_population(benchmark_data['cities'], len(items),items, ttp_solver)
+    ga = GeneticAlgorithm(population_size, mutation_rate, generations, genome, seeding, repair)
+
+    # The whole population shares one route, so the evaluator is built once per run
+    evaluator_class = TTPObjectiveEvaluator if objective in ('ttp', 'bi') else BatchFitnessEvaluator
+
+    # Initialize population, greedy seeding packs against the same objective the run optimizes
+    if resumed is None:
+        population, distance = ga.initialize_population(ttp_solver.cities, len(items),items, ttp_solver, evaluator_class, instrument_evaluator)
+        evaluator = evaluator_class(ttp_solver, population.route, distance)
+    else:
+        ga.get_pipeline(ttp_solver)
+        population = Population.from_state(resumed['route'], resumed['population'])
+        distance = resumed['distance']
+        evaluator = evaluator_class(ttp_solver, population.route, ttp_solver.tour_length(population.route))
     
-    best_fitness_history = []
+    # Constant memory however long the run is: a ring of recent generations and a downsampled series for the plots
+    if resumed is None:
+        best_fitness_history = GenerationHistory(spill=history_spill)
+    else:
+        best_fitness_history = GenerationHistory.from_state(resumed['history'], history_spill)
     best_solution = None
     best_overall_fitness = float('-inf')
 
+    # One snapshot of the previous generation, replaced every generation
     prev_population = None
+    prev_evaluator = None
     prev_best_fitness = float('-inf')
-    
-    # Reset all_weights for each iteration
-    all_weights = []
+    prev_route_state = None
 
+    # The profit objective does not depend on the tour, so the route operators only run for 'ttp' and 'bi'
+    route_search = objective != 'profit'
 
-    # Initialize Q-Learning(Reinforcement Learning) Algorithm
-    QL = QLearning(learning_rate=0.1, discount_factor=0.95, epsilon=0.1)
-    current_state = (0, 0, 0, 0)
 
+    # Initialize Q-Learning(Reinforcement Learning) Algorithm
+    # The fifth component picks the route operator applied to the shared tour
+    QL = QLearning(learning_rate=0.1, discount_factor=0.95, epsilon=0.1, num_components=5, trace_decay=q_lambda, batch_size=q_batch)
+    current_state = (0, 0, 0, 0, 0)
+    before_fitness = None
+
+
+    # Operators were built with the population, each generation looks up the stage of the Q-learning state
+    pipeline = ga.get_pipeline(ttp_solver)
+
+    # Profiling wraps the evaluator, repair and Q-learning methods of these objects only, and reads the pipeline's operator timers
+    if profiler is not None:
+        profiler.pipeline = pipeline
+        profiler.instrument(ga.get_repair_operator(ttp_solver), 'repair', 'repair')
+        profiler.instrument(ga.get_repair_operator(ttp_solver), 'repair_matrix', 'repair')
+        for method_name in ('choose_action', 'get_next_state', 'update'):
+            profiler.instrument(QL, method_name, 'q_learning')
+        profiler.instrument(pipeline.replacer, 'replace_pareto', 'replacement')
+        profiler.instrument_route_optimizer(ga.route_optimizer)
+    instrument_evaluator(evaluator)
+    # The full TTP evaluations of the route operators count towards the evaluation budget as well
+    budget.instrument_route_optimizer(ga.route_optimizer)
+
+    # Score the initial population once, afterwards only the replaced slot is re-scored
+    if resumed is None:
+        population.set_scores(*evaluator.evaluate(population.matrix()))
+
+    # The loop only copies its scores into the log's in-memory block
+    metrics_log = MetricsLog(metrics, len(population), writer, resume=start_generation) if metrics else None
+
+    # Bi-objective runs keep the (profit, travel time) arrays of the population next to its scores, None when they
+    # have to be recomputed (new route, reverted generation, migrants), and offer every child to the archive
+    archive = ParetoArchive() if objective == 'bi' else None
+    parent_objectives = None
+    if archive is not None and resumed is None:
+        parent_objectives = evaluator.objectives(population.matrix())[:2]
+        archive_plans(archive, population.route, population.matrix(), parent_objectives)
+
+    if resumed is not None:
+        best_solution, best_overall_fitness = resumed['best_solution'], resumed['best_overall_fitness']
+        if resumed['prev_population'] is not None:
+            prev_population = Population.from_state(resumed['prev_route'], resumed['prev_population'])
+            prev_evaluator = evaluator if prev_population.route == population.route else instrument_evaluator(
+                evaluator_class(ttp_solver, prev_population.route, ttp_solver.tour_length(prev_population.route)))
+        prev_best_fitness = resumed['prev_best_fitness']
+        prev_route_state = resumed['prev_route_optimizer']
+        QL.restore(resumed['q_learning'])
+        current_state, before_fitness = resumed['current_state'], resumed['before_fitness']
+        ga.route_optimizer.restore(resumed['route_optimizer'])
+        budget.restore(resumed['budget'])
+        if archive is not None:
+            archive = resumed['archive']
+        # Last, so nothing above draws from the restored streams
+        restore_rng_state(resumed['rng'])
+
+    # Checkpoints are taken at the start of a generation and hold everything the rest of the run depends on, as copies
+    checkpointer = Checkpointer(checkpoint, checkpoint_interval, writer) if checkpoint else None
+
+    def save_checkpoint(generation: int):
+        # The metrics blocks are queued ahead of the checkpoint, so the log on disk covers every generation it has seen
+        if metrics_log is not None:
+            metrics_log.flush()
+        state = {
+            'population': population.state(), 'distance': distance,
+            'prev_population': prev_population.state() if prev_population is not None else None,
+            'prev_best_fitness': prev_best_fitness, 'best_overall_fitness': best_overall_fitness, 'best_solution': best_solution,
+            'history': best_fitness_history.state(), 'q_learning': QL.state(), 'current_state': current_state,
+            'before_fitness': before_fitness, 'route_optimizer': ga.route_optimizer.state(), 'prev_route_optimizer': prev_route_state,
+            'archive': archive.copy() if archive is not None else None, 'budget': budget.state(), 'rng': rng_state(),
+        }
+        # The routes only change when a route operator improves the tour, they are not rewritten otherwise
+        static = {'route': population.route, 'prev_route': prev_population.route if prev_population is not None else None}
+        checkpointer.save(generation, state, static, run_config)
 
     # Run the Genetic Algorithm
-    for generation in range(ga.generations):
-        scores = [calculate_fitness(solution, ttp_solver, distance) for solution in population]
-        pareto_front.append(scores)
-        fitness, weight = zip(*scores)
-        
-        # Convert to lists if necessary
-        fitness_scores = list(fitness)
-        weights = list(weight)
-        all_weights.append(max(weights))
-        best_fitness = max(fitness_scores)
-        best_fitness_history.append(best_fitness)
-
-        # Update best overall fitness and solution
+    for generation in range(start_generation, ga.generations):
+        # A run stopped by a budget ends in the state it had at the start of this generation
+        if budget.exhausted(generation, population.best_fitness()):
+            break
+        if checkpointer is not None and checkpointer.due():
+            save_checkpoint(generation)
+
+        best_fitness = population.best_fitness()
+        best_fitness_history.record(generation, best_fitness, max(population.weights))
+
+        # Row `generation` of the trace holds the work that produced this generation (row 0: initialization)
+        if profiler is not None:
+            profiler.end_generation(generation, best_fitness)
+
+        # Update best overall fitness and solution, copied out since its row is overwritten later
         if best_fitness > best_overall_fitness:
             best_overall_fitness = best_fitness
-            best_solution = population[fitness_scores.index(best_fitness)]
-
-        # Check if the algorithm has converged
-        if generation >= 150000 and all(x == best_fitness_history[generation - 500] for x in best_fitness_history[generation - 500: generation + 1]):
-            evolution = False
-        else:
-            evolution = True
+            best_solution = population.solution(population.best_index())
 
-        print(f"{name} - Generation {generation}: Best Fitness = {best_fitness}")
+        reverted = best_fitness < prev_best_fitness
+        if metrics_log is not None:
+            metrics_log.record(generation, population.fitness_scores, population.weights, reverted)
+        if progress_interval and generation % progress_interval == 0:
+            print(f"{name} - Generation {generation}: Best Fitness = {best_fitness}")
 
         # Check if the best fitness has improved from the previous generation
-        if best_fitness < prev_best_fitness:
-            print(f"{name} - Generation {generation}: Reverting to previous generation's population")
+        if reverted:
             population = prev_population  
-            best_fitness_history[-1] = prev_best_fitness  
+            evaluator = prev_evaluator
+            parent_objectives = None
+            # The don't-look bits go back with the tour, so the cities dequeued for the rejected tour are searched again
+            if prev_route_state is not None:
+                ga.route_optimizer.restore(prev_route_state)
+            best_fitness_history.set_last_best(prev_best_fitness)
             continue 
 
-        # Store the current population and best fitness for the next iteration
-        prev_population = population[:]
+        # Store the current population with its cached scores (one matrix copy) and best fitness for the next iteration
+        prev_population = population.snapshot()
+        prev_evaluator = evaluator
         prev_best_fitness = best_fitness
-
-
-        # Select parents based on fitness
-        parents = ga.select_parents(population, fitness_scores, evolution, current_state[0])
-        parent1 = parents[0]
-        parent2 = parents[1]
-
-        # Generate new population using crossover and mutation
-        child = ga.crossover(parent1, parent2, evolution, current_state[1])
-        child = ga.mutate(child, evolution, current_state[2])
-        route = child[0]
-        # Check weight status and add to new population
-        final_child, weight = check_weight_status(child[1], items, ttp_solver, route)
-        temp_final_child = (route, final_child)
-
-
-
-        diff_strategy = ["replace_bottom_20_percent","replace_lowest_fitness","replace_based_on_fitness_probability", "replace_lowest_fitness"]
-        strategy = diff_strategy[current_state[3]]
-        population_manager = ChildToPopulationTypes(ga)
-        new_population = population_manager.replace(strategy, population, fitness_scores, temp_final_child)
-
-        population = new_population
+        if route_search:
+            prev_route_state = ga.route_optimizer.state()
+
+
+        # Island model: send elites to the next island and take in the migrants that arrived
+        if migration is not None and generation > 0 and generation % migration.interval == 0:
+            route = population.route
+            for immigrant_route, immigrant_plan in migration.exchange(population, population.fitness_scores):
+                plan = remap_picking_plans(np.asarray([immigrant_plan]) == 1, immigrant_route, route, ttp_solver.item_index)
+                fitness, weight = evaluator.evaluate(plan)
+                worst_index = population.worst_index()
+                population[worst_index] = (route, plan[0])
+                population.set_score(worst_index, fitness.item(), weight.item())
+            parent_objectives = None
+
+        stage = pipeline[current_state]
+
+        if offspring > 1:
+            # The whole batch is selected, crossed, mutated, repaired and scored as matrices, then merged in one replacement
+            children, child_fitness, child_weights = ga.breed(population, evaluator, ttp_solver, offspring, current_state)
+            if archive is None:
+                stage.replace_batch(population, population.fitness_scores, children, child_fitness, child_weights, population.weights)
+        else:
+            # Select parents based on fitness, the selection draws their indices from the population's fitness index
+            parent_indices = stage.select(population.ranking())
+            parent1 = population[parent_indices[0]]
+            parent2 = population[parent_indices[1]]
+
+            # Generate new population using crossover and mutation
+            # The crossed child is totalled once, a pass over the plan (byte lookups for packed plans)
+            child = stage.crossover(parent1, parent2)
+            child_value, child_weight = evaluator.plan_totals(child[1])
+
+            # Mutation reports the bits it flipped, so its change to those totals costs O(flips) instead of a second pass
+            child = stage.mutate(child)
+            delta_value, delta_weight = evaluator.flip_delta(child[1], pipeline.mutation_types.flipped_indices)
+            child_value += delta_value
+            child_weight += delta_weight
+            route = child[0]
+
+            # Repair an overweight child and add it to the new population
+            removed_indices = []
+            final_child, child_weight = ga.repair(child[1], evaluator, ttp_solver, child_weight, removed_indices)
+            child_value -= evaluator.values[removed_indices].sum()
+            temp_final_child = (route, final_child)
+            child_score = evaluator.score(final_child, child_value, child_weight)
+
+
+
+            # The child is written into its row of the plan matrix, the cached columns are updated in place
+            if archive is None:
+                stage.replace(population, population.fitness_scores, temp_final_child, child_score, population.weights)
+            else:
+                children, child_fitness, child_weights = np.asarray([final_child]) == 1, np.array([child_score[0]]), np.array([child_score[1]])
+
+        if archive is not None:
+            # Pareto survival of parents and children replaces the Q-learning replacement component
+            if parent_objectives is None:
+                parent_objectives = evaluator.objectives(population.matrix())[:2]
+            child_objectives = evaluator.objectives(children)[:2]
+            archive_plans(archive, population.route, children, child_objectives)
+            pipeline.replacer.replace_pareto(population, parent_objectives, children, child_objectives, child_fitness, child_weights)
+
+        # Route operators improve the shared tour from the best plan, a new tour is carried over to every plan
+        if route_search:
+            route = population.route
+            best_index = population.best_index()
+            best_plan = population[best_index].picking_plan
+            new_route, improved_plan = stage.route(route, best_plan)
+            if new_route is not route:
+                population.set_route(new_route, ttp_solver.item_index)
+                evaluator = instrument_evaluator(evaluator_class(ttp_solver, new_route, ttp_solver.tour_length(new_route)))
+                best_plan = population[best_index].picking_plan
+            plan_changed = improved_plan is not best_plan and improved_plan != best_plan
+            if plan_changed:
+                population[best_index] = (new_route, improved_plan)
+            if new_route is not route:
+                population.set_scores(*evaluator.evaluate(population.matrix()))
+            elif plan_changed:
+                fitness, weight = evaluator.evaluate(np.asarray([improved_plan]) == 1)
+                population.set_score(best_index, fitness.item(), weight.item())
+            if new_route is not route or plan_changed:
+                parent_objectives = None
 
         if generation == 0:
             before_fitness = best_fitness
@@ -143,25 +343,60 @@ def run_genetic_algorithm(name: str, filename: str, population_size: int, mutati
 
     best_strategies = QL.get_best_strategies()
     print(f"Best Strategies: {best_strategies}")
+    print(f"Operator Timings: {pipeline.timing_report()}")
+    if profiler is not None:
+        profiler.end_generation(ga.generations, best_overall_fitness)
+        print(f"Profile ({profile}): {profiler.close()}")
+
+    if metrics_log is not None:
+        metrics_log.close()
+
+    if archive is not None:
+        # The reference point is the initial tour driven at minimum speed with nothing picked
+        front_time, front_profit = archive.front()
+        print(f"Pareto Front: {len(archive)} solutions, hypervolume {archive.hypervolume(distance / ttp_solver.min_speed):.6g}")
+        if metrics:
+            np.savetxt(os.path.join(metrics, 'front.csv'), np.column_stack([front_time, front_profit]),
+                       delimiter=',', header='travel_time,profit', comments='')
 
-    # pareto_front_plot(pareto_front)
+    budget.finish(max(ga.generations, start_generation))
+    print(f"Run: {budget.report()}")
 
-    return best_fitness_history, best_overall_fitness, best_solution, max(all_weights)
+    # The final state is saved too, so a finished run can be resumed with more generations
+    if checkpointer is not None:
+        save_checkpoint(budget.generation)
+    best_fitness_history.close()
 
+    return best_fitness_history.series(), best_overall_fitness, best_solution, best_fitness_history.max_weight
 
 
-# Plots the Pareto Front for the given data
-def pareto_front_plot(pareto_front, title="Pareto Front"):
-    plt.figure(figsize=(8, 6))
-    for generation_index, generation in enumerate(pareto_front):
-        weights, profits = zip(*generation)
-        plt.scatter(weights, profits, marker='o')
-    plt.xlabel('Weight')
-    plt.ylabel('Profit')
-    plt.title(title)
-    plt.grid(True)
-    plt.legend()
-    plt.show()
+
+# Plots the Pareto Front for the given data, one list of (fitness, weight) pairs per generation
+def pareto_front_plot(pareto_front, title="Pareto Front", filename="pareto_front.png"):
+    scores = np.asarray(pareto_front, dtype=np.float64)
+    plot_pareto(scores[..., 0], scores[..., 1], filename, title)
+
+
+# Returns the trace or log path of one run, numbered when a command line runs several GAs
+def run_output_path(path: str, run: int, idx: int, num_runs: int) -> str:
+    if not path or num_runs == 1:
+        return path
+    stem, extension = os.path.splitext(path)
+    return f"{stem}_run{run + 1}_ga{idx + 1}{extension}"
+
+
+# Returns the checkpoint directory to resume from, None when there is nothing to resume yet
+def resume_path(path: str) -> str:
+    if path and os.path.exists(os.path.join(path, MANIFEST)):
+        return path
+    return None
+
+
+# Offers a batch of picking plans (boolean matrix) with their (profit, travel time) to the Pareto archive, the
+# entries keep the route and the plan packed to bits, and are only built for the plans the archive takes in
+def archive_plans(archive: ParetoArchive, route: List[int], picking_plans: np.ndarray, objectives: Tuple[np.ndarray, np.ndarray]) -> int:
+    profit, travel_time = objectives
+    return archive.insert_batch(travel_time, profit, lambda row: (route, np.packbits(picking_plans[row], bitorder='little')))
 
 
 # Main function to run the Genetic Algorithm
@@ -196,11 +431,36 @@ def main():
     parser.add_argument('--mutation', type=float, default=0.05, help='Mutation rate')
     parser.add_argument('--generations', type=int, default=2000, help='Number of generations')
     parser.add_argument('--itrations', type=int, default=1, help='Number of iterations')
+    parser.add_argument('--islands', type=int, default=0, help='Number of parallel GA islands (0 runs a single GA in this process)')
+    parser.add_argument('--migration-interval', type=int, default=50, help='Generations between elite migrations in island mode')
+    parser.add_argument('--migrants', type=int, default=2, help='Elite picking plans sent to the next island per migration')
+    parser.add_argument('--seeding', choices=['greedy', 'random'], default='greedy', help='Initial picking plans: PackIterative-style greedy packing or repaired random plans')
+    parser.add_argument('--repair', choices=['heaviest', 'ratio', 'distance_ratio'], default='heaviest', help='Order in which overweight plans drop items: heaviest first, worst profit/weight first, or worst profit/(weight x distance carried) first')
+    parser.add_argument('--offspring', type=int, default=1, help='Children bred per generation: 1 is the steady-state GA, more runs a batched (mu+lambda) generation')
+    parser.add_argument('--profile', default=None, help='Write a per-generation timing trace to this .jsonl or .csv file (one file per run and benchmark file)')
+    parser.add_argument('--metrics', default=None, help='Directory for a binary per-generation metrics log (render it later with plot_results.py)')
+    parser.add_argument('--progress', type=int, default=100, help='Print the best fitness every this many generations (0: silent)')
+    parser.add_argument('--checkpoint', default=None, help='Directory for periodic checkpoints of the run (one directory per run and benchmark file)')
+    parser.add_argument('--checkpoint-every', type=float, default=DEFAULT_INTERVAL, help='Seconds between checkpoints')
+    parser.add_argument('--resume', default=None, help='Continue from the checkpoint in this directory (a fresh run starts when it holds none); checkpoints go on being written there unless --checkpoint is given')
+    parser.add_argument('--q-batch', type=int, default=1, help='Generations whose Q-learning transitions are applied to the Q-table in one batch update')
+    parser.add_argument('--q-lambda', type=float, default=0.0, help='Q(lambda) eligibility trace decay within a batch (0: one-step Q-learning)')
+    parser.add_argument('--time-limit', type=float, default=None, help='Stop a run after this many wall-clock seconds')
+    parser.add_argument('--max-evaluations', type=int, default=None, help='Stop a run after this many fitness evaluations')
+    parser.add_argument('--stagnation', type=int, default=None, help='Stop a run after this many generations without a new best fitness')
+    parser.add_argument('--history', default=None, help='Spill the best fitness and max weight of every generation to this memory-mapped file (one file per run and benchmark file)')
+    parser.add_argument('--genome', choices=['list', 'packed'], default='list', help='Picking plan storage: lists of 0/1 or packed bitsets')
+    parser.add_argument('--objective', choices=['profit', 'ttp', 'bi'], default='profit', help='Fitness: total profit, the full TTP objective with renting cost, or bi-objective (max profit, min travel time) with a Pareto archive')
 
     args = parser.parse_args()
+    if args.islands > 0 and (args.checkpoint or args.resume):
+        parser.error('--checkpoint and --resume apply to the single-GA mode, not to --islands')
 
     final_results = []
 
+    # Plots and metrics blocks are written on this thread, the GA loop never waits on them
+    writer = ResultWriter()
+
     # Open a file to log the results
     with open("results_log.txt", "w") as log_file:
         log_file.write("Iteration\tBest Fitness\tMax Weight\n")  
@@ -210,13 +470,40 @@ def main():
 
             for idx, file in enumerate(args.files):
                 # from here we will call the genetic algorithm
-                ga_results = run_genetic_algorithm(  
-                    f"GA-{idx+1}",
-                    file,
-                    args.population,
-                    args.mutation,
-                    args.generations
-                )
+                if args.islands > 0:
+                    ga_results = run_island_model(
+                        file,
+                        args.islands,
+                        args.population,
+                        args.mutation,
+                        args.generations,
+                        args.objective,
+                        args.migration_interval,
+                        args.migrants,
+                        seed=run, time_limit=args.time_limit, max_evaluations=args.max_evaluations, stagnation=args.stagnation,
+                        genome=args.genome, seeding=args.seeding, repair=args.repair, offspring=args.offspring,
+                        profile=run_output_path(args.profile, run, idx, args.itrations * len(args.files)),
+                        metrics=run_output_path(args.metrics, run, idx, args.itrations * len(args.files)),
+                        history_spill=run_output_path(args.history, run, idx, args.itrations * len(args.files)),
+                        q_batch=args.q_batch, q_lambda=args.q_lambda
+                    )
+                else:
+                    ga_results = run_genetic_algorithm(  
+                        f"GA-{idx+1}",
+                        file,
+                        args.population,
+                        args.mutation,
+                        args.generations,
+                        args.objective,
+                        genome=args.genome, seeding=args.seeding, repair=args.repair, offspring=args.offspring,
+                        profile=run_output_path(args.profile, run, idx, args.itrations * len(args.files)),
+                        metrics=run_output_path(args.metrics, run, idx, args.itrations * len(args.files)),
+                        writer=writer, progress_interval=args.progress,
+                        history_spill=run_output_path(args.history, run, idx, args.itrations * len(args.files)),
+                        checkpoint=run_output_path(args.checkpoint or args.resume, run, idx, args.itrations * len(args.files)),
+                        checkpoint_interval=args.checkpoint_every, q_batch=args.q_batch, q_lambda=args.q_lambda,
+                        time_limit=args.time_limit, max_evaluations=args.max_evaluations, stagnation=args.stagnation, resume=resume_path(run_output_path(args.resume, run, idx, args.itrations * len(args.files)))
+                    )
                 run_results.append(ga_results)
                 main_weights.append(run_results[0][3]) 
 
@@ -231,18 +518,12 @@ def main():
 
             print(f'Final weight for iteration {run + 1} is {max_weight}')
 
-            # Plot the results for the run
-            plt.figure(figsize=(12, 6))
+            # Plot the results for the run in the background
             for idx, result in enumerate(run_results):
-                plt.plot(result[0], label=f'GA-{idx+1} (Run {run+1})')
                 print(f"\nRun {run+1}, GA-{idx+1} Best Fitness: {result[1]}")
-            plt.xlabel('Generation')
-            plt.ylabel('Best Fitness')
-            plt.title(f'Genetic Algorithm Performance Comparison - Run {run+1}')
-            plt.legend()
-            # plt.grid(True)
-            plt.savefig(f'ga_comparison_run_{run+1}.png')
-            plt.show()
+            writer.submit(plot_convergence, [result[0] for result in run_results],
+                          [f'GA-{idx+1} (Run {run+1})' for idx in range(len(run_results))],
+                          f'Genetic Algorithm Performance Comparison - Run {run+1}', f'ga_comparison_run_{run+1}.png')
 
 
             # Append the best fitness to the final results
@@ -254,6 +535,10 @@ def main():
         end_time = time.time()
         print(f'total time taken was {end_time-start_time}')
 
+    # Wait for the queued plots and log blocks before exiting
+    for error in writer.close():
+        print(f"Result writer error: {error!r}")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,16 +1,53 @@
 import random
+import numpy as np
 from typing import List, Tuple
+from bitset_genome import PackedPlan
 
 
 class MutationTypes:
     def __init__(self, mutation_rate: float):
         self.mutation_rate = mutation_rate
+        # Indices whose picked status (value == 1) changed in the last mutation, used for delta fitness
+        self.flipped_indices: List[int] = []
+        # Mapping method names to actual methods, resolved once instead of by getattr on every call
+        self.methods = {
+            "bit_flip_mutation": self.bit_flip_mutation,
+            "random_item_swap_mutation": self.random_item_swap_mutation,
+            "scramble_mutation": self.scramble_mutation,
+            "inversion_mutation": self.inversion_mutation,
+            "reset_mutation": self.reset_mutation,
+            "block_flip_mutation": self.block_flip_mutation,
+            "gaussian_mutation": self.gaussian_mutation,
+        }
+        # Batch versions mutate every row of a boolean plan matrix
+        self.batch_methods = {
+            "bit_flip_mutation": self.bit_flip_mutation_batch,
+            "scramble_mutation": self.scramble_mutation_batch,
+            "inversion_mutation": self.inversion_mutation_batch,
+            "block_flip_mutation": self.block_flip_mutation_batch,
+            "gaussian_mutation": self.gaussian_mutation_batch,
+        }
+
+    def _record_change(self, index: int, old_value, new_value):
+        if (old_value == 1) != (new_value == 1):
+            self.flipped_indices.append(index)
+
+    def _record_segment_changes(self, start: int, old_segment: List[int], new_segment: List[int]):
+        for offset, (old_value, new_value) in enumerate(zip(old_segment, new_segment)):
+            self._record_change(start + offset, old_value, new_value)
 
     def bit_flip_mutation(self, solution: Tuple[List[int], List[int]]) -> Tuple[List[int], List[int]]:
         route, items = solution
+        if isinstance(items, PackedPlan):
+            flips = np.flatnonzero(np.random.random(len(items)) < self.mutation_rate)
+            items.flip(flips)
+            self.flipped_indices.extend(flips.tolist())
+            return route, items
         for i in range(len(items)):
             if random.random() < self.mutation_rate:
+                old_value = items[i]
                 items[i] = 1 - items[i]  # Flip the bit (0 -> 1, 1 -> 0)
+                self._record_change(i, old_value, items[i])
         return route, items
 
     def random_item_swap_mutation(self, solution: Tuple[List[int], List[int]]) -> Tuple[List[int], List[int]]:
@@ -18,6 +55,8 @@ class MutationTypes:
         if random.random() < self.mutation_rate:
             idx1, idx2 = random.sample(range(len(items)), 2)
             items[idx1], items[idx2] = items[idx2], items[idx1]
+            self._record_change(idx1, items[idx2], items[idx1])
+            self._record_change(idx2, items[idx1], items[idx2])
         return route, items
 
     def scramble_mutation(self, solution: Tuple[List[int], List[int]]) -> Tuple[List[int], List[int]]:
@@ -27,7 +66,9 @@ class MutationTypes:
             end = random.randint(start + 1, len(items))
             sub_items = items[start:end]
             random.shuffle(sub_items)
+            old_segment = items[start:end]
             items[start:end] = sub_items
+            self._record_segment_changes(start, old_segment, sub_items)
         return route, items
 
     def inversion_mutation(self, solution: Tuple[List[int], List[int]]) -> Tuple[List[int], List[int]]:
@@ -35,14 +76,18 @@ class MutationTypes:
         if random.random() < self.mutation_rate:
             start = random.randint(0, len(items) - 2)
             end = random.randint(start + 1, len(items))
-            items[start:end] = items[start:end][::-1]
+            old_segment = items[start:end]
+            items[start:end] = old_segment[::-1]
+            self._record_segment_changes(start, old_segment, items[start:end])
         return route, items
 
     def reset_mutation(self, solution: Tuple[List[int], List[int]]) -> Tuple[List[int], List[int]]:
         route, items = solution
         if random.random() < self.mutation_rate:
             idx = random.randint(0, len(items) - 1)
+            old_value = items[idx]
             items[idx] = random.choice([0, 1])
+            self._record_change(idx, old_value, items[idx])
         return route, items
 
     def block_flip_mutation(self, solution: Tuple[List[int], List[int]]) -> Tuple[List[int], List[int]]:
@@ -50,16 +95,31 @@ class MutationTypes:
         if random.random() < self.mutation_rate:
             start = random.randint(0, len(items) - 2)
             end = random.randint(start + 1, len(items))
+            if isinstance(items, PackedPlan):
+                items.flip(np.arange(start, end))
+                self.flipped_indices.extend(range(start, end))
+                return route, items
             for i in range(start, end):
+                old_value = items[i]
                 items[i] = 1 - items[i]
+                self._record_change(i, old_value, items[i])
         return route, items
 
     def gaussian_mutation(self, solution: Tuple[List[int], List[int]]) -> Tuple[List[int], List[int]]:
         route, items = solution
         if random.random() < self.mutation_rate:
+            if isinstance(items, PackedPlan):
+                # A picked bit drops below 1 when its noise is negative, an unpicked one never reaches 1
+                touched = np.flatnonzero(np.random.random(len(items)) < self.mutation_rate)
+                cleared = touched[items.to_bool()[touched] & (np.random.normal(0, 0.1, len(touched)) < 0)]
+                items.flip(cleared)
+                self.flipped_indices.extend(cleared.tolist())
+                return route, items
             for i in range(len(items)):
                 if random.random() < self.mutation_rate:
+                    old_value = items[i]
                     items[i] = max(0, min(1, items[i] + random.gauss(0, 0.1)))  # Clamping to [0,1]
+                    self._record_change(i, old_value, items[i])
         return route, items
 
     def apply_mutation(self, mutation_name: str, solution: Tuple[List[int], List[int]]) -> Tuple[List[int], List[int]]:
@@ -68,11 +128,73 @@ class MutationTypes:
 
         :param mutation_name: The name of the mutation method as a string.
         :param solution: A tuple containing route and items.
-        :return: Mutated solution.
+        :return: Mutated solution. The indices whose picked status changed are left in `flipped_indices`.
+        """
+        return self.mutator(mutation_name)(solution)
+
+    def mutator(self, mutation_name: str):
+        """Resolve a mutation method once: the returned function resets `flipped_indices` and applies it."""
+        if mutation_name not in self.methods:
+            raise ValueError(f"Mutation method '{mutation_name}' not found or not callable.")
+        mutation_method = self.methods[mutation_name]
+
+        def mutate(solution: Tuple[List[int], List[int]]) -> Tuple[List[int], List[int]]:
+            self.flipped_indices = []
+            return mutation_method(solution)
+        return mutate
+
+    def apply_mutation_batch(self, mutation_name: str, picking_plans: np.ndarray) -> np.ndarray:
+        """
+        Apply the batch version of a mutation method to every row of a boolean plan matrix.
+
+        :param mutation_name: The name of the mutation method as a string.
+        :param picking_plans: Boolean matrix with one picking plan per row, it is changed in place.
+        :return: The mutated matrix.
         """
-        # Retrieve the method by name using `getattr`
-        if hasattr(self, mutation_name):
-            mutation_method = getattr(self, mutation_name)
-            if callable(mutation_method):
-                return mutation_method(solution)
-        raise ValueError(f"Mutation method '{mutation_name}' not found or not callable.")
+        if mutation_name not in self.batch_methods:
+            raise ValueError(f"Mutation method '{mutation_name}' has no batch version.")
+        return self.batch_methods[mutation_name](picking_plans)
+
+    # Rows that get the once-per-plan mutations (scramble, inversion, ...) and their [start, end) segments
+    def _segment_rows(self, picking_plans: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        num_plans, num_items = picking_plans.shape
+        rows = np.flatnonzero(np.random.random(num_plans) < self.mutation_rate)
+        starts = np.random.randint(0, num_items - 1, len(rows))
+        ends = np.random.randint(starts + 1, num_items + 1)
+        return rows, starts[:, None], ends[:, None]
+
+    # Batch Mutation Methods, each mirrors the single-plan method above for every row
+
+    def bit_flip_mutation_batch(self, picking_plans: np.ndarray) -> np.ndarray:
+        picking_plans ^= np.random.random(picking_plans.shape) < self.mutation_rate
+        return picking_plans
+
+    def gaussian_mutation_batch(self, picking_plans: np.ndarray) -> np.ndarray:
+        # Per plan with probability mutation_rate, then per gene: a picked gene is cleared when its noise is negative
+        rows = np.flatnonzero(np.random.random(len(picking_plans)) < self.mutation_rate)
+        touched = np.random.random((len(rows), picking_plans.shape[1])) < self.mutation_rate
+        picking_plans[rows] &= ~(touched & (np.random.normal(0, 0.1, touched.shape) < 0))
+        return picking_plans
+
+    def inversion_mutation_batch(self, picking_plans: np.ndarray) -> np.ndarray:
+        rows, starts, ends = self._segment_rows(picking_plans)
+        positions = np.arange(picking_plans.shape[1])
+        inside = (positions >= starts) & (positions < ends)
+        source = np.where(inside, starts + ends - 1 - positions, positions)
+        picking_plans[rows] = np.take_along_axis(picking_plans[rows], source, axis=1)
+        return picking_plans
+
+    def scramble_mutation_batch(self, picking_plans: np.ndarray) -> np.ndarray:
+        rows, starts, ends = self._segment_rows(picking_plans)
+        positions = np.arange(picking_plans.shape[1])
+        inside = (positions >= starts) & (positions < ends)
+        # Segment genes get random sort keys inside [start, end), the rest keep their position, so only the segment is shuffled
+        keys = np.where(inside, starts + np.random.random(inside.shape) * (ends - starts), positions)
+        picking_plans[rows] = np.take_along_axis(picking_plans[rows], np.argsort(keys, axis=1), axis=1)
+        return picking_plans
+
+    def block_flip_mutation_batch(self, picking_plans: np.ndarray) -> np.ndarray:
+        rows, starts, ends = self._segment_rows(picking_plans)
+        positions = np.arange(picking_plans.shape[1])
+        picking_plans[rows] ^= (positions >= starts) & (positions < ends)
+        return picking_plans
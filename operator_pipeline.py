@@ -0,0 +1,123 @@
+# Description: This file contains the operator pipeline that builds the GA operators once and dispatches them by Q-learning state.
+
+'''File Contains:
+    1. Stage class: This class is used to hold the resolved operator functions of one Q-learning state.
+    2. OperatorPipeline class: This class is used to build every operator once, resolve all states to stages and time every operator call.'''
+
+''' Inside OperatorPipeline class
+    1. __getitem__ function: This function is used to get the stage of a Q-learning state with one dictionary lookup.
+    2. timing_report function: This function is used to get the calls, total and mean time of every operator.'''
+
+
+# Importing required libraries
+import itertools
+import time
+import numpy as np
+from typing import Callable, Dict, List, NamedTuple, Tuple
+from parent_selection import ParentSelectionStrategies, as_ranking
+from crossover import CrossoverMethods
+from mutation import MutationTypes
+from child_to_population import ChildToPopulationTypes
+from route_optimization import RouteOptimizer
+
+
+# Stage class is used to hold the resolved operator functions of one Q-learning state
+class Stage(NamedTuple):
+    # Steady-state operators: ranking -> [i, j], (parent1, parent2) -> child, child -> child,
+    # (population, fitness_scores, child, child_score, weights) -> population, (route, plan) -> (route, plan)
+    select: Callable
+    crossover: Callable
+    mutate: Callable
+    replace: Callable
+    route: Callable
+    # Batch operators: (ranking, num_pairs) -> pairs, (parents1, parents2) -> children, children -> children,
+    # (population, fitness_scores, children, child_fitness, child_weights, weights) -> population
+    select_batch: Callable
+    crossover_batch: Callable
+    mutate_batch: Callable
+    replace_batch: Callable
+
+
+# OperatorPipeline class is used to build every operator once, resolve all states to stages and time every operator call
+class OperatorPipeline:
+    def __init__(self, ga, ttp_solver: 'TTPSolver'):
+        """ga supplies the strategy lists (indexed by the state components) and the mutation rate."""
+        self.selector = ParentSelectionStrategies()
+        self.crossover_methods = CrossoverMethods()
+        self.mutation_types = MutationTypes(mutation_rate=ga.mutation_rate)
+        self.replacer = ChildToPopulationTypes(ga)
+        self.route_optimizer = RouteOptimizer(ttp_solver)
+
+        # (calls, seconds) per operator, shared by every stage that uses it
+        self.timings: Dict[str, List] = {}
+
+        # Per component: (steady-state, batch) functions in strategy order, the route operators have no batch version
+        self.selection = [self._resolve_selection(name) for name in ga.SELECTION_STRATEGIES]
+        self.crossover = [self._resolve_crossover(name) for name in ga.CROSSOVER_STRATEGIES]
+        self.mutation = [self._resolve_mutation(name) for name in ga.MUTATION_STRATEGIES]
+        self.replacement = [self._resolve_replacement(name) for name in ga.REPLACEMENT_STRATEGIES]
+        self.route = [self._timed("route", name, self.route_optimizer.methods[name]) for name in ga.ROUTE_STRATEGIES]
+
+        # Flat table: every state tuple maps straight to its stage
+        self.stages = {}
+        components = (self.selection, self.crossover, self.mutation, self.replacement, self.route)
+        for state in itertools.product(*(range(len(options)) for options in components)):
+            s, c, m, r, o = state
+            self.stages[state] = Stage(self.selection[s][0], self.crossover[c][0], self.mutation[m][0], self.replacement[r][0], self.route[o],
+                                       self.selection[s][1], self.crossover[c][1], self.mutation[m][1], self.replacement[r][1])
+
+    def __getitem__(self, state) -> Stage:
+        return self.stages[tuple(int(component) for component in state)]
+
+    # Wrap an operator so every call adds to its (calls, seconds) record
+    def _timed(self, component: str, name: str, operator: Callable) -> Callable:
+        record = self.timings.setdefault(f"{component}:{name}", [0, 0.0])
+
+        def timed(*args):
+            start = time.perf_counter()
+            result = operator(*args)
+            record[0] += 1
+            record[1] += time.perf_counter() - start
+            return result
+        return timed
+
+    def _resolve_selection(self, name: str) -> Tuple[Callable, Callable]:
+        kernel = self.selector.batch_methods[name]
+
+        # One pair of indices from the index kernel. ranking is the population's FitnessIndex (Population.ranking()),
+        # a plain score list is indexed for the call
+        def select(ranking) -> List[int]:
+            return kernel(as_ranking(ranking), 1)[0].tolist()
+
+        def select_batch(ranking, num_pairs: int) -> np.ndarray:
+            return kernel(as_ranking(ranking), num_pairs)
+        return self._timed("selection", name, select), self._timed("selection_batch", name, select_batch)
+
+    def _resolve_crossover(self, name: str) -> Tuple[Callable, Callable]:
+        kernel = self.crossover_methods.batch_methods[name]
+
+        def crossover_batch(parents1: np.ndarray, parents2: np.ndarray) -> np.ndarray:
+            return kernel(np.asarray(parents1, dtype=bool), np.asarray(parents2, dtype=bool))
+        return (self._timed("crossover", name, self.crossover_methods.methods[name]),
+                self._timed("crossover_batch", name, crossover_batch))
+
+    def _resolve_mutation(self, name: str) -> Tuple[Callable, Callable]:
+        return (self._timed("mutation", name, self.mutation_types.mutator(name)),
+                self._timed("mutation_batch", name, self.mutation_types.batch_methods[name]))
+
+    def _resolve_replacement(self, name: str) -> Tuple[Callable, Callable]:
+        replacer = self.replacer
+
+        def replace(population, fitness_scores, child, child_score=None, weights=None):
+            return replacer.replace(name, population, fitness_scores, child, child_score, weights)
+
+        def replace_batch(population, fitness_scores, children, child_fitness, child_weights, weights=None):
+            return replacer.replace_batch(name, population, fitness_scores, children, child_fitness, child_weights, weights)
+        return self._timed("replacement", name, replace), self._timed("replacement_batch", name, replace_batch)
+
+    def timing_report(self) -> Dict[str, Dict[str, float]]:
+        """Operators that were called, with their call count, total seconds and mean microseconds per call."""
+        return {
+            name: {"calls": calls, "seconds": round(seconds, 6), "mean_us": round(seconds / calls * 1e6, 2)}
+            for name, (calls, seconds) in self.timings.items() if calls
+        }
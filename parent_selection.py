@@ -1,5 +1,13 @@
 import random
+import numpy as np
 from typing import List, Tuple
+from fitness_index import FitnessIndex
+
+# The kernels draw from a fitness index; the population keeps its own one in step, plain score lists get a throwaway one
+def as_ranking(fitness_scores) -> FitnessIndex:
+    if isinstance(fitness_scores, FitnessIndex):
+        return fitness_scores
+    return FitnessIndex(fitness_scores)
 
 class ParentSelectionStrategies:
     def __init__(self):
@@ -12,6 +20,17 @@ class ParentSelectionStrategies:
             "stochastic_universal_sampling": self.stochastic_universal_sampling,
             "truncation_selection": self.truncation_selection,
         }
+        # Batch versions take a FitnessIndex and return a (num_pairs, 2) array of parent indices instead of individuals
+        self.batch_methods = {
+            "tournament_top_10": self.tournament_top_10_batch,
+            "roulette_wheel_selection": self.roulette_wheel_selection_batch,
+            "tournament_selection": self.tournament_selection_batch,
+            "rank_selection": self.rank_selection_batch,
+            "stochastic_universal_sampling": self.stochastic_universal_sampling_batch,
+            "truncation_selection": self.truncation_selection_batch,
+        }
+        # Cumulative rank weights per population size, they only depend on the size
+        self._rank_cumulative = {}
 
     def call_method(self, method_name: str, population: List[List[int]], fitness_scores: List[float], **kwargs):
         """Dynamically call a method based on its name."""
@@ -20,56 +39,89 @@ class ParentSelectionStrategies:
         else:
             raise ValueError(f"Method {method_name} not found.")
 
-    # Selection Methods
+    def select_indices(self, method_name: str, fitness_scores: List[float]) -> List[int]:
+        """Indices of one parent pair, the individuals themselves are never copied."""
+        return self.select_batch(method_name, fitness_scores, 1)[0].tolist()
+
+    def select_batch(self, method_name: str, fitness_scores: List[float], num_pairs: int) -> np.ndarray:
+        """Select num_pairs parent pairs at once with the batch version of a method.
+        fitness_scores is the population's FitnessIndex (Population.ranking()), or a plain list indexed for this call only."""
+        if method_name not in self.batch_methods:
+            raise ValueError(f"Method {method_name} not found.")
+        return self.batch_methods[method_name](as_ranking(fitness_scores), num_pairs)
+
+    # Selection Methods, each picks one pair through its index kernel below and returns views of the chosen individuals
     def tournament_top_10(self, population: List[List[int]], fitness_scores: List[float]) -> List[Tuple[List[int], List[int]]]:
-        top_10_indices = sorted(range(len(fitness_scores)), key=lambda i: fitness_scores[i], reverse=True)[:10]
-        top_10_parents = [population[i] for i in top_10_indices]
-        parent1 = random.choice(top_10_parents)
-        remaining_population = [individual for i, individual in enumerate(population) if individual not in top_10_parents]
-        parent2 = random.choice(remaining_population)
-        return [parent1, parent2]
+        return [population[i] for i in self.select_indices("tournament_top_10", fitness_scores)]
 
     def roulette_wheel_selection(self, population: List[List[int]], fitness_scores: List[float]) -> List[Tuple[List[int], List[int]]]:
-        total_fitness = sum(fitness_scores)
-        selection_probs = [fitness / total_fitness for fitness in fitness_scores]
-        parent1 = random.choices(population, weights=selection_probs, k=1)[0]
-        parent2 = random.choices(population, weights=selection_probs, k=1)[0]
-        return [parent1, parent2]
+        return [population[i] for i in self.select_indices("roulette_wheel_selection", fitness_scores)]
 
     def tournament_selection(self, population: List[List[int]], fitness_scores: List[float], tournament_size=3) -> List[Tuple[List[int], List[int]]]:
-        def tournament(population, fitness_scores, tournament_size):
-            tournament_indices = random.sample(range(len(population)), tournament_size)
-            best_index = min(tournament_indices, key=lambda i: fitness_scores[i])
-            return population[best_index]
-        parent1 = tournament(population, fitness_scores, tournament_size)
-        parent2 = tournament(population, fitness_scores, tournament_size)
-        return [parent1, parent2]
+        pair = self.tournament_selection_batch(as_ranking(fitness_scores), 1, tournament_size)[0]
+        return [population[i] for i in pair.tolist()]
 
     def rank_selection(self, population: List[List[int]], fitness_scores: List[float]) -> List[Tuple[List[int], List[int]]]:
-        sorted_indices = sorted(range(len(fitness_scores)), key=lambda i: fitness_scores[i])
-        rank_probs = [1 / (rank + 1) for rank in range(len(sorted_indices))]
-        total_rank_prob = sum(rank_probs)
-        normalized_probs = [rank_prob / total_rank_prob for rank_prob in rank_probs]
-        parent1 = random.choices(population, weights=normalized_probs, k=1)[0]
-        parent2 = random.choices(population, weights=normalized_probs, k=1)[0]
-        return [parent1, parent2]
+        return [population[i] for i in self.select_indices("rank_selection", fitness_scores)]
 
     def stochastic_universal_sampling(self, population: List[List[int]], fitness_scores: List[float], num_parents=2) -> List[Tuple[List[int], List[int]]]:
-        total_fitness = sum(fitness_scores)
-        distance = total_fitness / num_parents
-        start_point = random.uniform(0, distance)
-        pointers = [start_point + i * distance for i in range(num_parents)]
-        selected_parents = []
-        for pointer in pointers:
-            current_sum = 0
-            for i, fitness in enumerate(fitness_scores):
-                current_sum += fitness
-                if current_sum >= pointer:
-                    selected_parents.append(population[i])
-                    break
-        return selected_parents
+        return [population[i] for i in self.select_indices("stochastic_universal_sampling", fitness_scores)]
 
     def truncation_selection(self, population: List[List[int]], fitness_scores: List[float], truncation_size=2) -> List[Tuple[List[int], List[int]]]:
-        sorted_population = sorted(zip(fitness_scores, population), key=lambda x: x[0])
-        selected_parents = [individual for _, individual in sorted_population[:truncation_size]]
-        return selected_parents
+        pair = self.truncation_selection_batch(as_ranking(fitness_scores), 1, truncation_size)[0]
+        return [population[i] for i in pair.tolist()]
+
+    # Index Kernels, each draws from the fitness index and returns a (num_pairs, 2) array of parent indices.
+    # The index is kept up to date per replaced individual, so no kernel converts or sorts the whole population
+
+    def tournament_top_10_batch(self, ranking: FitnessIndex, num_pairs: int) -> np.ndarray:
+        # The first parent is one of the 10 highest ranks, the second one of all the ranks below them
+        num_individuals = len(ranking)
+        num_top = min(10, num_individuals - 1)
+        parent1 = [ranking.at_rank(num_individuals - 1 - rank) for rank in np.random.randint(0, num_top, num_pairs).tolist()]
+        parent2 = [ranking.at_rank(rank) for rank in np.random.randint(0, num_individuals - num_top, num_pairs).tolist()]
+        return np.stack([parent1, parent2], axis=1)
+
+    def roulette_wheel_selection_batch(self, ranking: FitnessIndex, num_pairs: int) -> np.ndarray:
+        # One O(log n) descent of the index's proportional Fenwick tree per pick
+        return np.array(ranking.sample_proportional(2 * num_pairs), dtype=np.intp).reshape(num_pairs, 2)
+
+    def tournament_selection_batch(self, ranking: FitnessIndex, num_pairs: int, tournament_size=3) -> np.ndarray:
+        # tournament_size distinct entrants per tournament: draw with replacement and redraw the few rows that repeat an index
+        num_individuals = len(ranking)
+        tournament_size = min(tournament_size, num_individuals)
+        entrants = np.random.randint(0, num_individuals, (2 * num_pairs, tournament_size))
+        while True:
+            ordered = np.sort(entrants, axis=1)
+            repeated = np.flatnonzero((ordered[:, 1:] == ordered[:, :-1]).any(axis=1))
+            if not len(repeated):
+                break
+            entrants[repeated] = np.random.randint(0, num_individuals, (len(repeated), tournament_size))
+        # Only the entrants' scores are looked up; the winner is the entrant with the lowest score, as in the original tournament
+        fitness = ranking.fitness
+        entrant_scores = np.array([fitness[index] for index in entrants.ravel().tolist()]).reshape(entrants.shape)
+        winners = np.take_along_axis(entrants, entrant_scores.argmin(axis=1)[:, None], axis=1)
+        return winners.reshape(num_pairs, 2)
+
+    def rank_selection_batch(self, ranking: FitnessIndex, num_pairs: int) -> np.ndarray:
+        # Rank r (0 = highest score) is drawn with weight 1 / (r + 1) by binary search on the cached cumulative weights,
+        # so the best individual is the most likely parent; the index maps a rank to its individual in O(1)
+        num_individuals = len(ranking)
+        cumulative = self._rank_cumulative.get(num_individuals)
+        if cumulative is None:
+            cumulative = self._rank_cumulative[num_individuals] = np.cumsum(1.0 / np.arange(1, num_individuals + 1))
+        ranks = np.minimum(np.searchsorted(cumulative, np.random.random(2 * num_pairs) * cumulative[-1], side='right'), num_individuals - 1)
+        return np.array([ranking.at_rank(num_individuals - 1 - rank) for rank in ranks.tolist()], dtype=np.intp).reshape(num_pairs, 2)
+
+    def stochastic_universal_sampling_batch(self, ranking: FitnessIndex, num_pairs: int) -> np.ndarray:
+        # One spin with 2 * num_pairs evenly spaced pointers on the proportional tree, the selected parents are then paired at random
+        picks = np.array(ranking.sample_spaced(2 * num_pairs), dtype=np.intp)
+        if num_pairs == 1:
+            return picks.reshape(1, 2)
+        return np.random.permutation(picks).reshape(num_pairs, 2)
+
+    def truncation_selection_batch(self, ranking: FitnessIndex, num_pairs: int, truncation_size=2) -> np.ndarray:
+        # The truncation_size lowest scores are the first ranks of the index, ties by index
+        truncated = np.array(ranking.lowest_ranks(min(truncation_size, len(ranking))), dtype=np.intp)
+        # Same parents for every pair, the offspring differ through crossover and mutation
+        return np.tile(truncated[np.arange(2) % len(truncated)], (num_pairs, 1))
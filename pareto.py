@@ -0,0 +1,149 @@
+# Description: This file contains the bi-objective (maximize profit, minimize travel time) tools: non-dominated sorting, hypervolume and the Pareto archive.
+
+'''File Contains:
+    1. non_dominated_sort function: This function is used to give every point its Pareto front number in O(n log n).
+    2. crowding_distance function: This function is used to measure how isolated every point is inside its front.
+    3. select_survivors function: This function is used to pick the survivors of a population by front number, then crowding distance.
+    4. hypervolume function: This function is used to calculate the area a set of points dominates, up to a reference point.
+    5. ParetoArchive class: This class is used to keep every non-dominated solution found so far, sorted by travel time.'''
+
+''' Inside ParetoArchive class
+    1. dominated function: This function is used to check a candidate against the archive with one binary search.
+    2. insert function: This function is used to add a candidate and drop the archive points it dominates.
+    3. insert_batch function: This function is used to add the non-dominated candidates of a whole batch.
+    4. copy function: This function is used to copy the archive (its entries are shared), e.g. for a checkpoint.'''
+
+
+# Importing required libraries
+import numpy as np
+from bisect import bisect_left, bisect_right
+from typing import Callable, List, Tuple
+
+
+# non_dominated_sort function is used to give every point its Pareto front number in O(n log n)
+def non_dominated_sort(profit: np.ndarray, time: np.ndarray) -> np.ndarray:
+    """Front 0 holds the points no other point dominates (more or equal profit in no more time, better in one).
+    With two objectives the points are swept in time order and each front only needs its highest profit so far."""
+    profit = np.asarray(profit, dtype=np.float64)
+    time = np.asarray(time, dtype=np.float64)
+    order = np.lexsort((-profit, time))
+    ranks = np.empty(len(profit), dtype=np.intp)
+    # front_profit[k] is the top profit of front k so far, it never increases with k; kept negated for bisect
+    negated_front_profit = []
+    previous = None
+    for index in order.tolist():
+        point = (time[index], profit[index])
+        if point == previous:
+            # Identical points do not dominate each other
+            ranks[index] = rank
+            continue
+        # The first front whose top profit is below this point's does not dominate it
+        rank = bisect_right(negated_front_profit, -point[1])
+        if rank == len(negated_front_profit):
+            negated_front_profit.append(-point[1])
+        else:
+            negated_front_profit[rank] = -point[1]
+        ranks[index] = rank
+        previous = point
+    return ranks
+
+
+# crowding_distance function is used to measure how isolated every point is inside its front
+def crowding_distance(profit: np.ndarray, time: np.ndarray, ranks: np.ndarray) -> np.ndarray:
+    profit = np.asarray(profit, dtype=np.float64)
+    time = np.asarray(time, dtype=np.float64)
+    distance = np.zeros(len(profit))
+    for objective in (profit, time):
+        span = objective.max() - objective.min() if len(objective) else 0.0
+        # Sorted by front, then by the objective, so every front is one contiguous run
+        order = np.lexsort((objective, ranks))
+        sorted_ranks = ranks[order]
+        sorted_values = objective[order]
+        gaps = np.zeros(len(order))
+        if len(order) > 2:
+            gaps[1:-1] = (sorted_values[2:] - sorted_values[:-2]) / (span if span > 0 else 1.0)
+        # The ends of every front are always kept
+        front_start = np.r_[True, sorted_ranks[1:] != sorted_ranks[:-1]]
+        front_end = np.r_[sorted_ranks[1:] != sorted_ranks[:-1], True]
+        gaps[front_start | front_end] = np.inf
+        distance[order] += gaps
+    return distance
+
+
+# select_survivors function is used to pick the survivors of a population by front number, then crowding distance
+def select_survivors(profit: np.ndarray, time: np.ndarray, num_survivors: int) -> np.ndarray:
+    """Indices of the num_survivors points NSGA-II keeps: the lowest fronts, and the most isolated points of the last one."""
+    ranks = non_dominated_sort(profit, time)
+    crowding = crowding_distance(profit, time, ranks)
+    return np.lexsort((-crowding, ranks))[:num_survivors]
+
+
+# hypervolume function is used to calculate the area a set of points dominates, up to a reference point
+def hypervolume(profit: np.ndarray, time: np.ndarray, reference_time: float, reference_profit: float = 0.0) -> float:
+    """Area between the points and the reference point (the longest time and lowest profit that still count).
+    Dominated points are harmless: along the time axis only the running top profit matters."""
+    profit = np.asarray(profit, dtype=np.float64)
+    time = np.asarray(time, dtype=np.float64)
+    inside = (time < reference_time) & (profit > reference_profit)
+    if not inside.any():
+        return 0.0
+    order = np.argsort(time[inside], kind='stable')
+    time = time[inside][order]
+    top_profit = np.maximum.accumulate(profit[inside][order])
+    widths = np.diff(np.append(time, reference_time))
+    return float((widths * (top_profit - reference_profit)).sum())
+
+
+# ParetoArchive class is used to keep every non-dominated solution found so far, sorted by travel time
+class ParetoArchive:
+    def __init__(self):
+        # Sorted by time; along a non-dominated set profit rises with time, so both lists are sorted
+        self.times: List[float] = []
+        self.profits: List[float] = []
+        self.payloads: List[object] = []
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def dominated(self, time: float, profit: float) -> bool:
+        """True when an archived point is at least as good in both objectives. The best profit within the
+        candidate's time is that of the last point not slower than it."""
+        position = bisect_right(self.times, time) - 1
+        return position >= 0 and self.profits[position] >= profit
+
+    def insert(self, time: float, profit: float, payload=None) -> bool:
+        """Add the candidate unless it is dominated, dropping the slower points it matches or beats in profit.
+        One binary search finds its place; those points sit right behind it."""
+        if self.dominated(time, profit):
+            return False
+        start = bisect_left(self.times, time)
+        end = bisect_right(self.profits, profit, lo=start)
+        self.times[start:end] = [time]
+        self.profits[start:end] = [profit]
+        self.payloads[start:end] = [payload]
+        return True
+
+    def insert_batch(self, times: np.ndarray, profits: np.ndarray, payload: Callable[[int], object] = None) -> int:
+        """Insert a batch; candidates dominated inside the batch are dropped first with one sort, so payload(i)
+        is only built for the ones that can enter. Returns the number inserted."""
+        times = np.asarray(times, dtype=np.float64)
+        profits = np.asarray(profits, dtype=np.float64)
+        candidates = np.flatnonzero(non_dominated_sort(profits, times) == 0)
+        inserted = 0
+        for index in candidates.tolist():
+            time, profit = float(times[index]), float(profits[index])
+            if not self.dominated(time, profit):
+                self.insert(time, profit, payload(index) if payload is not None else None)
+                inserted += 1
+        return inserted
+
+    def copy(self) -> 'ParetoArchive':
+        archive = ParetoArchive()
+        archive.times, archive.profits, archive.payloads = self.times[:], self.profits[:], self.payloads[:]
+        return archive
+
+    def front(self) -> Tuple[np.ndarray, np.ndarray]:
+        return np.array(self.times), np.array(self.profits)
+
+    def hypervolume(self, reference_time: float, reference_profit: float = 0.0) -> float:
+        return hypervolume(self.profits, self.times, reference_time, reference_profit)
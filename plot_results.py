@@ -0,0 +1,69 @@
+# Description: This file contains the plot rendering of GA results, used by the background writer and as a post-processing command.
+
+'''File Contains:
+    1. plot_convergence function: This function is used to draw the best fitness over the generations of one or more GAs into an image file.
+    2. plot_pareto function: This function is used to draw the (weight, fitness) scatter of the populations into an image file.
+    3. main function: This function is used to render the plots of saved metrics logs from the command line.'''
+
+
+# Importing required libraries
+import argparse
+import os
+import numpy as np
+from typing import List, Sequence, Tuple
+# The object-oriented API renders without pyplot's global state or a GUI backend, so it is safe on the writer thread
+from matplotlib.figure import Figure
+from result_writer import read_metrics
+
+
+# plot_convergence function is used to draw the best fitness over the generations of one or more GAs into an image file
+def plot_convergence(histories: Sequence[Tuple[Sequence[int], Sequence[float]]], labels: List[str], title: str, filename: str):
+    """Every history is a (generations, best_fitness) pair, e.g. the downsampled HistorySeries of a run."""
+    figure = Figure(figsize=(12, 6))
+    axes = figure.subplots()
+    for history, label in zip(histories, labels):
+        axes.plot(history[0], history[1], label=label)
+    axes.set_xlabel('Generation')
+    axes.set_ylabel('Best Fitness')
+    axes.set_title(title)
+    axes.legend()
+    figure.savefig(filename)
+
+
+# plot_pareto function is used to draw the (weight, fitness) scatter of the populations into an image file
+def plot_pareto(fitness: np.ndarray, weights: np.ndarray, filename: str, title: str = "Pareto Front"):
+    """fitness and weights are (generations, population_size) arrays, later generations are drawn in lighter colours."""
+    figure = Figure(figsize=(8, 6))
+    axes = figure.subplots()
+    generation = np.repeat(np.arange(len(fitness)), fitness.shape[1] if fitness.ndim > 1 else 1)
+    points = axes.scatter(np.ravel(weights), np.ravel(fitness), c=generation, s=4, marker='o')
+    figure.colorbar(points, ax=axes, label='Generation')
+    axes.set_xlabel('Weight')
+    axes.set_ylabel('Fitness')
+    axes.set_title(title)
+    axes.grid(True)
+    figure.savefig(filename)
+
+
+# main function is used to render the plots of saved metrics logs from the command line
+def main():
+    parser = argparse.ArgumentParser(description='Render the plots of GA metrics logs written with main.py --metrics')
+    parser.add_argument('logs', nargs='+', help='Metrics log directories')
+    parser.add_argument('--output', default='.', help='Directory for the images')
+    parser.add_argument('--pareto-every', type=int, default=1, help='Draw the population of every n-th generation in the Pareto scatter')
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    histories, labels = [], []
+    for log in args.logs:
+        generations, scores = read_metrics(log)
+        name = os.path.basename(os.path.normpath(log))
+        histories.append((generations['generation'], generations['best_fitness']))
+        labels.append(name)
+        every = slice(None, None, max(args.pareto_every, 1))
+        plot_pareto(scores[every, 0], scores[every, 1], os.path.join(args.output, f'{name}_pareto.png'), f'Pareto Front - {name}')
+    plot_convergence(histories, labels, 'Genetic Algorithm Performance Comparison', os.path.join(args.output, 'convergence.png'))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# Description: This file contains the Population class that stores the GA population around one shared route.
+
+'''File Contains:
+    1. Individual class: This class is used to give a (route, picking_plan) view of one population row, so the operators keep their tuple API.
+    2. Population class: This class is used to store the shared route once, the picking plans as one matrix and the cached fitness and weight columns.'''
+
+''' Inside Population class
+    1. from_matrix function: This function is used to build a population from a boolean picking plan matrix.
+    2. __getitem__ / __setitem__ functions: These functions are used to get an individual view and to write a (route, picking_plan) pair into a row.
+    3. matrix function: This function is used to get the picking plans as a boolean matrix.
+    4. rows / set_rows functions: These functions are used to read and write a batch of picking plans as a boolean matrix.
+    5. set_route function: This function is used to carry every picking plan over to a new shared route.
+    6. snapshot function: This function is used to copy the plans and the cached columns, so a generation can be reverted.
+    7. state / from_state functions: These functions are used to copy a population into a compact checkpoint form and to rebuild it.
+    8. solution function: This function is used to get a detached (route, picking_plan) copy of one individual.
+    9. ranking / set_score functions: These functions are used to get the fitness index and to change one individual's cached scores.'''
+
+
+# Importing required libraries
+import operator
+import numpy as np
+from typing import List, Tuple
+from bitset_genome import PackedPlan
+from fitness_index import FitnessIndex
+from item_index import ItemIndex
+from route_optimization import remap_picking_plans
+
+
+# Individual class is used to give a (route, picking_plan) view of one population row, so the operators keep their tuple API
+class Individual:
+    __slots__ = ('population', 'index')
+
+    def __init__(self, population: 'Population', index: int):
+        self.population = population
+        self.index = index
+
+    @property
+    def route(self) -> List[int]:
+        return self.population.route
+
+    @property
+    def picking_plan(self):
+        return self.population.plan(self.index)
+
+    # Tuple-style access: `route, picking_plan = individual` and individual[0] / individual[1]
+    def __len__(self) -> int:
+        return 2
+
+    def __iter__(self):
+        yield self.population.route
+        yield self.population.plan(self.index)
+
+    def __getitem__(self, key):
+        if key in (0, -2):
+            return self.population.route
+        if key in (1, -1):
+            return self.population.plan(self.index)
+        raise IndexError("individual index out of range")
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Individual):
+            return self.population is other.population and self.index == other.index
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self.population), self.index))
+
+    def __repr__(self) -> str:
+        return f"Individual({self.index}, fitness={self.population.fitness_scores[self.index]})"
+
+
+# Population class is used to store the shared route once, the picking plans as one matrix and the cached fitness and weight columns
+class Population:
+    __slots__ = ('route', 'plans', 'num_items', 'packed', 'fitness_scores', 'weights', '_ranking')
+
+    def __init__(self, route: List[int], plans: np.ndarray, num_items: int, packed: bool = False,
+                 fitness_scores: List[float] = None, weights: List[float] = None):
+        """plans holds one row per individual: 0/1 uint8 values, or little-endian packed bits when packed is set.
+        fitness_scores and weights stay plain lists; change single entries with set_score so the fitness index follows."""
+        self.route = route
+        self.plans = plans
+        self.num_items = num_items
+        self.packed = packed
+        self.fitness_scores = fitness_scores if fitness_scores is not None else [0.0] * len(plans)
+        self.weights = weights if weights is not None else [0.0] * len(plans)
+        # Built on first use and then updated per set_score call
+        self._ranking = None
+
+    @classmethod
+    def from_matrix(cls, route: List[int], picking_plans: np.ndarray, genome: str = 'list') -> 'Population':
+        picking_plans = np.asarray(picking_plans, dtype=bool)
+        if genome == 'packed':
+            return cls(route, np.packbits(picking_plans, axis=1, bitorder='little'), picking_plans.shape[1], packed=True)
+        return cls(route, picking_plans.astype(np.uint8), picking_plans.shape[1])
+
+    def __len__(self) -> int:
+        return len(self.plans)
+
+    def _row(self, index) -> int:
+        index = operator.index(index)
+        if index < 0:
+            index += len(self.plans)
+        if not 0 <= index < len(self.plans):
+            raise IndexError("population index out of range")
+        return index
+
+    def __getitem__(self, index) -> Individual:
+        return Individual(self, self._row(index))
+
+    def __iter__(self):
+        for index in range(len(self.plans)):
+            yield Individual(self, index)
+
+    def __setitem__(self, index, solution: Tuple[List[int], List[int]]):
+        # Every individual travels the shared route, so only the picking plan is stored
+        _, picking_plan = solution
+        self.set_plan(index, picking_plan)
+
+    def plan(self, index: int):
+        """Picking plan of one row: a zero-copy PackedPlan view for the packed genome, a new 0/1 list otherwise."""
+        if self.packed:
+            return PackedPlan(self.plans[index], self.num_items)
+        return self.plans[index].tolist()
+
+    def set_plan(self, index: int, picking_plan):
+        index = self._row(index)
+        if isinstance(picking_plan, PackedPlan):
+            self.plans[index] = picking_plan.bits if self.packed else picking_plan.to_bool()
+            return
+        picked = np.asarray(picking_plan) == 1
+        self.plans[index] = np.packbits(picked, bitorder='little') if self.packed else picked
+
+    def matrix(self) -> np.ndarray:
+        if self.packed:
+            return np.unpackbits(self.plans, axis=1, count=self.num_items, bitorder='little').astype(bool)
+        return self.plans == 1
+
+    def rows(self, indices: np.ndarray) -> np.ndarray:
+        """Boolean picking plans of the given rows (repeats allowed), one gather instead of one plan() call per row."""
+        if self.packed:
+            return np.unpackbits(self.plans[indices], axis=1, count=self.num_items, bitorder='little').astype(bool)
+        return self.plans[indices] == 1
+
+    def set_rows(self, indices: np.ndarray, picking_plans: np.ndarray):
+        picking_plans = np.asarray(picking_plans, dtype=bool)
+        self.plans[indices] = np.packbits(picking_plans, axis=1, bitorder='little') if self.packed else picking_plans
+
+    def set_route(self, new_route: List[int], item_index: 'ItemIndex'):
+        picking_plans = remap_picking_plans(self.matrix(), self.route, new_route, item_index)
+        self.plans = np.packbits(picking_plans, axis=1, bitorder='little') if self.packed else picking_plans.astype(np.uint8)
+        self.route = new_route
+
+    def set_scores(self, fitness: np.ndarray, weight: np.ndarray):
+        self.fitness_scores = fitness.tolist()
+        self.weights = weight.tolist()
+        self._ranking = None
+
+    def set_score(self, index: int, fitness: float, weight: float):
+        self.fitness_scores[index] = fitness
+        self.weights[index] = weight
+        if self._ranking is not None:
+            self._ranking.update(index, fitness)
+
+    def ranking(self) -> FitnessIndex:
+        if self._ranking is None:
+            self._ranking = FitnessIndex(self.fitness_scores)
+        return self._ranking
+
+    def best_index(self) -> int:
+        return self.ranking().highest()
+
+    def worst_index(self) -> int:
+        return self.ranking().lowest()
+
+    def best_fitness(self) -> float:
+        return self.fitness_scores[self.ranking().highest()]
+
+    def snapshot(self) -> 'Population':
+        # One block copy of the plan matrix; the route is never modified in place, so it is shared.
+        # The fitness index is not copied, a reverted population rebuilds it on first use
+        return Population(self.route, self.plans.copy(), self.num_items, self.packed, self.fitness_scores[:], self.weights[:])
+
+    def state(self) -> dict:
+        """Compact copy for checkpoints: the plans as packed bits whatever the genome and the cached columns as arrays.
+        The route is left out, checkpoints store it as a part of its own that is only rewritten when it changes."""
+        plans = self.plans.copy() if self.packed else np.packbits(self.plans == 1, axis=1, bitorder='little')
+        return {'plans': plans, 'num_items': self.num_items, 'packed': self.packed,
+                'fitness_scores': np.array(self.fitness_scores), 'weights': np.array(self.weights)}
+
+    @classmethod
+    def from_state(cls, route: List[int], state: dict) -> 'Population':
+        plans = state['plans']
+        if not state['packed']:
+            plans = np.unpackbits(plans, axis=1, count=state['num_items'], bitorder='little')
+        return cls(route, plans, state['num_items'], state['packed'], state['fitness_scores'].tolist(), state['weights'].tolist())
+
+    def solution(self, index: int) -> Tuple[List[int], List[int]]:
+        """(route, picking_plan) copy that later replacements do not overwrite."""
+        if self.packed:
+            return self.route, PackedPlan(self.plans[index].copy(), self.num_items)
+        return self.route, self.plans[index].tolist()
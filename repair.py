@@ -0,0 +1,132 @@
+# Description: This file contains the repair operator that drops items from picking plans until they fit in the knapsack.
+
+'''File Contains:
+    1. RepairOperator class: This class is used to repair one picking plan or a whole plan matrix with a chosen drop ordering.'''
+
+''' Inside RepairOperator class
+    1. drop_keys function: This function is used to get the drop priority of every plan position for an evaluator's route.
+    2. repair function: This function is used to repair a single picking plan in place.
+    3. repair_matrix function: This function is used to repair every overweight row of a boolean plan matrix at once.'''
+
+
+# Importing required libraries
+import numpy as np
+from typing import List, Tuple
+from ttp_solver import TTPSolver
+
+# Candidates taken per partial selection round, doubled until enough weight is found
+INITIAL_CANDIDATES = 16
+
+
+# RepairOperator class is used to repair one picking plan or a whole plan matrix with a chosen drop ordering
+class RepairOperator:
+    def __init__(self, ttp_solver: 'TTPSolver', ordering: str = 'heaviest'):
+        self.ttp_solver = ttp_solver
+        self.capacity = ttp_solver.capacity
+        # Higher key = dropped first
+        self.orderings = {
+            "heaviest": self._heaviest,
+            "ratio": self._ratio,
+            "distance_ratio": self._distance_ratio,
+        }
+        if ordering not in self.orderings:
+            raise ValueError(f"Repair ordering '{ordering}' is not supported.")
+        self.ordering = ordering
+
+        # Keys of the last evaluator asked for, evaluators are rebuilt whenever the route changes
+        self._keys_evaluator = None
+        self._keys = None
+
+    # Heaviest item first, the original repair rule
+    def _heaviest(self, evaluator) -> np.ndarray:
+        return evaluator.weights
+
+    # Worst profit per unit of weight first
+    def _ratio(self, evaluator) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return -np.nan_to_num(evaluator.values / evaluator.weights, nan=0.0, posinf=np.finfo(np.float64).max)
+
+    # Worst profit per unit of weight and distance carried first, heavy items picked early slow the whole tour down
+    def _distance_ratio(self, evaluator) -> np.ndarray:
+        carried = np.maximum(self.ttp_solver.carried_distances(evaluator.route), 1e-9)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return -np.nan_to_num(evaluator.values / (evaluator.weights * carried), nan=0.0, posinf=np.finfo(np.float64).max)
+
+    def drop_keys(self, evaluator) -> np.ndarray:
+        if evaluator is not self._keys_evaluator:
+            self._keys = self.orderings[self.ordering](evaluator)
+            self._keys_evaluator = evaluator
+        return self._keys
+
+    def repair(self, picking_plan, evaluator, total_weight: float = None, removed_indices: List[int] = None) -> Tuple[object, float]:
+        """Drop items in key order until the plan fits. picking_plan (a 0/1 list or PackedPlan) is changed in place;
+        the dropped plan positions are appended to removed_indices in drop order."""
+        weights = evaluator.weights
+        selected = np.flatnonzero(np.asarray(picking_plan) == 1)
+        # The caller can pass a weight it already tracks incrementally to skip the full sum
+        if total_weight is None:
+            total_weight = float(weights[selected].sum())
+        if total_weight <= self.capacity:
+            return picking_plan, total_weight
+
+        keys = self.drop_keys(evaluator)[selected]
+        excess = total_weight - self.capacity
+        num_candidates = INITIAL_CANDIDATES
+        while True:
+            # Partial selection: only the num_candidates highest keys are sorted (ties at the cut are all kept)
+            if num_candidates < len(selected):
+                threshold = np.partition(keys, len(keys) - num_candidates)[len(keys) - num_candidates]
+                candidates = np.flatnonzero(keys >= threshold)
+            else:
+                candidates = np.arange(len(selected))
+            candidates = candidates[np.argsort(-keys[candidates], kind='stable')]
+            dropped_weight = np.cumsum(weights[selected[candidates]])
+            num_dropped = int(np.searchsorted(dropped_weight, excess)) + 1
+            if num_dropped <= len(candidates) or len(candidates) == len(selected):
+                break
+            num_candidates *= 2
+
+        num_dropped = min(num_dropped, len(candidates))
+        dropped = selected[candidates[:num_dropped]].tolist()
+        for idx in dropped:
+            picking_plan[idx] = 0
+        if removed_indices is not None:
+            removed_indices.extend(dropped)
+        return picking_plan, total_weight - float(dropped_weight[num_dropped - 1])
+
+    def repair_matrix(self, picking_plans: np.ndarray, evaluator) -> Tuple[np.ndarray, np.ndarray]:
+        """Repair every row of a boolean plan matrix, returns the repaired matrix and the weight of every row."""
+        picking_plans = np.array(picking_plans, dtype=bool)
+        weights = evaluator.weights
+        totals = picking_plans @ weights
+        over = np.flatnonzero(totals > self.capacity)
+        if not len(over):
+            return picking_plans, totals
+
+        rows = np.arange(len(over))
+        # Unpicked positions get -inf so the partial selection never takes them
+        keys = np.where(picking_plans[over], self.drop_keys(evaluator), -np.inf)
+        excess = totals[over] - self.capacity
+        num_candidates = min(INITIAL_CANDIDATES, keys.shape[1])
+        while True:
+            candidates = np.argpartition(-keys, num_candidates - 1, axis=1)[:, :num_candidates]
+            candidate_keys = np.take_along_axis(keys, candidates, axis=1)
+            # Highest key first, lower plan position first on ties
+            order = np.lexsort((candidates, -candidate_keys), axis=1)
+            candidates = np.take_along_axis(candidates, order, axis=1)
+            candidate_keys = np.take_along_axis(candidate_keys, order, axis=1)
+            dropped_weight = np.cumsum(np.where(candidate_keys > -np.inf, weights[candidates], 0.0), axis=1)
+            enough = dropped_weight >= excess[:, None]
+            last = np.where(enough[:, -1], enough.argmax(axis=1), num_candidates - 1)
+            # A row is settled once the last dropped key is above the cut, so no tied item was left out of the selection
+            settled = enough[:, -1] & (candidate_keys[rows, last] > candidate_keys[:, -1])
+            if settled.all() or num_candidates == keys.shape[1]:
+                break
+            num_candidates = min(2 * num_candidates, keys.shape[1])
+
+        drop = (np.arange(num_candidates) <= last[:, None]) & (candidate_keys > -np.inf)
+        repaired = picking_plans[over]
+        repaired[np.repeat(rows, num_candidates)[drop.ravel()], candidates[drop]] = False
+        picking_plans[over] = repaired
+        totals[over] -= dropped_weight[rows, last]
+        return picking_plans, totals
@@ -0,0 +1,131 @@
+# Description: This file contains the output subsystem: a background writer thread and a buffered binary per-generation metrics log.
+
+'''File Contains:
+    1. ResultWriter class: This class is used to run file writes and plot rendering on a background thread, so the solver loop never waits on them.
+    2. MetricsLog class: This class is used to buffer the per-generation metrics and population scores and append them to binary files in blocks.
+    3. read_metrics function: This function is used to load a metrics log back as NumPy arrays (memory-mapped).'''
+
+''' Inside MetricsLog class
+    1. record function: This function is used to store one generation in the in-memory block.
+    2. flush function: This function is used to hand the filled block to the writer and start a new one.
+    3. close function: This function is used to write the last block.'''
+
+
+# Importing required libraries
+import json
+import os
+import queue
+import threading
+import numpy as np
+from typing import Callable, List, Tuple
+
+# Generations buffered in memory before a block is written
+DEFAULT_BLOCK = 256
+
+# Columns of generations.bin, one record per generation
+GENERATION_FIELDS = [('generation', np.int64), ('best_fitness', np.float64), ('mean_fitness', np.float64),
+                     ('max_weight', np.float64), ('reverted', np.bool_)]
+
+
+# ResultWriter class is used to run file writes and plot rendering on a background thread, so the solver loop never waits on them
+class ResultWriter:
+    def __init__(self):
+        self.tasks = queue.Queue()
+        self.errors = []
+        self.thread = threading.Thread(target=self._run, name='result-writer', daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                return
+            function, args = task
+            try:
+                function(*args)
+            except Exception as error:  # A failed plot or write must not stop the tasks queued behind it
+                self.errors.append(error)
+
+    def submit(self, function: Callable, *args):
+        """Queue function(*args); the arguments must not be changed by the caller afterwards."""
+        self.tasks.put((function, args))
+
+    def close(self) -> List[Exception]:
+        """Wait for the queued tasks and stop the thread, returns the errors the tasks raised."""
+        self.tasks.put(None)
+        self.thread.join()
+        return self.errors
+
+
+# MetricsLog class is used to buffer the per-generation metrics and population scores and append them to binary files in blocks
+class MetricsLog:
+    def __init__(self, path: str, population_size: int, writer: ResultWriter = None, block: int = DEFAULT_BLOCK, resume: int = None):
+        """path is a directory holding meta.json, generations.bin (GENERATION_FIELDS records) and
+        population.bin (per generation: the fitness row, then the weight row, float64).
+        Without a writer the blocks are written on the calling thread.
+        resume continues an existing log after its first `resume` generations."""
+        self.path = path
+        self.population_size = population_size
+        self.writer = writer
+        self.block = block
+        self._new_block()
+
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump({'population_size': population_size,
+                       'generation_fields': [(name, np.dtype(kind).str) for name, kind in GENERATION_FIELDS]}, f)
+        # A new log per run; a resumed run drops the generations written after its checkpoint
+        record_sizes = {'generations.bin': np.dtype(GENERATION_FIELDS).itemsize, 'population.bin': 2 * population_size * 8}
+        for name, record_size in record_sizes.items():
+            with open(os.path.join(path, name), 'ab' if resume else 'wb') as f:
+                f.truncate((resume or 0) * record_size)
+
+    def _new_block(self):
+        self.rows = np.zeros(self.block, dtype=GENERATION_FIELDS)
+        self.scores = np.empty((self.block, 2, self.population_size))
+        self.num_rows = 0
+
+    def record(self, generation: int, fitness_scores: List[float], weights: List[float], reverted: bool = False):
+        row = self.num_rows
+        self.scores[row, 0] = fitness_scores
+        self.scores[row, 1] = weights
+        self.rows[row] = (generation, self.scores[row, 0].max(), self.scores[row, 0].mean(), self.scores[row, 1].max(), reverted)
+        self.num_rows += 1
+        if self.num_rows == self.block:
+            self.flush()
+
+    def flush(self):
+        if not self.num_rows:
+            return
+        rows, scores = self.rows[:self.num_rows], self.scores[:self.num_rows]
+        # The filled block is handed over as is and a fresh one is allocated, so nothing is copied on the solver thread
+        self._new_block()
+        if self.writer is not None:
+            self.writer.submit(_append_block, self.path, rows, scores)
+        else:
+            _append_block(self.path, rows, scores)
+
+    def close(self):
+        self.flush()
+
+
+# _append_block function appends one block of records to the log files
+def _append_block(path: str, rows: np.ndarray, scores: np.ndarray):
+    with open(os.path.join(path, 'generations.bin'), 'ab') as f:
+        rows.tofile(f)
+    with open(os.path.join(path, 'population.bin'), 'ab') as f:
+        scores.tofile(f)
+
+
+# read_metrics function is used to load a metrics log back as NumPy arrays (memory-mapped)
+def read_metrics(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the generation records and a (generations, 2, population_size) array of fitness and weight rows."""
+    with open(os.path.join(path, 'meta.json'), 'r') as f:
+        meta = json.load(f)
+    dtype = np.dtype([(name, kind) for name, kind in meta['generation_fields']])
+    generations = np.fromfile(os.path.join(path, 'generations.bin'), dtype=dtype)
+    scores_path = os.path.join(path, 'population.bin')
+    if not os.path.getsize(scores_path):
+        return generations, np.empty((0, 2, meta['population_size']))
+    scores = np.memmap(scores_path, dtype=np.float64, mode='r').reshape(-1, 2, meta['population_size'])
+    return generations, scores
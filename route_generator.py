@@ -3,15 +3,24 @@
 '''File Contains:
     1. euclidean_distance function: This function is used to calculate the Euclidean distance between two coordinates.
     2. construct_mst function: This function is used to construct the Minimum Spanning Tree (MST) of the given coordinates.
-    3. dfs_traversal function: This function is used to perform Depth First Search (DFS) traversal on the MST.
-    4. generate_route function: This function is used to generate the route based on the DFS traversal.
-    5. calculate_total_distance function: This function is used to calculate the total distance of the generated route.'''
+    3. construct_mst_dense function: This function is used to construct the MST with Prim's algorithm on NumPy distance rows.
+    4. construct_mst_fast function: This function is used to construct the MST from k-d tree candidate neighbours in O(n log n).
+    5. dfs_traversal function: This function is used to perform Depth First Search (DFS) traversal on the MST.
+    6. generate_route function: This function is used to generate the route based on the DFS traversal.
+    7. calculate_total_distance function: This function is used to calculate the total distance of the generated route.'''
 
 # Importing required libraries
 import math
+import numpy as np
 from typing import List, Tuple
 from heapq import heappop, heappush
 
+# scipy is optional, without it construct_mst_fast falls back to the dense Prim construction
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
 # euclidean_distance function is used to calculate the Euclidean distance between two coordinates
 def euclidean_distance(coord1: Tuple[float, float], coord2: Tuple[float, float]) -> float:
     return math.sqrt((coord1[0] - coord2[0]) ** 2 + (coord1[1] - coord2[1]) ** 2)
@@ -39,24 +48,133 @@ def construct_mst(coordinates: List[Tuple[float, float]]) -> List[List[int]]:
 
     return adj_list
 
+# construct_mst_dense function is used to construct the MST with Prim's algorithm on NumPy distance rows
+def construct_mst_dense(coordinates: List[Tuple[float, float]]) -> List[List[int]]:
+    points = np.asarray(coordinates, dtype=np.float64)
+    n = len(points)
+    adj_list = [[] for _ in range(n)]
+    if n == 0:
+        return adj_list
+
+    # O(n) memory: only the closest tree distance of every node is kept, never the full matrix
+    visited = np.zeros(n, dtype=bool)
+    best_dist = np.full(n, np.inf)
+    best_parent = np.full(n, -1)
+    best_dist[0] = 0.0
+
+    for _ in range(n):
+        current = int(np.argmin(best_dist))
+        parent = int(best_parent[current])
+        visited[current] = True
+        best_dist[current] = np.inf
+        if parent != -1:
+            adj_list[parent].append(current)
+            adj_list[current].append(parent)
+
+        row = np.hypot(points[:, 0] - points[current, 0], points[:, 1] - points[current, 1])
+        closer = (row < best_dist) & ~visited
+        best_dist[closer] = row[closer]
+        best_parent[closer] = current
+
+    return adj_list
+
+# construct_mst_fast function is used to construct the MST from k-d tree candidate neighbours in O(n log n)
+def construct_mst_fast(coordinates: List[Tuple[float, float]], k: int = 10, neighbours: np.ndarray = None) -> List[List[int]]:
+    n = len(coordinates)
+    points = np.asarray(coordinates, dtype=np.float64)
+
+    # A precomputed neighbour table (e.g. TTPSolver.neighbour_table) saves the k-d tree query
+    if neighbours is not None:
+        dists = np.hypot(*(points[neighbours] - points[:, None, :]).transpose(2, 0, 1))
+        return _prim_on_candidates(points, dists, neighbours)
+
+    if cKDTree is None or n <= k + 1:
+        return construct_mst_dense(coordinates)
+
+    dists, neighbours = cKDTree(points).query(points, k=k + 1)
+    return _prim_on_candidates(points, dists, neighbours)
+
+# _prim_on_candidates function runs Prim's algorithm on the symmetric k-nearest-neighbour candidate graph
+def _prim_on_candidates(points: np.ndarray, dists: np.ndarray, neighbours: np.ndarray) -> List[List[int]]:
+    n = len(points)
+    sources = np.repeat(np.arange(n), neighbours.shape[1])
+    targets = neighbours.ravel()
+    weights = dists.ravel()
+
+    # Make the graph symmetric and store it CSR-style: candidates of node i are targets[offsets[i]:offsets[i + 1]]
+    sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+    weights = np.concatenate([weights, weights])
+    order = np.argsort(sources, kind='stable')
+    targets = targets[order].tolist()
+    weights = weights[order].tolist()
+    offsets = np.searchsorted(sources[order], np.arange(n + 1)).tolist()
+
+    adj_list = [[] for _ in range(n)]
+    visited = [False] * n
+    min_heap = [(0.0, 0, -1)]
+    num_visited = 0
+
+    while num_visited < n:
+        # Clustered instances can split the candidate graph, bridge it with the shortest edge leaving the tree
+        if not min_heap:
+            heappush(min_heap, _shortest_bridge(points, np.asarray(visited)))
+
+        weight, current, parent = heappop(min_heap)
+        if visited[current]:
+            continue
+        visited[current] = True
+        num_visited += 1
+        if parent != -1:
+            adj_list[parent].append(current)
+            adj_list[current].append(parent)
+
+        for edge in range(offsets[current], offsets[current + 1]):
+            next_node = targets[edge]
+            if not visited[next_node]:
+                heappush(min_heap, (weights[edge], next_node, current))
+
+    return adj_list
+
+# _shortest_bridge function returns the shortest (distance, node, parent) edge from the visited tree to an unvisited node
+def _shortest_bridge(points: np.ndarray, visited: np.ndarray) -> Tuple[float, int, int]:
+    tree_nodes = np.flatnonzero(visited)
+    outside_nodes = np.flatnonzero(~visited)
+    if cKDTree is not None:
+        dists, nearest = cKDTree(points[outside_nodes]).query(points[tree_nodes], k=1)
+        best = int(np.argmin(dists))
+        return float(dists[best]), int(outside_nodes[nearest[best]]), int(tree_nodes[best])
+
+    bridge = (np.inf, -1, -1)
+    for node in outside_nodes:
+        row = np.hypot(points[tree_nodes, 0] - points[node, 0], points[tree_nodes, 1] - points[node, 1])
+        closest = int(np.argmin(row))
+        if row[closest] < bridge[0]:
+            bridge = (float(row[closest]), int(node), int(tree_nodes[closest]))
+    return bridge
+
 # dfs_traversal function is used to perform Depth First Search (DFS) traversal on the MST
 def dfs_traversal(adj_list: List[List[int]], start: int = 0) -> List[int]:
     visited = [False] * len(adj_list)
-    route = []
+    route = [start]
+    visited[start] = True
 
-    def dfs(node: int):
-        visited[node] = True
-        route.append(node)
-        for neighbor in adj_list[node]:
+    # Iterative pre-order walk with the same visiting order as the recursive one, deep trees would hit the recursion limit
+    stack = [iter(adj_list[start])]
+    while stack:
+        for neighbor in stack[-1]:
             if not visited[neighbor]:
-                dfs(neighbor)
+                visited[neighbor] = True
+                route.append(neighbor)
+                stack.append(iter(adj_list[neighbor]))
+                break
+        else:
+            stack.pop()
 
-    dfs(start)
     return route
 
 # generate_route function is used to generate the route based on the DFS traversal
-def generate_route(coordinates: List[Tuple[float, float]]) -> List[int]:
-    mst = construct_mst(coordinates) 
+def generate_route(coordinates: List[Tuple[float, float]], neighbours: np.ndarray = None) -> List[int]:
+    mst = construct_mst_fast(coordinates, neighbours=neighbours)
     route = dfs_traversal(mst)       
     route.append(route[0])           
     return route
@@ -66,4 +184,4 @@ def calculate_total_distance(route: List[int], coordinates: List[Tuple[float, fl
     total_distance = 0
     for i in range(len(route) - 1):
         total_distance += euclidean_distance(coordinates[route[i]], coordinates[route[i + 1]])
-    return total_distance
\ No newline at end of file
+    return total_distance
@@ -0,0 +1,270 @@
+# Description: This file contains the route evolution operators (2-opt, Or-opt and 2-opt with bitflip) for the shared tour.
+
+'''File Contains:
+    1. remap_picking_plans function: This function is used to carry picking plans over to a new route, so every item keeps its pick.
+    2. ttp_objective_for_routes function: This function is used to calculate the TTP objective of one picking plan under many routes.
+    3. RouteOptimizer class: This class is used to improve the tour with neighbour-list local search.'''
+
+''' Inside RouteOptimizer class
+    1. optimize function: This function is used to call a route operator by its name.
+    2. two_opt function: This function is used to run 2-opt with neighbour lists and don't-look bits.
+    3. or_opt function: This function is used to move segments of 1 to 3 cities next to one of their neighbours.
+    4. two_opt_bitflip function: This function is used to run TTP-aware 2-opt moves followed by bitflip moves on the picking plan.
+    5. route_objectives function: This function is used to score one picking plan under many routes (or many plans under one route).
+    6. state / restore functions: These functions are used to copy the don't-look bits for a checkpoint and to put them back.'''
+
+
+# Importing required libraries
+import random
+import numpy as np
+from collections import deque
+from typing import List, Tuple
+from ttp_solver import TTPSolver
+from item_index import ItemIndex
+
+# Moves have to gain more than this to count, so float noise never loops the search
+IMPROVEMENT_EPSILON = 1e-9
+
+
+# remap_picking_plans function is used to carry picking plans over to a new route, so every item keeps its pick
+def remap_picking_plans(picking_plans: np.ndarray, old_route: List[int], new_route: List[int], item_index: 'ItemIndex') -> np.ndarray:
+    # Plans are laid out in tour order, so go through a plan indexed by item id
+    old_items = item_index.tour_layout(old_route).items
+    plans_by_item = np.zeros(picking_plans.shape[:-1] + (item_index.num_items,), dtype=picking_plans.dtype)
+    plans_by_item[..., old_items] = picking_plans
+    return plans_by_item[..., item_index.tour_layout(new_route).items]
+
+
+# ttp_objective_for_routes function is used to calculate the TTP objective of one picking plan under many routes
+def ttp_objective_for_routes(ttp_solver: 'TTPSolver', routes: np.ndarray, item_picks: np.ndarray) -> np.ndarray:
+    # item_picks[..., k] says whether item k is picked; one plan can be laid over many routes or the other way round
+    routes = np.atleast_2d(routes)
+    item_picks = np.atleast_2d(item_picks)
+    items = np.asarray(ttp_solver.items, dtype=np.float64)
+    total_profit = item_picks @ items[:, 0]
+
+    stops = routes[:, :-1]
+    num_rows = max(len(routes), len(item_picks))
+    # Weight picked up at every city, summed over the items of that city
+    picked_weight = np.broadcast_to(ttp_solver.item_index.city_totals(item_picks * items[:, 1]), (num_rows, ttp_solver.num_cities))
+    stop_weight = np.take_along_axis(picked_weight, np.broadcast_to(stops, (num_rows, stops.shape[1])), axis=1)
+    cumulative_weight = np.cumsum(stop_weight, axis=1)
+    speed_drop = (ttp_solver.max_speed - ttp_solver.min_speed) / ttp_solver.capacity
+    speed = np.maximum(ttp_solver.min_speed, ttp_solver.max_speed - speed_drop * cumulative_weight)
+    travel_time = (ttp_solver.distances(stops, routes[:, 1:]) / speed).sum(axis=1)
+    return total_profit - ttp_solver.renting_ratio * travel_time
+
+
+# RouteOptimizer class is used to improve the tour with neighbour-list local search
+class RouteOptimizer:
+    def __init__(self, ttp_solver: 'TTPSolver', num_neighbours: int = 10, sample_size: int = 32):
+        self.ttp_solver = ttp_solver
+        self.neighbours = ttp_solver.neighbour_table(num_neighbours).tolist()
+        # neighbour_distances[a][m] is dist(a, neighbours[a][m]), read from the table instead of recomputed per move
+        self.neighbour_distances = ttp_solver.neighbour_distances(num_neighbours).tolist()
+        self.sample_size = sample_size
+        self.methods = {
+            "keep_route": self.keep_route,
+            "two_opt": self.two_opt,
+            "or_opt": self.or_opt,
+            "two_opt_bitflip": self.two_opt_bitflip,
+        }
+
+        # Don't-look bits: a city is only re-examined while it sits in its operator's queue
+        self.queues = {name: deque(range(ttp_solver.num_cities)) for name in ("two_opt", "or_opt")}
+        self.queued = {name: [True] * ttp_solver.num_cities for name in ("two_opt", "or_opt")}
+
+    def state(self) -> dict:
+        return {'queues': {name: list(queue) for name, queue in self.queues.items()},
+                'queued': {name: queued[:] for name, queued in self.queued.items()}}
+
+    def restore(self, state: dict):
+        self.queues = {name: deque(queue) for name, queue in state['queues'].items()}
+        self.queued = {name: queued[:] for name, queued in state['queued'].items()}
+
+    def route_objectives(self, routes: np.ndarray, item_picks: np.ndarray) -> np.ndarray:
+        """Every full TTP evaluation of the route operators goes through here, so a run budget or profiler can count them."""
+        return ttp_objective_for_routes(self.ttp_solver, routes, item_picks)
+
+    def optimize(self, method_name: str, route: List[int], picking_plan: List[int]) -> Tuple[List[int], List[int]]:
+        """Apply the named route operator. The same route object is returned when the tour did not change."""
+        if method_name not in self.methods:
+            raise ValueError(f"Route operator '{method_name}' is not supported.")
+        return self.methods[method_name](route, picking_plan)
+
+    def keep_route(self, route: List[int], picking_plan: List[int]) -> Tuple[List[int], List[int]]:
+        return route, picking_plan
+
+    # Wake up the cities whose edges changed, for both operators
+    def _wake(self, cities):
+        for name, queue in self.queues.items():
+            queued = self.queued[name]
+            for city in cities:
+                if not queued[city]:
+                    queued[city] = True
+                    queue.append(city)
+
+    def two_opt(self, route: List[int], picking_plan: List[int]) -> Tuple[List[int], List[int]]:
+        queue, queued = self.queues["two_opt"], self.queued["two_opt"]
+        if not queue:
+            return route, picking_plan
+
+        dist = self.ttp_solver.distance
+        tour = list(route[:-1])
+        n = len(tour)
+        pos = [0] * self.ttp_solver.num_cities
+        for i, city in enumerate(tour):
+            pos[city] = i
+        changed = False
+
+        while queue:
+            a = queue.popleft()
+            queued[a] = False
+            improved = True
+            while improved:
+                improved = False
+                i = pos[a]
+                # Successor side: replace (a, succ a) and (c, succ c) with (a, c) and (succ a, succ c)
+                # Predecessor side: replace (pred a, a) and (pred c, c) with (a, c) and (pred a, pred c)
+                for step in (1, -1):
+                    b = tour[(i + step) % n]
+                    d_ab = dist(a, b)
+                    for c, d_ac in zip(self.neighbours[a], self.neighbour_distances[a]):
+                        if d_ac >= d_ab:
+                            break
+                        j = pos[c]
+                        e = tour[(j + step) % n]
+                        if e == a or c == b:
+                            continue
+                        delta = d_ac + dist(b, e) - d_ab - dist(c, e)
+                        if delta < -IMPROVEMENT_EPSILON:
+                            # Both moves reverse the path between the two removed edges
+                            x, y = (i, j) if step == 1 else ((i - 1) % n, (j - 1) % n)
+                            self._reverse(tour, pos, min(x, y) + 1, max(x, y))
+                            self._wake((a, b, c, e))
+                            changed = improved = True
+                            break
+                    if improved:
+                        break
+
+        if not changed:
+            return route, picking_plan
+        new_route = tour + [tour[0]]
+        return new_route, remap_picking_plans(np.asarray(picking_plan), route, new_route, self.ttp_solver.item_index).tolist()
+
+    # Reverse tour positions start..end inclusive, position 0 (the depot) is never inside the segment
+    def _reverse(self, tour: List[int], pos: List[int], start: int, end: int):
+        tour[start:end + 1] = tour[start:end + 1][::-1]
+        for i in range(start, end + 1):
+            pos[tour[i]] = i
+
+    def or_opt(self, route: List[int], picking_plan: List[int]) -> Tuple[List[int], List[int]]:
+        queue, queued = self.queues["or_opt"], self.queued["or_opt"]
+        if not queue:
+            return route, picking_plan
+
+        dist = self.ttp_solver.distance
+        tour = list(route[:-1])
+        n = len(tour)
+        pos = [0] * self.ttp_solver.num_cities
+        for i, city in enumerate(tour):
+            pos[city] = i
+        changed = False
+
+        while queue:
+            a = queue.popleft()
+            queued[a] = False
+            move = self._best_segment_move(tour, pos, a, dist)
+            if move is None:
+                continue
+            start, length, insert_after, reverse = move
+            segment = tour[start:start + length]
+            touched = [tour[start - 1], tour[(start + length) % n], insert_after] + segment
+            del tour[start:start + length]
+            insert_at = pos[insert_after] + 1 - (length if pos[insert_after] > start else 0)
+            tour[insert_at:insert_at] = segment[::-1] if reverse else segment
+
+            # Only the cities between the old and the new place of the segment shift
+            for i in range(min(start, insert_at), max(start, insert_at) + length):
+                pos[tour[i]] = i
+            self._wake(touched + [tour[(insert_at + length) % n]])
+            changed = True
+
+        if not changed:
+            return route, picking_plan
+        new_route = tour + [tour[0]]
+        return new_route, remap_picking_plans(np.asarray(picking_plan), route, new_route, self.ttp_solver.item_index).tolist()
+
+    # Best improving move of a 1-3 city segment starting at city a next to a neighbour, or None
+    def _best_segment_move(self, tour: List[int], pos: List[int], a: int, dist):
+        n = len(tour)
+        start = pos[a]
+        best = None
+        best_delta = -IMPROVEMENT_EPSILON
+        for length in (1, 2, 3):
+            # The depot stays at position 0
+            if start == 0 or start + length > n:
+                break
+            first, last = tour[start], tour[start + length - 1]
+            prev, nxt = tour[start - 1], tour[(start + length) % n]
+            removal_gain = dist(prev, first) + dist(last, nxt) - dist(prev, nxt)
+            segment = set(tour[start:start + length])
+            for c, d_ac in zip(self.neighbours[a], self.neighbour_distances[a]):
+                if c in segment:
+                    continue
+                d = tour[(pos[c] + 1) % n]
+                if d in segment:
+                    continue
+                base = dist(c, d)
+                # The segment starts at a, so dist(c, first) is the neighbour distance
+                forward = d_ac + dist(last, d) - base - removal_gain
+                backward = dist(c, last) + dist(first, d) - base - removal_gain
+                if forward < best_delta:
+                    best, best_delta = (start, length, c, False), forward
+                if backward < best_delta:
+                    best, best_delta = (start, length, c, True), backward
+        return best
+
+    def two_opt_bitflip(self, route: List[int], picking_plan: List[int]) -> Tuple[List[int], List[int]]:
+        """TTP-aware local search: candidate 2-opt moves and single item flips are both scored
+        on the full TTP objective of the given plan, each round in one vectorized evaluation."""
+        item_picks = np.zeros(self.ttp_solver.num_items)
+        item_picks[self.ttp_solver.tour_items(route).items] = np.asarray(picking_plan) == 1
+        tour = np.asarray(route)
+        current = self.route_objectives(tour, item_picks)[0]
+
+        # 2-opt round: reverse tour[i + 1..j] for sampled cities and their neighbours, accept the best improving one
+        n = len(tour) - 1
+        pos = np.empty(self.ttp_solver.num_cities, dtype=np.intp)
+        pos[tour[:-1]] = np.arange(n)
+        candidates = []
+        for a in random.sample(range(n), min(self.sample_size, n)):
+            for c in self.neighbours[tour[a]]:
+                i, j = sorted((a, int(pos[c])))
+                if j - i > 1:
+                    candidates.append((i + 1, j))
+        if candidates:
+            routes = np.repeat(tour[None, :], len(candidates), axis=0)
+            for row, (start, end) in enumerate(candidates):
+                routes[row, start:end + 1] = tour[start:end + 1][::-1]
+            objectives = self.route_objectives(routes, item_picks)
+            best = int(np.argmax(objectives))
+            if objectives[best] > current + IMPROVEMENT_EPSILON:
+                tour, current = routes[best], objectives[best]
+
+        # Bitflip round: flip sampled items one at a time, keep the best flip that stays within capacity
+        items = np.asarray(self.ttp_solver.items, dtype=np.float64)
+        flip_items = np.asarray(random.sample(range(len(items)), min(self.sample_size, len(items))))
+        flipped = np.repeat(item_picks[None, :], len(flip_items), axis=0)
+        flipped[np.arange(len(flip_items)), flip_items] = 1 - flipped[np.arange(len(flip_items)), flip_items]
+        feasible = flipped @ items[:, 1] <= self.ttp_solver.capacity
+        objectives = np.where(feasible, self.route_objectives(tour, flipped), -np.inf)
+        best = int(np.argmax(objectives))
+        if objectives[best] > current + IMPROVEMENT_EPSILON:
+            item_picks = flipped[best]
+
+        new_route = tour.tolist()
+        if new_route == list(route):
+            new_route = route
+        new_plan = (item_picks[self.ttp_solver.tour_items(new_route).items] == 1).astype(int).tolist()
+        return new_route, new_plan
@@ -0,0 +1,111 @@
+# Description: This file contains the run controller that stops a GA run on a generation, wall-clock, fitness-evaluation or stagnation budget.
+
+'''File Contains:
+    1. route_objective_rows function: This function is used to count the (route, plan) rows of one route_objectives call.
+    2. RunBudget class: This class is used to check the budgets of a run once per generation and report the evaluations per second it achieved.'''
+
+''' Inside RunBudget class
+    1. instrument_evaluator function: This function is used to count the fitness evaluations of an evaluator.
+    2. instrument_route_optimizer function: This function is used to count the full TTP evaluations of the route operators.
+    3. exhausted function: This function is used to check, once per generation, whether any budget is used up.
+    4. finish function: This function is used to close the run when the loop ended on its generation count.
+    5. report function: This function is used to get the generations, evaluations, time, evaluations per second and stop reason.
+    6. state / restore functions: These functions are used to carry the used budget over a checkpoint and resume.'''
+
+
+# Importing required libraries
+import time
+import numpy as np
+from typing import Dict
+
+
+# route_objective_rows function is used to count the (route, plan) rows of one route_objectives call
+def route_objective_rows(routes, item_picks) -> int:
+    # One plan can be laid over many routes or many plans over one route, the shorter side is broadcast
+    return max(len(np.atleast_2d(routes)), len(np.atleast_2d(item_picks)))
+
+
+# RunBudget class is used to check the budgets of a run once per generation and report the evaluations per second it achieved
+class RunBudget:
+    def __init__(self, time_limit: float = None, max_evaluations: int = None, stagnation: int = None):
+        """time_limit: wall-clock seconds, counted from the creation of the budget (initialization included).
+        max_evaluations: fitness evaluations, one per scored picking plan, the greedy seeding and the (route, plan) rows
+        scored by the route operators included; checked between generations, so a batched generation can go over it
+        by at most its batch and route search.
+        stagnation: generations without a new best fitness after which the run stops.
+        A budget left at None is not checked, the generation count itself is the loop's."""
+        self.time_limit = time_limit
+        self.max_evaluations = max_evaluations
+        self.stagnation = stagnation
+
+        self.evaluations = 0
+        self.generation = 0
+        self.best_fitness = float('-inf')
+        self.last_improvement = 0
+        self.stop_reason = None
+        # Seconds used before a resume, the clock of this process adds to them
+        self._elapsed_before = 0.0
+        self._started = time.perf_counter()
+
+    def instrument_evaluator(self, evaluator):
+        """Shadow evaluate (one evaluation per matrix row) and score (one) on this evaluator object only."""
+        evaluate, score = evaluator.evaluate, evaluator.score
+
+        def counted_evaluate(picking_plans, *args):
+            self.evaluations += len(picking_plans)
+            return evaluate(picking_plans, *args)
+
+        def counted_score(*args):
+            self.evaluations += 1
+            return score(*args)
+        evaluator.evaluate, evaluator.score = counted_evaluate, counted_score
+        return evaluator
+
+    def instrument_route_optimizer(self, route_optimizer):
+        """Shadow route_objectives on this optimizer only, one evaluation per (route, plan) row it scores."""
+        route_objectives = route_optimizer.route_objectives
+
+        def counted_route_objectives(routes, item_picks):
+            self.evaluations += route_objective_rows(routes, item_picks)
+            return route_objectives(routes, item_picks)
+        route_optimizer.route_objectives = counted_route_objectives
+        return route_optimizer
+
+    def elapsed(self) -> float:
+        return self._elapsed_before + time.perf_counter() - self._started
+
+    def exhausted(self, generation: int, best_fitness: float) -> bool:
+        """Cheap enough for every generation: one clock read and a few comparisons."""
+        self.generation = generation
+        if best_fitness > self.best_fitness:
+            self.best_fitness = best_fitness
+            self.last_improvement = generation
+
+        if self.time_limit is not None and self.elapsed() >= self.time_limit:
+            self.stop_reason = 'time'
+        elif self.max_evaluations is not None and self.evaluations >= self.max_evaluations:
+            self.stop_reason = 'evaluations'
+        elif self.stagnation is not None and generation - self.last_improvement >= self.stagnation:
+            self.stop_reason = 'stagnation'
+        return self.stop_reason is not None
+
+    def finish(self, generation: int):
+        if self.stop_reason is None:
+            self.generation = generation
+            self.stop_reason = 'generations'
+
+    def report(self) -> Dict:
+        elapsed = self.elapsed()
+        return {'generations': self.generation, 'evaluations': self.evaluations, 'seconds': round(elapsed, 3),
+                'evals_per_s': round(self.evaluations / elapsed, 2) if elapsed > 0 else 0.0, 'stop_reason': self.stop_reason}
+
+    def state(self) -> Dict:
+        return {'evaluations': self.evaluations, 'elapsed': self.elapsed(), 'best_fitness': self.best_fitness,
+                'last_improvement': self.last_improvement}
+
+    def restore(self, state: Dict):
+        self.evaluations = state['evaluations']
+        self.best_fitness = state['best_fitness']
+        self.last_improvement = state['last_improvement']
+        self._elapsed_before = state['elapsed']
+        self._started = time.perf_counter()
@@ -0,0 +1,164 @@
+# Description: This file contains the opt-in run profiler that records per-generation timings into a ring buffer and a trace file.
+
+'''File Contains:
+    1. RunProfiler class: This class is used to time the GA phases per generation and write one trace row per generation (JSONL or CSV).'''
+
+''' Inside RunProfiler class
+    1. instrument function: This function is used to replace a method of one object with a timed version of it.
+    2. instrument_evaluator function: This function is used to time (and count the evaluations of) a fitness evaluator.
+    3. instrument_route_optimizer function: This function is used to count the full TTP evaluations of the route operators.
+    4. end_generation function: This function is used to close the current generation and store its row in the ring buffer.
+    5. flush / close functions: These functions are used to write the buffered rows to the trace file.'''
+
+
+# Importing required libraries
+import csv
+import json
+import os
+import time
+import numpy as np
+from typing import Callable, Dict
+from run_budget import route_objective_rows
+
+try:
+    import resource
+except ImportError:  # Not available on Windows, the memory column then stays 0
+    resource = None
+
+# Phases a generation is split into; selection, crossover, mutation, replacement and route come from the operator pipeline timers
+PHASES = ('evaluation', 'selection', 'crossover', 'mutation', 'repair', 'replacement', 'route', 'q_learning')
+
+# Rows kept in memory before they are written out
+DEFAULT_CAPACITY = 256
+
+
+# RunProfiler class is used to time the GA phases per generation and write one trace row per generation (JSONL or CSV)
+class RunProfiler:
+    def __init__(self, path: str, pipeline=None, capacity: int = DEFAULT_CAPACITY):
+        """The trace format follows the extension of path: .csv, anything else is written as JSONL.
+        pipeline is the run's OperatorPipeline, whose per-operator timers are read once per generation.
+        Nothing is timed unless a profiler is created, the GA loop keeps its plain calls otherwise."""
+        self.path = path
+        self.csv = path.lower().endswith('.csv')
+        self.pipeline = pipeline
+
+        # Per-phase seconds and calls of the current generation, plain lists are the cheapest to increment
+        self.seconds = [0.0] * len(PHASES)
+        self.calls = [0] * len(PHASES)
+        self.evaluations = 0
+        self.total_evaluations = 0
+
+        # Preallocated ring of generation rows, written out whenever it fills up
+        fields = [('generation', np.int64), ('wall_s', np.float64), ('evaluations', np.int64), ('evals_per_s', np.float64),
+                  ('total_evaluations', np.int64), ('best_fitness', np.float64), ('max_rss_kb', np.int64)]
+        fields += [(f'{phase}_s', np.float64) for phase in PHASES] + [(f'{phase}_calls', np.int64) for phase in PHASES]
+        self.rows = np.zeros(capacity, dtype=fields)
+        self.num_rows = 0
+
+        self._pipeline_totals = self._pipeline_snapshot()
+        self._started = time.perf_counter()
+        self._generation_start = self._started
+
+        # A new trace per run, the CSV header is written up front
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', newline='') as f:
+            if self.csv:
+                csv.writer(f).writerow(self.rows.dtype.names)
+
+    def instrument(self, owner, method_name: str, phase: str, evaluations: Callable = None):
+        """Shadow owner.method_name with a timed version on that object only. evaluations(args) counts the
+        fitness evaluations a call performs."""
+        slot = PHASES.index(phase)
+        method = getattr(owner, method_name)
+        seconds, calls = self.seconds, self.calls
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            seconds[slot] += time.perf_counter() - start
+            calls[slot] += 1
+            if evaluations is not None:
+                self.evaluations += evaluations(args)
+            return result
+        setattr(owner, method_name, timed)
+        return owner
+
+    def instrument_evaluator(self, evaluator):
+        # evaluate scores a whole matrix, score one plan; the incremental totals are timed but not counted
+        self.instrument(evaluator, 'evaluate', 'evaluation', lambda args: len(args[0]))
+        self.instrument(evaluator, 'score', 'evaluation', lambda args: 1)
+        self.instrument(evaluator, 'plan_totals', 'evaluation')
+        self.instrument(evaluator, 'flip_delta', 'evaluation')
+        return evaluator
+
+    def instrument_route_optimizer(self, route_optimizer):
+        # Counted but not timed, the route phase already holds these seconds through the pipeline's operator timers
+        route_objectives = route_optimizer.route_objectives
+
+        def counted_route_objectives(routes, item_picks):
+            self.evaluations += route_objective_rows(routes, item_picks)
+            return route_objectives(routes, item_picks)
+        route_optimizer.route_objectives = counted_route_objectives
+        return route_optimizer
+
+    # Cumulative (seconds, calls) per phase from the pipeline's per-operator timers
+    def _pipeline_snapshot(self) -> Dict[str, list]:
+        totals = {phase: [0.0, 0] for phase in PHASES}
+        if self.pipeline is not None:
+            for name, (calls, seconds) in self.pipeline.timings.items():
+                # "selection_batch:roulette_wheel_selection" -> selection
+                phase = name.split(':', 1)[0].replace('_batch', '')
+                totals[phase][0] += seconds
+                totals[phase][1] += calls
+        return totals
+
+    def end_generation(self, generation: int, best_fitness: float):
+        now = time.perf_counter()
+        wall = now - self._generation_start
+        self._generation_start = now
+
+        pipeline_totals = self._pipeline_snapshot()
+        for slot, phase in enumerate(PHASES):
+            self.seconds[slot] += pipeline_totals[phase][0] - self._pipeline_totals[phase][0]
+            self.calls[slot] += pipeline_totals[phase][1] - self._pipeline_totals[phase][1]
+        self._pipeline_totals = pipeline_totals
+        self.total_evaluations += self.evaluations
+
+        row = self.rows[self.num_rows]
+        row['generation'] = generation
+        row['wall_s'] = wall
+        row['evaluations'] = self.evaluations
+        row['evals_per_s'] = self.evaluations / wall if wall > 0 else 0.0
+        row['total_evaluations'] = self.total_evaluations
+        row['best_fitness'] = best_fitness
+        # Peak resident set size of the process so far (kilobytes on Linux)
+        row['max_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource is not None else 0
+        for slot, phase in enumerate(PHASES):
+            row[f'{phase}_s'] = self.seconds[slot]
+            row[f'{phase}_calls'] = self.calls[slot]
+            self.seconds[slot] = 0.0
+            self.calls[slot] = 0
+        self.evaluations = 0
+
+        self.num_rows += 1
+        if self.num_rows == len(self.rows):
+            self.flush()
+
+    def flush(self):
+        if not self.num_rows:
+            return
+        rows = self.rows[:self.num_rows].tolist()
+        with open(self.path, 'a', newline='') as f:
+            if self.csv:
+                csv.writer(f).writerows(rows)
+            else:
+                names = self.rows.dtype.names
+                f.writelines(json.dumps(dict(zip(names, row))) + '\n' for row in rows)
+        self.num_rows = 0
+
+    def close(self) -> Dict[str, float]:
+        """Writes the remaining rows and returns the run totals."""
+        self.flush()
+        elapsed = time.perf_counter() - self._started
+        return {'seconds': round(elapsed, 6), 'evaluations': self.total_evaluations,
+                'evals_per_s': round(self.total_evaluations / elapsed, 2) if elapsed > 0 else 0.0}
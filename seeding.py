@@ -0,0 +1,124 @@
+# Description: This file contains the greedy seeding of the initial picking plans (PackIterative-style score packing).
+
+'''File Contains:
+    1. item_scores function: This function is used to score every plan position by profit, weight and the distance its item is carried.
+    2. greedy_pack function: This function is used to pack items in score order into the knapsack, for many score rows at once.
+    3. best_prefix function: This function is used to find the best plan among the score-order prefixes of greedy plans.
+    4. pack_iterative function: This function is used to search the score exponent for the best greedy plan, as in PackIterative.
+    5. seed_picking_plans function: This function is used to build the starting plans: the best greedy plan plus randomized variants of it.'''
+
+
+# Importing required libraries
+import numpy as np
+from typing import Tuple
+from ttp_solver import TTPSolver
+
+# Exponents tried in the first PackIterative round, the next rounds narrow in around the best one
+THETA_GRID = np.linspace(0.0, 3.0, 13)
+REFINE_ROUNDS = 3
+# Number of score-order prefixes of every greedy plan that are evaluated
+PREFIX_CUTS = 20
+
+
+# item_scores function is used to score every plan position by profit, weight and the distance its item is carried
+def item_scores(values: np.ndarray, weights: np.ndarray, carried_distance: np.ndarray, theta) -> np.ndarray:
+    """score = profit^theta / (weight^theta * carried distance), one row per theta (PackIterative's heuristic).
+    A carried_distance of ones gives the plain profit/weight ordering."""
+    theta = np.atleast_1d(np.asarray(theta, dtype=np.float64))[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = values ** theta / (weights ** theta * carried_distance)
+    # Free items with a profit come first, items without profit never score
+    scores[:, weights == 0] = np.inf
+    scores[:, values <= 0] = 0.0
+    return np.nan_to_num(scores, nan=0.0)
+
+
+# greedy_pack function is used to pack items in score order into the knapsack, for many score rows at once
+def greedy_pack(scores: np.ndarray, weights: np.ndarray, capacity: np.ndarray, passes: int = 4) -> Tuple[np.ndarray, np.ndarray]:
+    """Each pass takes the longest run of still-available items (in score order) that fits; the item that
+    stopped the run is dropped and the next pass continues behind it. Returns a boolean plan per row and the score order."""
+    scores = np.atleast_2d(scores)
+    capacity = np.broadcast_to(np.asarray(capacity, dtype=np.float64), (len(scores),))
+    order = np.argsort(-scores, axis=1, kind='stable')
+    ordered_weights = weights[order]
+    rows = np.arange(len(scores))
+
+    available = scores[rows[:, None], order] > 0
+    taken = np.zeros_like(available)
+    remaining = capacity.copy()
+    for _ in range(passes):
+        cumulative = np.cumsum(np.where(available, ordered_weights, 0.0), axis=1)
+        fits = available & (cumulative <= remaining[:, None])
+        taken |= fits
+        remaining -= np.where(fits, ordered_weights, 0.0).sum(axis=1)
+        available &= ~fits
+        # The first item that did not fit is given up, the rest get another chance
+        blocked = available.argmax(axis=1)
+        has_blocked = available[rows, blocked]
+        if not has_blocked.any():
+            break
+        available[rows[has_blocked], blocked[has_blocked]] = False
+
+    picking_plans = np.zeros_like(taken)
+    picking_plans[rows[:, None], order] = taken
+    return picking_plans, order
+
+
+# best_prefix function is used to find the best plan among the score-order prefixes of greedy plans
+def best_prefix(evaluator, picking_plans: np.ndarray, order: np.ndarray) -> Tuple[float, int, np.ndarray]:
+    """With a renting cost, packing to capacity is rarely best, so like PackIterative the items are added in score
+    order and the plan is cut where the objective peaks. Returns (fitness, row, plan) of the best cut."""
+    best = (-np.inf, 0, None)
+    cuts = np.linspace(1.0 / PREFIX_CUTS, 1.0, PREFIX_CUTS)[:, None]
+    for row, (plan, row_order) in enumerate(zip(picking_plans, order)):
+        # rank[i] is how many of the picked items come before item i in score order, plus one
+        rank = np.empty(len(plan), dtype=np.intp)
+        rank[row_order] = np.cumsum(plan[row_order])
+        prefixes = plan & (rank <= np.ceil(cuts * plan.sum()))
+        fitness, _ = evaluator.evaluate(prefixes)
+        cut = int(np.argmax(fitness))
+        if fitness[cut] > best[0]:
+            best = (float(fitness[cut]), row, prefixes[cut])
+    return best
+
+
+# pack_iterative function is used to search the score exponent for the best greedy plan, as in PackIterative
+def pack_iterative(evaluator, carried_distance: np.ndarray, capacity: float) -> Tuple[np.ndarray, float, np.ndarray]:
+    """Returns the best plan, its exponent and the distance term it used (the carried distance, or ones)."""
+    values, weights = evaluator.values, evaluator.weights
+    # Every exponent is tried with the carried distance and with the plain profit/weight ratio
+    distance_terms = (carried_distance, np.ones_like(values))
+    thetas = THETA_GRID
+    step = thetas[1] - thetas[0]
+    best_plan, best_fitness, best_theta, best_distance = None, -np.inf, 0.0, carried_distance
+    for _ in range(REFINE_ROUNDS):
+        scores = np.vstack([item_scores(values, weights, distance, thetas) for distance in distance_terms])
+        fitness, best, plan = best_prefix(evaluator, *greedy_pack(scores, weights, capacity))
+        if fitness > best_fitness:
+            best_plan, best_fitness = plan, fitness
+            best_theta, best_distance = thetas[best % len(thetas)], distance_terms[best // len(thetas)]
+        step /= 4
+        thetas = np.clip(best_theta + step * np.arange(-4, 5), 0.0, None)
+    return best_plan, best_theta, best_distance
+
+
+# seed_picking_plans function is used to build the starting plans: the best greedy plan plus randomized variants of it
+def seed_picking_plans(ttp_solver: 'TTPSolver', evaluator, population_size: int, noise: float = 0.5) -> np.ndarray:
+    """Row 0 is the PackIterative plan. The other rows pack with a random exponent around the best one,
+    log-normal noise on the scores and a knapsack limit of 50-120% of the best plan's weight, so the population starts diverse."""
+    # Distance an item is carried: from its stop to the end of the tour
+    carried_distance = np.maximum(ttp_solver.carried_distances(evaluator.route), 1e-9)
+
+    best_plan, best_theta, best_distance = pack_iterative(evaluator, carried_distance, ttp_solver.capacity)
+
+    num_variants = population_size - 1
+    thetas = np.abs(best_theta + np.random.normal(0.0, 0.5, num_variants))
+    scores = item_scores(evaluator.values, evaluator.weights, best_distance, thetas)
+    scores *= np.random.lognormal(0.0, noise, scores.shape)
+    best_weight = float(evaluator.weights @ best_plan)
+    capacity = np.minimum(ttp_solver.capacity, best_weight * np.random.uniform(0.5, 1.2, num_variants))
+
+    picking_plans = np.empty((population_size, len(evaluator.values)), dtype=bool)
+    picking_plans[0] = best_plan
+    picking_plans[1:], _ = greedy_pack(scores, evaluator.weights, capacity)
+    return picking_plans
@@ -0,0 +1,62 @@
+# Description: Shared fixtures of the test suite: the bundled eil51 instance and a small instance with several items per city.
+
+# Importing required libraries
+import os
+import sys
+import numpy as np
+import pytest
+
+# The modules live at the top level of the repository
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from ttp_solver import TTPSolver
+from ttp_benchmark_solver import parse_instance
+from route_generator import generate_route
+
+EIL51 = os.path.join(REPO_ROOT, 'DATASET', 'eil51_n50_bounded-strongly-corr_01.ttp')
+
+
+# build_solver function is used to build a TTPSolver from a parsed instance
+def build_solver(instance: dict) -> TTPSolver:
+    return TTPSolver(cities=instance['coordinates'], items=instance['items'], capacity=instance['capacity'],
+                     min_speed=instance['min_speed'], max_speed=instance['max_speed'], renting_ratio=instance['renting_ratio'],
+                     edge_weight_type=instance['edge_weight_type'], assigned_nodes=instance['assigned_nodes'])
+
+
+@pytest.fixture(autouse=True)
+def instance_cache(tmp_path, monkeypatch):
+    # Code under test that loads an instance by file name (run_genetic_algorithm, load_ttp_solver) caches it here
+    monkeypatch.setenv('TTP_CACHE_DIR', str(tmp_path / 'ttp_cache'))
+
+
+@pytest.fixture(scope='session')
+def eil51() -> TTPSolver:
+    # Parsed without the binary cache, so the tests never write next to the dataset
+    return build_solver(parse_instance(EIL51))
+
+
+@pytest.fixture(scope='session')
+def eil51_route(eil51) -> list:
+    return generate_route(eil51.cities, eil51.neighbour_table())
+
+
+@pytest.fixture(scope='session')
+def multi_item_solver() -> TTPSolver:
+    # 12 cities, the depot has no item, some cities carry two or three items and city 5 none
+    rng = np.random.default_rng(7)
+    coordinates = rng.uniform(0, 100, (12, 2))
+    assigned_nodes = np.array([2, 3, 3, 4, 5, 5, 5, 7, 8, 9, 9, 10, 11, 12, 12])
+    items = np.column_stack([rng.integers(1, 100, len(assigned_nodes)), rng.integers(1, 60, len(assigned_nodes))]).astype(np.float64)
+    return TTPSolver(cities=coordinates, items=items, capacity=250.0, min_speed=0.1, max_speed=1.0, renting_ratio=0.5,
+                     assigned_nodes=assigned_nodes)
+
+
+@pytest.fixture(scope='session')
+def multi_item_route(multi_item_solver) -> list:
+    return generate_route(multi_item_solver.cities)
+
+
+# random_plans function is used to draw boolean picking plans with about `density` of the items picked
+def random_plans(num_plans: int, num_items: int, density: float = 0.3, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).random((num_plans, num_items)) < density
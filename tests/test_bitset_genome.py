@@ -0,0 +1,75 @@
+# Description: Tests of the packed-bitset genome: round trips, list-style access and the byte lookup tables.
+
+# Importing required libraries
+import numpy as np
+import pytest
+from conftest import random_plans
+from bitset_genome import PackedPlan, ByteTables, pack_population
+
+
+# Lengths that end inside a byte, on a byte boundary and below one byte
+@pytest.mark.parametrize('length', [1, 7, 8, 13, 64, 301])
+def test_packed_plan_round_trip(length):
+    plan = random_plans(1, length, 0.5, seed=length)[0]
+    packed = PackedPlan.from_bool(plan)
+    assert len(packed) == length
+    assert np.array_equal(packed.to_bool(), plan)
+    assert packed.to_list() == plan.astype(int).tolist()
+    assert PackedPlan.from_list(plan.astype(int).tolist()) == packed
+    assert np.array_equal(np.asarray(packed), plan.astype(np.uint8))
+    assert packed.count() == plan.sum()
+    assert np.array_equal(packed.nonzero(), np.flatnonzero(plan))
+
+
+def test_packed_plan_list_style_access():
+    plan = random_plans(1, 21, 0.5, seed=1)[0].astype(int).tolist()
+    packed = PackedPlan.from_list(plan)
+    assert [packed[i] for i in range(len(plan))] == plan
+    assert packed[-1] == plan[-1]
+    # A slice is an unpacked copy, changing it leaves the plan alone
+    segment = packed[3:17]
+    assert segment == plan[3:17]
+    segment.reverse()
+    assert packed.to_list() == plan
+    with pytest.raises(IndexError):
+        packed[len(plan)]
+
+    packed[2] = 1 - plan[2]
+    packed[4:9] = [1, 0, 1, 0, 1]
+    plan[2] = 1 - plan[2]
+    plan[4:9] = [1, 0, 1, 0, 1]
+    assert packed.to_list() == plan
+
+    packed.flip([0, 20])
+    plan[0], plan[20] = 1 - plan[0], 1 - plan[20]
+    assert packed.to_list() == plan
+
+
+def test_blend_takes_the_bits_under_the_mask():
+    first, second = (PackedPlan.from_bool(plan) for plan in random_plans(2, 30, 0.5, seed=2))
+    mask = first.range_mask(5, 23)
+    child = first.blend(second, mask).to_bool()
+    assert np.array_equal(child[5:23], second.to_bool()[5:23])
+    assert np.array_equal(child[:5], first.to_bool()[:5])
+    assert np.array_equal(child[23:], first.to_bool()[23:])
+
+
+def test_pack_population_rows_share_one_array():
+    plans = random_plans(4, 19, 0.5, seed=3)
+    packed = pack_population(plans)
+    assert [plan.to_list() for plan in packed] == plans.astype(int).tolist()
+    # Zero-copy: every plan is a view of a row of the same packed array
+    base = packed[0].bits.base
+    assert base is not None
+    assert all(plan.bits.base is base for plan in packed)
+    packed[1][0] = 1 - packed[1][0]
+    assert base[1, 0] & 1 == packed[1][0]
+
+
+def test_byte_tables_sum_the_picked_values():
+    values = np.random.default_rng(4).uniform(0, 10, 37)
+    plans = random_plans(6, len(values), 0.4, seed=5)
+    tables = ByteTables(values)
+    packed = np.packbits(plans, axis=1, bitorder='little')
+    assert tables.total(packed) == pytest.approx(plans @ values)
+    assert tables.total(packed[0]) == pytest.approx(plans[0] @ values)
@@ -0,0 +1,53 @@
+# Description: Tests of checkpoint and resume: a run cut short and resumed ends where the uninterrupted run does.
+
+# Importing required libraries
+import random
+import numpy as np
+import pytest
+from conftest import EIL51
+from main import run_genetic_algorithm
+
+POPULATION_SIZE = 20
+MUTATION_RATE = 0.05
+GENERATIONS = 120
+
+
+# run function is used to run the GA on eil51 with the test settings
+def run(objective: str, generations: int, seed: int, **options):
+    random.seed(seed)
+    np.random.seed(seed)
+    return run_genetic_algorithm('test', EIL51, POPULATION_SIZE, MUTATION_RATE, generations, objective, **options)
+
+
+@pytest.mark.parametrize('objective', ['profit', 'ttp', 'bi'])
+def test_resumed_run_matches_uninterrupted_run(tmp_path, objective):
+    history, best_fitness, best_solution, max_weight = run(objective, GENERATIONS, seed=3)
+
+    checkpoint = str(tmp_path / 'checkpoint')
+    run(objective, GENERATIONS // 3, seed=3, checkpoint=checkpoint)
+    # The seed is overwritten by the random number generator states of the checkpoint
+    resumed = run(objective, GENERATIONS, seed=99, checkpoint=checkpoint, resume=checkpoint)
+
+    assert resumed[1] == best_fitness
+    assert resumed[2][0] == best_solution[0]
+    assert list(resumed[2][1]) == list(best_solution[1])
+    assert np.array_equal(resumed[0].generations, history.generations)
+    assert np.array_equal(resumed[0].best_fitness, history.best_fitness)
+    assert resumed[0].length == history.length
+    assert resumed[3] == max_weight
+
+
+# Any setting that changes the trajectory makes the checkpoint belong to another run
+@pytest.mark.parametrize('option', [{'genome': 'packed'}, {'repair': 'ratio'}, {'seeding': 'random'}, {'q_lambda': 0.5}])
+def test_resume_rejects_a_different_run(tmp_path, option):
+    checkpoint = str(tmp_path / 'checkpoint')
+    run('profit', 5, seed=4, checkpoint=checkpoint)
+    with pytest.raises(ValueError):
+        run('profit', 10, seed=4, resume=checkpoint, **option)
+
+
+def test_resume_rejects_a_different_mutation_rate(tmp_path):
+    checkpoint = str(tmp_path / 'checkpoint')
+    run('profit', 5, seed=4, checkpoint=checkpoint)
+    with pytest.raises(ValueError):
+        run_genetic_algorithm('test', EIL51, POPULATION_SIZE, MUTATION_RATE * 2, 10, 'profit', resume=checkpoint)
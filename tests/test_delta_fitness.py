@@ -0,0 +1,70 @@
+# Description: Tests of the delta fitness path: tracked totals, crossover and mutation flips and score against a full evaluation.
+
+# Importing required libraries
+import random
+import numpy as np
+import pytest
+from conftest import random_plans
+from fitness_function import BatchFitnessEvaluator, TTPObjectiveEvaluator
+from mutation import MutationTypes
+from crossover import CrossoverMethods
+from repair import RepairOperator
+from bitset_genome import PackedPlan
+
+MUTATIONS = ['bit_flip_mutation', 'random_item_swap_mutation', 'scramble_mutation', 'inversion_mutation',
+             'reset_mutation', 'block_flip_mutation', 'gaussian_mutation']
+
+
+@pytest.mark.parametrize('evaluator_class', [BatchFitnessEvaluator, TTPObjectiveEvaluator])
+@pytest.mark.parametrize('mutation_name', MUTATIONS)
+@pytest.mark.parametrize('genome', ['list', 'packed'])
+def test_mutation_delta_matches_full_evaluation(eil51, eil51_route, evaluator_class, mutation_name, genome):
+    random.seed(5)
+    np.random.seed(5)
+    evaluator = evaluator_class(eil51, eil51_route, eil51.tour_length(eil51_route))
+    mutation_types = MutationTypes(mutation_rate=0.3)
+    mutate = mutation_types.mutator(mutation_name)
+
+    for plan in random_plans(10, len(evaluator.values), 0.15, seed=6):
+        picking_plan = PackedPlan.from_bool(plan) if genome == 'packed' else plan.astype(int).tolist()
+        value, weight = evaluator.plan_totals(picking_plan)
+        _, mutated = mutate((eil51_route, picking_plan))
+        delta_value, delta_weight = evaluator.flip_delta(mutated, mutation_types.flipped_indices)
+
+        # The tracked totals equal the totals of the mutated plan, and so does the score built from them
+        picked = np.asarray(mutated) == 1
+        assert value + delta_value == pytest.approx(evaluator.values @ picked)
+        assert weight + delta_weight == pytest.approx(evaluator.weights @ picked)
+        fitness, total_weight = evaluator.evaluate(picked[None, :])
+        assert evaluator.score(mutated, value + delta_value, weight + delta_weight) == pytest.approx((fitness[0], total_weight[0]))
+
+
+@pytest.mark.parametrize('evaluator_class', [BatchFitnessEvaluator, TTPObjectiveEvaluator])
+@pytest.mark.parametrize('crossover_name', ['single_point', 'two_point', 'arithmetic', 'uniform'])
+@pytest.mark.parametrize('genome', ['list', 'packed'])
+def test_crossover_then_mutation_matches_full_evaluation(eil51, eil51_route, evaluator_class, crossover_name, genome):
+    # The steady-state path of the GA loop: total the crossed child, add the mutation's flips, repair, score
+    random.seed(7)
+    np.random.seed(7)
+    evaluator = evaluator_class(eil51, eil51_route, eil51.tour_length(eil51_route))
+    crossover_methods = CrossoverMethods()
+    mutation_types = MutationTypes(mutation_rate=0.2)
+    mutate = mutation_types.mutator('bit_flip_mutation')
+    repair_operator = RepairOperator(eil51)
+
+    plans = random_plans(12, len(evaluator.values), 0.4, seed=8)
+    for first, second in zip(plans[::2], plans[1::2]):
+        parents = [(eil51_route, PackedPlan.from_bool(plan) if genome == 'packed' else plan.astype(int).tolist()) for plan in (first, second)]
+        child = crossover_methods.crossover(crossover_name, *parents)
+        value, weight = evaluator.plan_totals(child[1])
+        child = mutate(child)
+        delta_value, delta_weight = evaluator.flip_delta(child[1], mutation_types.flipped_indices)
+        value, weight = value + delta_value, weight + delta_weight
+
+        removed = []
+        repaired, weight = repair_operator.repair(child[1], evaluator, weight, removed)
+        value -= evaluator.values[removed].sum()
+        picked = np.asarray(repaired) == 1
+        assert weight <= eil51.capacity
+        fitness, total_weight = evaluator.evaluate(picked[None, :])
+        assert evaluator.score(repaired, value, weight) == pytest.approx((fitness[0], total_weight[0]))
@@ -0,0 +1,54 @@
+# Description: Tests of the experiment sweep: the grid of cells, the resume from a results file and a small sweep end to end.
+
+# Importing required libraries
+import json
+from conftest import EIL51
+from experiment_sweep import build_grid, cell_key, load_completed, run_sweep
+
+
+def test_build_grid_expands_globs_and_every_setting(tmp_path):
+    for name in ('b.txt', 'a.txt', 'c.csv'):
+        (tmp_path / name).write_text('')
+    cells = build_grid([str(tmp_path / '*.txt'), 'missing.txt'], seeds=[0, 1], populations=[10, 20], mutations=[0.05],
+                       generations=[100], objective='ttp')
+
+    # Sorted glob matches, and a pattern matching nothing kept as a file name
+    assert sorted({cell['file'] for cell in cells}) == sorted([str(tmp_path / 'a.txt'), str(tmp_path / 'b.txt'), 'missing.txt'])
+    assert len(cells) == 3 * 2 * 2
+    assert len({cell_key(cell) for cell in cells}) == len(cells)
+    assert cells[0] == {'file': str(tmp_path / 'a.txt'), 'seed': 0, 'population': 10, 'mutation': 0.05, 'generations': 100, 'objective': 'ttp'}
+    # Seeds vary fastest, so the runs of one configuration are next to each other
+    assert [cell['seed'] for cell in cells[:4]] == [0, 1, 0, 1]
+
+
+def test_load_completed_skips_finished_cells_but_not_failed_ones(tmp_path):
+    cells = build_grid(['eil51.txt'], seeds=[0, 1, 2, 3], populations=[10], mutations=[0.05], generations=[5], objective='profit')
+    output = tmp_path / 'results.jsonl'
+    finished = dict(cells[0], key=cell_key(cells[0]), best_fitness=1.0)
+    failed = dict(cells[1], key=cell_key(cells[1]), status='failed', error='ValueError: boom')
+    # A later success of a cell that failed before counts
+    retried = dict(cells[2], key=cell_key(cells[2]), best_fitness=2.0)
+    lines = [json.dumps(finished), json.dumps(failed), json.dumps(dict(retried, status='failed', error='x')), json.dumps(retried)]
+    # The last line was cut off by a killed run
+    output.write_text('\n'.join(lines) + '\n' + json.dumps(dict(cells[3], key=cell_key(cells[3])))[:20])
+
+    assert load_completed(str(output)) == {cell_key(cells[0]), cell_key(cells[2])}
+    assert load_completed(str(tmp_path / 'missing.jsonl')) == set()
+
+
+def test_run_sweep_records_results_and_reruns_only_failed_cells(tmp_path):
+    output = str(tmp_path / 'results.jsonl')
+    cells = build_grid([EIL51, str(tmp_path / 'missing.ttp')], seeds=[0], populations=[10], mutations=[0.05], generations=[5],
+                       objective='profit')
+    run_sweep(cells, output, workers=1)
+    with open(output) as f:
+        results = {result['file']: result for result in map(json.loads, f)}
+    assert results[EIL51]['generations_run'] == 5 and 'status' not in results[EIL51]
+    assert results[str(tmp_path / 'missing.ttp')]['status'] == 'failed'
+
+    # The resumed sweep only runs the failed cell again
+    run_sweep(cells, output, workers=1)
+    with open(output) as f:
+        keys = [json.loads(line)['key'] for line in f]
+    assert keys.count(cell_key(cells[0])) == 1
+    assert keys.count(cell_key(cells[1])) == 2
@@ -0,0 +1,72 @@
+# Description: Tests of the batch fitness evaluators against the scalar fitness function and a reference TTP objective.
+
+# Importing required libraries
+import numpy as np
+import pytest
+from conftest import random_plans
+from fitness_function import BatchFitnessEvaluator, TTPObjectiveEvaluator, calculate_fitness, picking_plans_to_matrix
+from bitset_genome import pack_population
+
+
+def test_batch_evaluator_matches_calculate_fitness(eil51, eil51_route):
+    distance = eil51.tour_length(eil51_route)
+    evaluator = BatchFitnessEvaluator(eil51, eil51_route, distance)
+    # Dense plans go over capacity, so the sequential fallback is covered as well
+    plans = np.vstack([random_plans(20, len(evaluator.values), 0.2, seed=1), random_plans(20, len(evaluator.values), 0.9, seed=2)])
+    assert (plans @ evaluator.weights > eil51.capacity).any()
+
+    fitness, weight = evaluator.evaluate(plans)
+    for row, plan in enumerate(plans):
+        expected_fitness, expected_weight = calculate_fitness((eil51_route, plan.astype(int).tolist()), eil51, distance)
+        assert fitness[row] == expected_fitness
+        assert weight[row] == expected_weight
+
+
+def test_picking_plans_to_matrix_reads_lists_and_packed_plans(eil51_route):
+    plans = random_plans(5, 50, seed=3)
+    population = [(eil51_route, plan.astype(int).tolist()) for plan in plans]
+    assert np.array_equal(picking_plans_to_matrix(population), plans)
+
+    packed = [(eil51_route, plan) for plan in pack_population(plans)]
+    assert np.array_equal(picking_plans_to_matrix(packed), plans)
+
+
+# reference_ttp_objective function walks the closed tour leg by leg, the way the TTP objective is defined
+def reference_ttp_objective(ttp_solver, route, picked_items):
+    speed_drop = (ttp_solver.max_speed - ttp_solver.min_speed) / ttp_solver.capacity
+    items = np.asarray(ttp_solver.items, dtype=np.float64)
+    item_cities = ttp_solver.item_index.item_cities
+    profit, weight, travel_time = 0.0, 0.0, 0.0
+    for leg in range(len(route) - 1):
+        for item in np.flatnonzero(picked_items & (item_cities == route[leg])):
+            profit += items[item, 0]
+            weight += items[item, 1]
+        speed = max(ttp_solver.min_speed, ttp_solver.max_speed - speed_drop * weight)
+        travel_time += ttp_solver.distance(route[leg], route[leg + 1]) / speed
+    return profit - ttp_solver.renting_ratio * travel_time, weight
+
+
+def test_ttp_objective_matches_reference_loop(eil51, eil51_route, multi_item_solver, multi_item_route):
+    for ttp_solver, route in ((eil51, eil51_route), (multi_item_solver, multi_item_route)):
+        evaluator = TTPObjectiveEvaluator(ttp_solver, route, ttp_solver.tour_length(route))
+        plans = random_plans(25, len(evaluator.values), 0.3, seed=4)
+        objective, weight = evaluator.evaluate(plans)
+        for row, plan in enumerate(plans):
+            picked_items = np.zeros(ttp_solver.num_items, dtype=bool)
+            picked_items[evaluator.layout.items[plan]] = True
+            expected_objective, expected_weight = reference_ttp_objective(ttp_solver, route, picked_items)
+            assert objective[row] == pytest.approx(expected_objective, abs=0.01)
+            assert weight[row] == pytest.approx(expected_weight)
+
+
+def test_ttp_objective_charges_the_return_leg_with_the_full_knapsack(eil51, eil51_route):
+    evaluator = TTPObjectiveEvaluator(eil51, eil51_route, eil51.tour_length(eil51_route))
+    # Only the last item of the tour: every leg but the way back to the depot is travelled empty
+    plan = np.zeros((1, len(evaluator.values)), dtype=bool)
+    plan[0, -1] = True
+    weight = evaluator.weights[-1]
+    speed = eil51.max_speed - (eil51.max_speed - eil51.min_speed) / eil51.capacity * weight
+    return_leg = eil51.distance(eil51_route[-2], eil51_route[-1])
+    travel_time = (eil51.tour_length(eil51_route) - return_leg) / eil51.max_speed + return_leg / speed
+    objective, _ = evaluator.evaluate(plan)
+    assert objective[0] == pytest.approx(evaluator.values[-1] - eil51.renting_ratio * travel_time, abs=0.01)
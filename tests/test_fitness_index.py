@@ -0,0 +1,58 @@
+# Description: Tests of the fitness index against list scans and the inverse-fitness weights it samples from.
+
+# Importing required libraries
+import random
+import numpy as np
+import pytest
+from fitness_index import FitnessIndex, INVERSE_EPSILON
+
+
+def test_fitness_index_tracks_updates():
+    rng = random.Random(12)
+    # Integer fitness values, so ties and negative scores both show up
+    fitness_scores = [rng.randint(-5, 20) for _ in range(40)]
+    fitness_index = FitnessIndex(fitness_scores)
+    for _ in range(300):
+        index = rng.randrange(len(fitness_scores))
+        fitness_scores[index] = rng.randint(-5, 20)
+        fitness_index.update(index, fitness_scores[index])
+
+        assert fitness_index.lowest() == fitness_scores.index(min(fitness_scores))
+        assert fitness_index.highest() == fitness_scores.index(max(fitness_scores))
+        ranked = sorted(range(len(fitness_scores)), key=lambda i: (fitness_scores[i], i))
+        assert [fitness_index.at_rank(rank) for rank in range(len(ranked))] == ranked
+        assert fitness_index.lowest_ranks(5) == ranked[:5]
+
+
+def test_sample_inverse_follows_the_inverse_weights():
+    random.seed(13)
+    fitness_scores = [0.5, 1.0, 3.0, 10.0, 40.0]
+    fitness_index = FitnessIndex(fitness_scores)
+    # Updated after the tree is built, so the point updates are sampled as well
+    fitness_index.sample_inverse()
+    fitness_index.update(3, 2.0)
+    fitness_scores[3] = 2.0
+
+    weights = 1 / (np.asarray(fitness_scores) + INVERSE_EPSILON)
+    draws = 50000
+    counts = np.bincount([fitness_index.sample_inverse()[0] for _ in range(draws)], minlength=len(fitness_scores))
+    assert counts / draws == pytest.approx(weights / weights.sum(), abs=0.01)
+
+
+def test_sample_inverse_draws_distinct_indices():
+    random.seed(14)
+    fitness_index = FitnessIndex([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+    for _ in range(200):
+        chosen = fitness_index.sample_inverse(4)
+        assert len(set(chosen)) == 4
+    assert sorted(fitness_index.sample_inverse(10)) == list(range(6))
+
+
+def test_sample_inverse_never_draws_the_excluded_index():
+    random.seed(27)
+    fitness_index = FitnessIndex([1.0, 2.0, 3.0, 4.0, 5.0])
+    for _ in range(200):
+        assert 0 not in fitness_index.sample_inverse(2, exclude=0)
+    assert sorted(fitness_index.sample_inverse(10, exclude=4)) == [0, 1, 2, 3]
+    # The excluded weight is back in the tree afterwards
+    assert 4 in fitness_index.sample_inverse(5)
@@ -0,0 +1,59 @@
+# Description: Tests of the batched (mu+lambda) generation: breed scores its children right and replace_batch keeps the best.
+
+# Importing required libraries
+import itertools
+import random
+import numpy as np
+import pytest
+from fitness_function import BatchFitnessEvaluator, TTPObjectiveEvaluator
+from genetic_algorithm import GeneticAlgorithm
+
+POPULATION_SIZE = 30
+
+
+# seeded_population function is used to build a scored population on eil51 with a fresh GA
+def seeded_population(eil51, evaluator_class, genome: str, seeding: str = 'random'):
+    random.seed(26)
+    np.random.seed(26)
+    ga = GeneticAlgorithm(POPULATION_SIZE, 0.05, 10, genome=genome, seeding=seeding)
+    population, distance = ga.initialize_population(eil51.cities, eil51.num_items, eil51.items, eil51, evaluator_class)
+    evaluator = evaluator_class(eil51, population.route, distance)
+    population.set_scores(*evaluator.evaluate(population.matrix()))
+    return ga, population, evaluator
+
+
+@pytest.mark.parametrize('evaluator_class', [BatchFitnessEvaluator, TTPObjectiveEvaluator])
+@pytest.mark.parametrize('genome', ['list', 'packed'])
+def test_breed_scores_match_evaluate(eil51, evaluator_class, genome):
+    ga, population, evaluator = seeded_population(eil51, evaluator_class, genome)
+    # Every selection, crossover and mutation strategy once
+    for selection, crossover, mutation in zip(range(4), range(4), range(4)):
+        children, fitness, weight = ga.breed(population, evaluator, eil51, 12, (selection, crossover, mutation, 0, 0))
+        assert children.shape == (12, eil51.num_items)
+        assert (weight <= eil51.capacity).all()
+        expected_fitness, expected_weight = evaluator.evaluate(children)
+        assert np.array_equal(fitness, expected_fitness)
+        assert np.array_equal(weight, expected_weight)
+        assert np.array_equal(weight, children @ evaluator.weights)
+
+
+@pytest.mark.parametrize('replacement', range(len(GeneticAlgorithm.REPLACEMENT_STRATEGIES)))
+@pytest.mark.parametrize('offspring', [4, POPULATION_SIZE, 2 * POPULATION_SIZE])
+def test_replace_batch_keeps_the_size_and_the_best(eil51, replacement, offspring):
+    ga, population, evaluator = seeded_population(eil51, TTPObjectiveEvaluator, 'list')
+    stage = ga.get_pipeline()[(0, 0, 0, replacement, 0)]
+    for state in itertools.islice(itertools.cycle(range(4)), 8):
+        best_fitness = population.best_fitness()
+        best_plan = population.rows([population.best_index()])[0]
+        children, fitness, weight = ga.breed(population, evaluator, eil51, offspring, (state, state, state, replacement, 0))
+        stage.replace_batch(population, population.fitness_scores, children, fitness, weight, population.weights)
+
+        assert len(population) == len(population.fitness_scores) == len(population.weights) == POPULATION_SIZE
+        assert population.best_fitness() >= best_fitness
+        # The best plan is still in the population, or a child beat it
+        assert population.best_fitness() > best_fitness or (population.matrix() == best_plan).all(axis=1).any()
+        # The cached columns and the fitness index follow the written rows
+        expected_fitness, expected_weight = evaluator.evaluate(population.matrix())
+        assert np.array_equal(population.fitness_scores, expected_fitness)
+        assert np.array_equal(population.weights, expected_weight)
+        assert population.ranking().fitness == population.fitness_scores
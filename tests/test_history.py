@@ -0,0 +1,114 @@
+# Description: Tests of the bounded-memory generation history: ring buffer order, the geometric sample and the spill file.
+
+# Importing required libraries
+import numpy as np
+import pytest
+from history import RingBuffer, GeometricSample, SpillFile, GenerationHistory, read_history
+
+
+def test_ring_buffer_keeps_the_last_values_oldest_first():
+    ring = RingBuffer(4)
+    for value in range(3):
+        ring.append(value)
+    assert len(ring) == 3
+    assert ring.last(10).tolist() == [0, 1, 2]
+
+    # Past its capacity the ring overwrites the oldest values and still reads them back in order
+    for value in range(3, 10):
+        ring.append(value)
+    assert len(ring) == 4
+    assert ring.last(4).tolist() == [6, 7, 8, 9]
+    assert ring.last(2).tolist() == [8, 9]
+    ring.set_last(-1)
+    assert ring.last(4).tolist() == [6, 7, 8, -1]
+
+
+@pytest.mark.parametrize('length', [1, 7, 8, 9, 100, 1000, 4097])
+def test_geometric_sample_spans_the_series_within_its_capacity(length):
+    capacity = 8
+    sample = GeometricSample(capacity)
+    for position in range(length):
+        sample.append(position, float(position) * 2)
+        assert len(sample) <= capacity
+    positions, values = sample.sample()
+
+    # The first and the latest point are always kept, the ones between them evenly spaced
+    assert positions[0] == 0 and positions[-1] == length - 1
+    assert np.all(np.diff(positions[:-1]) == sample.stride)
+    assert np.all(np.diff(positions[-2:]) <= sample.stride)
+    assert values.tolist() == (positions * 2.0).tolist()
+    if length > capacity:
+        assert len(sample) >= capacity // 2
+
+
+def test_geometric_sample_set_last_only_changes_the_sampled_last_point():
+    sample = GeometricSample(4)
+    for position in range(6):
+        sample.append(position, 1.0)
+    # Stride 2 after the first halving: 0, 2 and 4 are on the stride and the latest point, 5, is in the free slot
+    assert sample.sample()[0].tolist() == [0, 2, 4, 5]
+    sample.set_last(4, 9.0)
+    assert sample.sample()[1].tolist() == [1.0, 1.0, 1.0, 1.0]
+    sample.set_last(5, 9.0)
+    assert sample.sample()[1].tolist() == [1.0, 1.0, 1.0, 9.0]
+    # The next point replaces it, here after the stride doubles again
+    sample.append(6, 2.0)
+    assert sample.sample()[0].tolist() == [0, 4, 6]
+
+
+def test_spill_file_round_trip_across_chunks(tmp_path):
+    path = str(tmp_path / 'history' / 'spill.bin')
+    spill = SpillFile(path, chunk=4)
+    for generation in range(10):
+        spill.append((generation, generation * 1.5, generation * 2.0))
+    spill.set_last('best_fitness', -1.0)
+    spill.close()
+
+    records = read_history(path)
+    assert records['generation'].tolist() == list(range(10))
+    assert records['best_fitness'].tolist() == [generation * 1.5 for generation in range(9)] + [-1.0]
+    assert records['max_weight'].tolist() == [generation * 2.0 for generation in range(10)]
+
+
+def test_spill_file_resume_keeps_the_first_records(tmp_path):
+    path = str(tmp_path / 'spill.bin')
+    spill = SpillFile(path, chunk=4)
+    for generation in range(6):
+        spill.append((generation, 0.0, 0.0))
+    spill.close()
+
+    # A resume from generation 3 drops the records after it and continues behind the kept ones
+    spill = SpillFile(path, chunk=4, resume=3)
+    spill.append((3, 7.0, 0.0))
+    spill.close()
+    records = read_history(path)
+    assert records['generation'].tolist() == [0, 1, 2, 3]
+    assert records['best_fitness'].tolist() == [0.0, 0.0, 0.0, 7.0]
+
+
+def test_empty_spill_reads_back_empty(tmp_path):
+    path = str(tmp_path / 'spill.bin')
+    SpillFile(path).close()
+    assert len(read_history(path)) == 0
+
+
+def test_generation_history_state_round_trip(tmp_path):
+    path = str(tmp_path / 'spill.bin')
+    history = GenerationHistory(window=4, samples=8, spill=path)
+    for generation in range(20):
+        history.record(generation, float(generation), float(generation % 5))
+    history.set_last_best(-1.0)
+
+    # The run ends (or dies) before the resumed one opens the spill file again
+    state = history.state()
+    history.close()
+    resumed = GenerationHistory.from_state(state, spill=path)
+    for generation in range(20, 25):
+        resumed.record(generation, float(generation), 0.0)
+    resumed.close()
+
+    series = resumed.series()
+    assert series.length == 25
+    assert resumed.max_weight == 4.0
+    assert resumed.recent_best.last(4).tolist() == [21.0, 22.0, 23.0, 24.0]
+    assert read_history(path)['best_fitness'].tolist() == [float(generation) for generation in range(19)] + [-1.0] + [20.0, 21.0, 22.0, 23.0, 24.0]
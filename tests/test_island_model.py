@@ -0,0 +1,53 @@
+# Description: Tests of the island model: every island of a short run reports its result, and a failing island stops the run with its error.
+
+# Importing required libraries
+import os
+import numpy as np
+import pytest
+import island_model
+from conftest import EIL51
+from island_model import run_island_model
+
+POPULATION_SIZE = 12
+MUTATION_RATE = 0.05
+GENERATIONS = 30
+
+
+# run function is used to run a two-island model on eil51 with the test settings
+def run(**options):
+    return run_island_model(EIL51, 2, POPULATION_SIZE, MUTATION_RATE, GENERATIONS, migration_interval=10, seed=5, **options)
+
+
+def test_two_islands_each_return_a_result(eil51, monkeypatch):
+    # The parent collects the islands' results, so they can be caught on their way to run_island_model
+    collected = []
+    collect_results = island_model._collect_results
+    monkeypatch.setattr(island_model, '_collect_results', lambda *args: collected.extend(collect_results(*args)) or collected)
+
+    best_fitness_history, best_fitness, best_solution, max_weight = run()
+    assert len(collected) == 2
+    for history, fitness, (route, picking_plan), weight in collected:
+        assert history.length == GENERATIONS
+        assert route[0] == route[-1] == 0 and sorted(route[:-1]) == list(range(eil51.num_cities))
+        assert len(picking_plan) == eil51.num_items
+        assert fitness == history.best_fitness.max()
+
+    # The best island's result is returned, with the heaviest plan seen on any island
+    assert best_fitness == max(result[1] for result in collected)
+    assert np.array_equal(best_fitness_history.best_fitness, max(collected, key=lambda result: result[1])[0].best_fitness)
+    assert best_solution[1] == max(collected, key=lambda result: result[1])[2][1]
+    assert max_weight == max(result[3] for result in collected)
+
+
+def test_island_error_is_reported_with_its_traceback():
+    # Every island builds its repair operator from the settings and raises
+    with pytest.raises(RuntimeError, match=r"Island \d failed") as error:
+        run(repair='unknown')
+    assert "Repair ordering 'unknown' is not supported." in str(error.value)
+
+
+def test_island_that_dies_is_reported(monkeypatch):
+    # _exit skips the worker's own error reporting, as a killed process would
+    monkeypatch.setattr(island_model, '_island_worker', lambda *args: os._exit(3))
+    with pytest.raises(RuntimeError, match=r"Island \d exited with code 3 without a result."):
+        run()
@@ -0,0 +1,50 @@
+# Description: Tests of the item-to-city index and the tour layout against plain loops over the items.
+
+# Importing required libraries
+import numpy as np
+import pytest
+from item_index import ItemIndex
+
+
+def test_items_of_city_matches_a_scan(multi_item_solver):
+    item_index = multi_item_solver.item_index
+    for city in range(item_index.num_cities):
+        expected = [item for item in range(item_index.num_items) if item_index.item_cities[item] == city]
+        assert item_index.items_of_city(city).tolist() == expected
+
+
+def test_from_assigned_nodes_puts_node_zero_on_the_depot():
+    item_index = ItemIndex.from_assigned_nodes(np.array([0, 1, 2, 2, 4]), 4)
+    assert item_index.item_cities.tolist() == [0, 0, 1, 1, 3]
+    assert item_index.items_of_city(2).tolist() == []
+    with pytest.raises(ValueError):
+        ItemIndex.from_assigned_nodes(np.array([2, 5]), 4)
+
+
+def test_tour_layout_follows_the_route(multi_item_solver, multi_item_route):
+    item_index = multi_item_solver.item_index
+    layout = item_index.tour_layout(multi_item_route)
+    expected_items, expected_stops = [], []
+    for stop, city in enumerate(multi_item_route[:-1]):
+        for item in range(item_index.num_items):
+            if item_index.item_cities[item] == city:
+                expected_items.append(item)
+                expected_stops.append(stop)
+    assert layout.items.tolist() == expected_items
+    assert layout.stops.tolist() == expected_stops
+    for stop in range(len(multi_item_route) - 1):
+        assert (layout.stops[layout.offsets[stop]:layout.offsets[stop + 1]] == stop).all()
+    assert layout.offsets[-1] == item_index.num_items
+
+    # Cached by route identity, a new route list gets a new layout
+    assert item_index.tour_layout(multi_item_route) is layout
+    reversed_route = multi_item_route[::-1]
+    assert item_index.tour_layout(reversed_route).items.tolist() != expected_items
+
+
+def test_city_totals_sums_per_city(multi_item_solver):
+    item_index = multi_item_solver.item_index
+    values = np.random.default_rng(8).uniform(0, 5, (3, item_index.num_items))
+    totals = item_index.city_totals(values)
+    for city in range(item_index.num_cities):
+        assert totals[:, city] == pytest.approx(values[:, item_index.item_cities == city].sum(axis=1))
@@ -0,0 +1,60 @@
+# Description: Tests of the operator pipeline: every Q-learning state resolves to the stage of its own operators.
+
+# Importing required libraries
+import itertools
+import random
+import numpy as np
+import pytest
+from genetic_algorithm import GeneticAlgorithm
+from operator_pipeline import OperatorPipeline, Stage
+
+STRATEGY_LISTS = (GeneticAlgorithm.SELECTION_STRATEGIES, GeneticAlgorithm.CROSSOVER_STRATEGIES, GeneticAlgorithm.MUTATION_STRATEGIES,
+                  GeneticAlgorithm.REPLACEMENT_STRATEGIES, GeneticAlgorithm.ROUTE_STRATEGIES)
+
+
+@pytest.fixture
+def pipeline(eil51) -> OperatorPipeline:
+    return OperatorPipeline(GeneticAlgorithm(10, 0.1, 1), eil51)
+
+
+# called_operators function is used to run the steady-state operators of a stage once and read back which ones were timed
+def called_operators(pipeline: OperatorPipeline, stage: Stage, route: list, num_items: int) -> set:
+    random.seed(0)
+    np.random.seed(0)
+    plan = [random.randint(0, 1) for _ in range(num_items)]
+    stage.select([float(score) for score in range(10)])
+    child = stage.crossover((route, plan), (route, plan[::-1]))
+    stage.mutate(child)
+    stage.route(route, plan)
+    return set(pipeline.timing_report())
+
+
+def test_every_state_has_a_stage(pipeline):
+    assert len(pipeline.stages) == np.prod([len(strategies) for strategies in STRATEGY_LISTS])
+    assert set(pipeline.stages) == set(itertools.product(*(range(len(strategies)) for strategies in STRATEGY_LISTS)))
+
+
+@pytest.mark.parametrize('state', [(0, 0, 0, 0, 0), (1, 2, 3, 1, 2), (3, 1, 2, 2, 1), (2, 3, 1, 3, 3)])
+def test_state_resolves_to_its_operators(pipeline, eil51, eil51_route, state):
+    # Q-learning states come out of NumPy as int64 components
+    stage = pipeline[np.array(state, dtype=np.int64)]
+    assert stage is pipeline.stages[state]
+
+    s, c, m, r, o = state
+    expected = {f"selection:{STRATEGY_LISTS[0][s]}", f"crossover:{STRATEGY_LISTS[1][c]}", f"mutation:{STRATEGY_LISTS[2][m]}",
+                f"route:{STRATEGY_LISTS[4][o]}"}
+    assert called_operators(pipeline, stage, list(eil51_route), eil51.num_items) == expected
+
+
+def test_stages_share_one_operator_and_its_timing(pipeline):
+    # The replacement list names replace_lowest_fitness twice, both states use the same resolved function
+    first, second = [index for index, name in enumerate(GeneticAlgorithm.REPLACEMENT_STRATEGIES) if name == 'replace_lowest_fitness']
+    assert pipeline[(0, 0, 0, first, 0)].replace is pipeline.replacement[first][0]
+    assert pipeline[(0, 0, 0, first, 0)].select is pipeline[(0, 1, 2, second, 3)].select
+    assert 'replacement:replace_lowest_fitness' in pipeline.timings
+    assert len([name for name in pipeline.timings if name.startswith('replacement:')]) == len(set(GeneticAlgorithm.REPLACEMENT_STRATEGIES))
+
+
+def test_unknown_state_is_rejected(pipeline):
+    with pytest.raises(KeyError):
+        pipeline[(len(GeneticAlgorithm.SELECTION_STRATEGIES), 0, 0, 0, 0)]
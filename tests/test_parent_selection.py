@@ -0,0 +1,95 @@
+# Description: Tests of the batched parent selection kernels: the distribution of every kernel drawn from a fitness index.
+
+# Importing required libraries
+import numpy as np
+import pytest
+from fitness_index import FitnessIndex
+from parent_selection import ParentSelectionStrategies
+
+NUM_INDIVIDUALS = 200
+
+
+# draw function is used to collect the parents of many pairs from one kernel, in batches of num_pairs
+def draw(kernel_name: str, ranking: FitnessIndex, num_pairs: int, batches: int) -> np.ndarray:
+    kernel = ParentSelectionStrategies().batch_methods[kernel_name]
+    return np.concatenate([kernel(ranking, num_pairs).ravel() for _ in range(batches)])
+
+
+@pytest.fixture
+def shuffled_scores() -> np.ndarray:
+    np.random.seed(17)
+    return np.random.permutation(NUM_INDIVIDUALS).astype(np.float64)
+
+
+# Large batches and many one-pair calls draw from the same index
+@pytest.mark.parametrize('num_pairs, batches', [(10000, 1), (2, 5000)])
+def test_rank_selection_draws_rank_r_with_weight_one_over_r(shuffled_scores, num_pairs, batches):
+    parents = draw('rank_selection', FitnessIndex(shuffled_scores), num_pairs, batches)
+    counts = np.bincount(parents, minlength=NUM_INDIVIDUALS)
+    ranks = np.argsort(-shuffled_scores)
+
+    weights = 1.0 / np.arange(1, NUM_INDIVIDUALS + 1)
+    assert counts[ranks[:5]] / len(parents) == pytest.approx(weights[:5] / weights.sum(), abs=0.01)
+    assert counts.argmax() == shuffled_scores.argmax()
+
+
+@pytest.mark.parametrize('kernel_name', ['roulette_wheel_selection', 'stochastic_universal_sampling'])
+def test_proportional_kernels_follow_the_shifted_scores(kernel_name):
+    np.random.seed(18)
+    # A negative score shifts the wheel, so the lowest individual is never drawn
+    fitness_scores = [-4.0, 0.0, 6.0, 16.0, 36.0, 46.0]
+    parents = draw(kernel_name, FitnessIndex(fitness_scores), 5, 4000)
+    shifted = np.asarray(fitness_scores) - min(fitness_scores)
+    counts = np.bincount(parents, minlength=len(fitness_scores))
+    assert counts / len(parents) == pytest.approx(shifted / shifted.sum(), abs=0.01)
+    assert counts[0] == 0
+
+
+@pytest.mark.parametrize('kernel_name', ['roulette_wheel_selection', 'stochastic_universal_sampling'])
+def test_proportional_kernels_follow_updates(kernel_name):
+    np.random.seed(19)
+    ranking = FitnessIndex([1.0, 1.0, 1.0, 1.0])
+    draw(kernel_name, ranking, 1, 1)
+    # After the tree is built, point updates move the wheel without a rebuild
+    ranking.update(2, 7.0)
+    parents = draw(kernel_name, ranking, 5, 4000)
+    counts = np.bincount(parents, minlength=4)
+    assert counts / len(parents) == pytest.approx([0.1, 0.1, 0.7, 0.1], abs=0.01)
+
+
+def test_stochastic_universal_sampling_spreads_one_spin():
+    np.random.seed(20)
+    # Equal scores: one spin with 10 evenly spaced pointers lands on every individual exactly twice
+    parents = draw('stochastic_universal_sampling', FitnessIndex([3.0] * 5), 5, 1)
+    assert np.bincount(parents, minlength=5).tolist() == [2] * 5
+
+
+def test_all_zero_scores_draw_uniformly():
+    np.random.seed(21)
+    parents = draw('roulette_wheel_selection', FitnessIndex([0.0] * 4), 5, 2000)
+    assert np.bincount(parents, minlength=4) / len(parents) == pytest.approx([0.25] * 4, abs=0.02)
+
+
+def test_tournament_top_10_pairs_a_top_parent_with_a_lower_one(shuffled_scores):
+    pairs = draw('tournament_top_10', FitnessIndex(shuffled_scores), 20000, 1).reshape(-1, 2)
+    top = set(np.argsort(-shuffled_scores)[:10].tolist())
+    assert set(pairs[:, 0].tolist()) == top
+    assert not set(pairs[:, 1].tolist()) & top
+    # Both parents are uniform over their part of the population
+    assert np.bincount(pairs[:, 0], minlength=NUM_INDIVIDUALS)[list(top)] / len(pairs) == pytest.approx([0.1] * 10, abs=0.01)
+    assert len(set(pairs[:, 1].tolist())) == NUM_INDIVIDUALS - 10
+
+
+def test_truncation_takes_the_two_lowest_scores():
+    pairs = draw('truncation_selection', FitnessIndex([5.0, 1.0, 3.0, 1.0, 9.0]), 4, 1).reshape(-1, 2)
+    # Ties are broken by index, like list.index(min(...))
+    assert pairs.tolist() == [[1, 3]] * 4
+
+
+def test_tournament_selection_takes_the_lowest_entrant():
+    np.random.seed(22)
+    fitness_scores = np.arange(10, dtype=np.float64)
+    parents = draw('tournament_selection', FitnessIndex(fitness_scores), 20000, 1)
+    # Index i wins when it is drawn with two higher entrants: C(9 - i, 2) of the C(10, 3) tournaments
+    expected = np.array([(9 - i) * (8 - i) / 2 for i in range(10)]) / 120
+    assert np.bincount(parents, minlength=10) / len(parents) == pytest.approx(expected, abs=0.01)
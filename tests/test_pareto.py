@@ -0,0 +1,79 @@
+# Description: Tests of the bi-objective tools against brute-force front peeling and a profit-level hypervolume sweep.
+
+# Importing required libraries
+import numpy as np
+import pytest
+from pareto import non_dominated_sort, hypervolume, select_survivors, ParetoArchive
+
+
+# random_points function is used to draw integer (profit, time) points, so ties and duplicates show up
+def random_points(num_points: int, seed: int):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 15, num_points).astype(np.float64), rng.integers(1, 15, num_points).astype(np.float64)
+
+
+# reference_fronts function peels the front off the points one by one, checking every pair
+def reference_fronts(profit, time) -> np.ndarray:
+    def dominates(a, b):
+        return profit[a] >= profit[b] and time[a] <= time[b] and (profit[a] > profit[b] or time[a] < time[b])
+
+    ranks = np.full(len(profit), -1)
+    remaining = set(range(len(profit)))
+    front = 0
+    while remaining:
+        current = {b for b in remaining if not any(dominates(a, b) for a in remaining)}
+        for index in current:
+            ranks[index] = front
+        remaining -= current
+        front += 1
+    return ranks
+
+
+# reference_hypervolume function sums horizontal strips between consecutive profit levels
+def reference_hypervolume(profit, time, reference_time, reference_profit=0.0) -> float:
+    area = 0.0
+    levels = np.unique(np.append(profit[profit > reference_profit], reference_profit))
+    for lower, upper in zip(levels, levels[1:]):
+        fastest = time[profit >= upper].min()
+        area += (upper - lower) * max(reference_time - fastest, 0.0)
+    return area
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_non_dominated_sort_matches_peeling(seed):
+    profit, time = random_points(60, seed)
+    assert np.array_equal(non_dominated_sort(profit, time), reference_fronts(profit, time))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_hypervolume_matches_the_strip_sum(seed):
+    profit, time = random_points(40, seed)
+    assert hypervolume(profit, time, 12.0, 2.0) == pytest.approx(reference_hypervolume(profit, time, 12.0, 2.0))
+    assert hypervolume(profit, time, 0.5) == 0.0
+
+
+def test_select_survivors_keeps_whole_fronts_first():
+    profit, time = random_points(50, 5)
+    ranks = reference_fronts(profit, time)
+    survivors = select_survivors(profit, time, 20)
+    assert len(set(survivors.tolist())) == 20
+    # Every point of a better front than the last one taken survives
+    assert set(np.flatnonzero(ranks < ranks[survivors].max())) <= set(survivors.tolist())
+
+
+def test_archive_holds_the_first_front():
+    profit, time = random_points(80, 6)
+    archive = ParetoArchive()
+    for start in range(0, 80, 16):
+        archive.insert_batch(time[start:start + 16], profit[start:start + 16], payload=lambda row: row)
+    front = reference_fronts(profit, time) == 0
+    expected = sorted(set(zip(time[front].tolist(), profit[front].tolist())))
+    front_time, front_profit = archive.front()
+    assert list(zip(front_time.tolist(), front_profit.tolist())) == expected
+    assert archive.hypervolume(16.0) == pytest.approx(hypervolume(profit, time, 16.0))
+
+    # A copy does not see later inserts
+    snapshot = archive.copy()
+    assert archive.insert(0.0, 100.0)
+    assert len(archive) == 1
+    assert len(snapshot) == len(expected)
@@ -0,0 +1,67 @@
+# Description: Tests of the batched Q-learning update and its Watkins's Q(lambda) traces on hand-computed values.
+
+# Importing required libraries
+import numpy as np
+import pytest
+from Q_learning import QLearning
+
+# (state, action, reward, next state) on 2 components with 2 strategies: state index c0 * 2 + c1, action index component * 2 + value
+TRANSITIONS = [((0, 0), (0, 1), 1.0, (1, 0)),
+               ((1, 0), (1, 1), 2.0, (1, 1)),
+               ((1, 1), (0, 0), 4.0, (0, 1))]
+
+
+# learner function is used to build a learner with learning rate 0.5 and discount 0.9, and feed it the transitions
+def learner(trace_decay: float, batch_size: int, q_values: dict = None) -> QLearning:
+    q_learning = QLearning(learning_rate=0.5, discount_factor=0.9, num_components=2, num_strategies=2,
+                           trace_decay=trace_decay, batch_size=batch_size)
+    for cell, value in (q_values or {}).items():
+        q_learning.q_table[cell] = value
+    for transition in TRANSITIONS:
+        q_learning.update(*transition)
+    return q_learning
+
+
+def test_lambda_zero_window_equals_one_step_updates():
+    # q[2, 0] = 1 makes the second action exploratory and gives the first transition a non-zero next-state maximum
+    sequential = learner(0.0, 1, {(2, 0): 1.0})
+    batched = learner(0.0, 3, {(2, 0): 1.0})
+    assert batched.pending == 0
+    assert np.array_equal(batched.q_table, sequential.q_table)
+    # TD errors 1 + 0.9 * 1 = 1.9, 2 and 4, each times the learning rate
+    assert sequential.q_table[0, 1] == pytest.approx(0.95)
+    assert sequential.q_table[2, 3] == pytest.approx(1.0)
+    assert sequential.q_table[3, 0] == pytest.approx(2.0)
+
+
+def test_greedy_window_passes_decayed_td_errors_back():
+    q_learning = learner(0.5, 3)
+    # TD errors 1, 2 and 4; every action is greedy on an all-zero table, so each earlier transition takes the later
+    # errors times (0.9 * 0.5)^lag
+    assert q_learning.q_table[0, 1] == pytest.approx(0.5 * (1 + 0.45 * 2 + 0.45 ** 2 * 4))
+    assert q_learning.q_table[2, 3] == pytest.approx(0.5 * (2 + 0.45 * 4))
+    assert q_learning.q_table[3, 0] == pytest.approx(0.5 * 4)
+
+
+def test_exploratory_action_cuts_the_traces_before_it():
+    q_learning = learner(0.5, 3, {(2, 0): 1.0})
+    # The second action is not the best of its state: the first transition keeps only its own TD error of 1.9,
+    # while the second one still takes the decayed error of the greedy third one
+    assert q_learning.q_table[0, 1] == pytest.approx(0.5 * 1.9)
+    assert q_learning.q_table[2, 3] == pytest.approx(0.5 * (2 + 0.45 * 4))
+    assert q_learning.q_table[3, 0] == pytest.approx(0.5 * 4)
+    assert q_learning.q_table[2, 0] == 1.0
+
+
+def test_pending_window_survives_a_checkpoint():
+    q_learning = QLearning(learning_rate=0.5, discount_factor=0.9, num_components=2, num_strategies=2, trace_decay=0.5, batch_size=4)
+    for transition in TRANSITIONS:
+        q_learning.update(*transition)
+    assert q_learning.pending == 3 and not q_learning.q_table.any()
+
+    restored = QLearning(learning_rate=0.5, discount_factor=0.9, num_components=2, num_strategies=2, trace_decay=0.5, batch_size=4)
+    restored.restore(q_learning.state())
+    q_learning.flush()
+    restored.flush()
+    assert np.array_equal(restored.q_table, q_learning.q_table)
+    assert np.array_equal(q_learning.q_table, learner(0.5, 3).q_table)
@@ -0,0 +1,57 @@
+# Description: Tests of the repair operator: every ordering drops items by its keys, and the matrix repair agrees with the single plan one.
+
+# Importing required libraries
+import numpy as np
+import pytest
+from conftest import random_plans
+from fitness_function import BatchFitnessEvaluator
+from repair import RepairOperator
+from bitset_genome import PackedPlan
+
+ORDERINGS = ['heaviest', 'ratio', 'distance_ratio']
+
+
+@pytest.fixture(scope='module')
+def evaluator(eil51, eil51_route):
+    return BatchFitnessEvaluator(eil51, eil51_route, eil51.tour_length(eil51_route))
+
+
+@pytest.mark.parametrize('ordering', ORDERINGS)
+def test_repair_drops_the_highest_keys_until_the_plan_fits(eil51, evaluator, ordering):
+    repair_operator = RepairOperator(eil51, ordering)
+    keys = repair_operator.drop_keys(evaluator)
+    for plan in random_plans(10, len(evaluator.weights), 0.8, seed=9):
+        picking_plan = plan.astype(int).tolist()
+        removed = []
+        repaired, weight = repair_operator.repair(picking_plan, evaluator, removed_indices=removed)
+        picked = np.asarray(repaired) == 1
+        assert weight == pytest.approx(evaluator.weights @ picked)
+        assert weight <= eil51.capacity
+        # Dropped in key order, and the plan was still over capacity before the last drop
+        assert all(keys[first] >= keys[second] for first, second in zip(removed, removed[1:]))
+        assert weight + evaluator.weights[removed[-1]] > eil51.capacity
+        # No item left in the plan ranks above a dropped one
+        assert keys[picked].max() <= keys[removed[-1]]
+
+
+def test_repair_keeps_a_plan_that_fits(eil51, evaluator):
+    plan = random_plans(1, len(evaluator.weights), 0.05, seed=10)[0].astype(int).tolist()
+    repaired, weight = RepairOperator(eil51).repair(list(plan), evaluator)
+    assert repaired == plan
+    assert weight <= eil51.capacity
+
+
+@pytest.mark.parametrize('ordering', ORDERINGS)
+def test_repair_matrix_matches_repair(eil51, evaluator, ordering):
+    repair_operator = RepairOperator(eil51, ordering)
+    plans = random_plans(30, len(evaluator.weights), 0.6, seed=11)
+    repaired, totals = repair_operator.repair_matrix(plans, evaluator)
+    for row, plan in enumerate(plans):
+        expected, expected_weight = repair_operator.repair(PackedPlan.from_bool(plan), evaluator)
+        assert np.array_equal(repaired[row], expected.to_bool())
+        assert totals[row] == pytest.approx(expected_weight)
+
+
+def test_unknown_ordering_is_rejected(eil51):
+    with pytest.raises(ValueError):
+        RepairOperator(eil51, 'lightest')
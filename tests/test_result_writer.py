@@ -0,0 +1,74 @@
+# Description: Tests of the output subsystem: the metrics log round trip through read_metrics and the background writer.
+
+# Importing required libraries
+import numpy as np
+import pytest
+from result_writer import MetricsLog, ResultWriter, read_metrics
+
+POPULATION_SIZE = 5
+
+
+# population_scores function is used to make the fitness and weight rows of one generation
+def population_scores(generation: int):
+    fitness = [generation * 10.0 + index for index in range(POPULATION_SIZE)]
+    weights = [generation + index * 0.5 for index in range(POPULATION_SIZE)]
+    return fitness, weights
+
+
+# write_log function is used to record generations start..stop - 1 into a metrics log and close it
+def write_log(log: MetricsLog, start: int, stop: int):
+    for generation in range(start, stop):
+        log.record(generation, *population_scores(generation), reverted=generation % 3 == 0)
+    log.close()
+
+
+@pytest.mark.parametrize('with_writer', [False, True])
+def test_metrics_log_round_trip(tmp_path, with_writer):
+    writer = ResultWriter() if with_writer else None
+    path = str(tmp_path / 'metrics')
+    # Blocks of 4 generations: two full blocks and a partial one written on close
+    write_log(MetricsLog(path, POPULATION_SIZE, writer, block=4), 0, 10)
+    if writer is not None:
+        assert writer.close() == []
+
+    generations, scores = read_metrics(path)
+    assert generations['generation'].tolist() == list(range(10))
+    assert generations['reverted'].tolist() == [generation % 3 == 0 for generation in range(10)]
+    assert scores.shape == (10, 2, POPULATION_SIZE)
+    for generation in range(10):
+        fitness, weights = population_scores(generation)
+        assert scores[generation, 0].tolist() == fitness
+        assert scores[generation, 1].tolist() == weights
+        assert generations['best_fitness'][generation] == max(fitness)
+        assert generations['mean_fitness'][generation] == pytest.approx(np.mean(fitness))
+        assert generations['max_weight'][generation] == max(weights)
+
+
+def test_metrics_log_resume_drops_the_generations_after_the_checkpoint(tmp_path):
+    path = str(tmp_path / 'metrics')
+    write_log(MetricsLog(path, POPULATION_SIZE, block=4), 0, 10)
+
+    # A run checkpointed at generation 6 and killed later: the resumed log keeps 0-5 and continues from there
+    write_log(MetricsLog(path, POPULATION_SIZE, block=4, resume=6), 6, 12)
+    generations, scores = read_metrics(path)
+    assert generations['generation'].tolist() == list(range(12))
+    assert [row[0].tolist() for row in scores] == [population_scores(generation)[0] for generation in range(12)]
+
+
+def test_new_metrics_log_replaces_an_old_one(tmp_path):
+    path = str(tmp_path / 'metrics')
+    write_log(MetricsLog(path, POPULATION_SIZE), 0, 10)
+    MetricsLog(path, POPULATION_SIZE).close()
+    generations, scores = read_metrics(path)
+    assert len(generations) == 0
+    assert scores.shape == (0, 2, POPULATION_SIZE)
+
+
+def test_result_writer_keeps_running_after_a_failed_task():
+    writer = ResultWriter()
+    done = []
+    writer.submit(lambda: 1 / 0)
+    writer.submit(done.append, 'after')
+    errors = writer.close()
+    assert done == ['after']
+    assert len(errors) == 1 and isinstance(errors[0], ZeroDivisionError)
@@ -0,0 +1,83 @@
+# Description: Tests of the route generator: the candidate-graph MST weighs as much as the dense one and the DFS visits every city once.
+
+# Importing required libraries
+import sys
+import numpy as np
+import pytest
+import route_generator
+from route_generator import construct_mst_dense, construct_mst_fast, dfs_traversal, generate_route
+
+
+# mst_weight function is used to sum the edge lengths of an MST given as an adjacency list (every edge listed twice)
+def mst_weight(adj_list, points: np.ndarray) -> float:
+    total = 0.0
+    for node, neighbours in enumerate(adj_list):
+        for neighbour in neighbours:
+            total += np.hypot(*(points[node] - points[neighbour]))
+    return total / 2
+
+
+# assert_spanning_tree function is used to check an adjacency list is a tree over all the points
+def assert_spanning_tree(adj_list, n: int):
+    assert sum(len(neighbours) for neighbours in adj_list) == 2 * (n - 1)
+    assert sorted(dfs_traversal(adj_list)) == list(range(n))
+
+
+# Uniform points, and tight clusters far apart so the 10-nearest candidate graph falls apart into pieces
+@pytest.fixture(params=['uniform', 'clustered'])
+def points(request) -> np.ndarray:
+    rng = np.random.default_rng(11)
+    if request.param == 'uniform':
+        return rng.uniform(0, 1000, (400, 2))
+    centres = rng.uniform(0, 100000, (6, 2))
+    return np.concatenate([centre + rng.uniform(0, 50, (40, 2)) for centre in centres])
+
+
+def test_fast_mst_weighs_as_much_as_the_dense_mst(points):
+    dense = construct_mst_dense(points)
+    fast = construct_mst_fast(points)
+    assert_spanning_tree(dense, len(points))
+    assert_spanning_tree(fast, len(points))
+    assert mst_weight(fast, points) == pytest.approx(mst_weight(dense, points), rel=1e-12)
+
+
+def test_fast_mst_from_a_neighbour_table_and_without_scipy(points, monkeypatch):
+    expected = mst_weight(construct_mst_dense(points), points)
+    # The neighbour table of a TTPSolver has no self column
+    order = np.argsort(np.hypot(*(points[None, :, :] - points[:, None, :]).transpose(2, 0, 1)), axis=1)
+    from_table = construct_mst_fast(points, neighbours=order[:, 1:11])
+    assert mst_weight(from_table, points) == pytest.approx(expected, rel=1e-12)
+
+    # Without scipy the bridges between pieces of the candidate graph are found by scanning distance rows
+    monkeypatch.setattr(route_generator, 'cKDTree', None)
+    without_scipy = construct_mst_fast(points, neighbours=order[:, 1:11])
+    assert mst_weight(without_scipy, points) == pytest.approx(expected, rel=1e-12)
+
+
+def test_eil51_route_visits_every_city_once(eil51):
+    route = generate_route(eil51.cities, eil51.neighbour_table())
+    assert route[0] == route[-1] == 0
+    assert sorted(route[:-1]) == list(range(eil51.num_cities))
+
+
+def test_dfs_traversal_matches_the_recursive_order():
+    # recursive_dfs function is used as the reference pre-order walk
+    def recursive_dfs(adj_list, node, visited, route):
+        visited[node] = True
+        route.append(node)
+        for neighbour in adj_list[node]:
+            if not visited[neighbour]:
+                recursive_dfs(adj_list, neighbour, visited, route)
+        return route
+
+    adj_list = construct_mst_dense(np.random.default_rng(12).uniform(0, 100, (60, 2)))
+    assert dfs_traversal(adj_list) == recursive_dfs(adj_list, 0, [False] * len(adj_list), [])
+    assert dfs_traversal(adj_list, start=7) == recursive_dfs(adj_list, 7, [False] * len(adj_list), [])
+
+
+def test_dfs_traversal_walks_a_tree_deeper_than_the_recursion_limit():
+    # A path graph: every node is one level deeper than the one before
+    n = sys.getrecursionlimit() * 2
+    adj_list = [[node - 1, node + 1] for node in range(n)]
+    adj_list[0], adj_list[-1] = [1], [n - 2]
+    assert dfs_traversal(adj_list) == list(range(n))
@@ -0,0 +1,91 @@
+# Description: Tests of the route operators: valid tours, no lost length or objective, don't-look bits and plan remapping.
+
+# Importing required libraries
+import random
+import numpy as np
+import pytest
+from conftest import random_plans
+from route_optimization import RouteOptimizer, remap_picking_plans, ttp_objective_for_routes
+
+
+# random_route function is used to draw a poor closed tour from the depot, so the operators have moves to make
+def random_route(num_cities: int, seed: int) -> list:
+    rng = np.random.default_rng(seed)
+    route = [0] + (rng.permutation(num_cities - 1) + 1).tolist()
+    return route + [0]
+
+
+# item_picks function is used to turn a plan in tour order into picks indexed by item id
+def item_picks(ttp_solver, route, picking_plan) -> np.ndarray:
+    picks = np.zeros(ttp_solver.num_items)
+    picks[ttp_solver.tour_items(route).items] = np.asarray(picking_plan) == 1
+    return picks
+
+
+def assert_valid_tour(route, num_cities):
+    assert route[0] == route[-1] == 0
+    assert sorted(route[:-1]) == list(range(num_cities))
+
+
+@pytest.mark.parametrize('method_name', ['two_opt', 'or_opt'])
+def test_local_search_keeps_a_tour_and_never_adds_length(eil51, method_name):
+    for seed in range(3):
+        route_optimizer = RouteOptimizer(eil51)
+        route = random_route(eil51.num_cities, seed)
+        picking_plan = random_plans(1, eil51.num_items, 0.3, seed=seed)[0].astype(int).tolist()
+        length = eil51.tour_length(route)
+        # Repeated calls search only the cities woken up by the previous moves
+        for _ in range(3):
+            new_route, new_plan = route_optimizer.optimize(method_name, route, picking_plan)
+            assert_valid_tour(new_route, eil51.num_cities)
+            assert eil51.tour_length(new_route) <= length + 1e-6
+            # Every item keeps its picked status on the new tour
+            assert np.array_equal(item_picks(eil51, new_route, new_plan), item_picks(eil51, route, picking_plan))
+            route, picking_plan, length = new_route, new_plan, eil51.tour_length(new_route)
+        assert length < eil51.tour_length(random_route(eil51.num_cities, seed))
+
+
+def test_two_opt_bitflip_never_lowers_the_ttp_objective(eil51):
+    random.seed(23)
+    route_optimizer = RouteOptimizer(eil51)
+    route = random_route(eil51.num_cities, 4)
+    # An empty knapsack is within capacity, the bitflip moves then pick items one at a time
+    picking_plan = [0] * eil51.num_items
+    objective = ttp_objective_for_routes(eil51, np.asarray(route), item_picks(eil51, route, picking_plan))[0]
+    for _ in range(20):
+        route, picking_plan = route_optimizer.optimize('two_opt_bitflip', route, picking_plan)
+        assert_valid_tour(route, eil51.num_cities)
+        picks = item_picks(eil51, route, picking_plan)
+        assert picks @ np.asarray(eil51.items)[:, 1] <= eil51.capacity
+        new_objective = ttp_objective_for_routes(eil51, np.asarray(route), picks)[0]
+        assert new_objective >= objective - 1e-6
+        objective = new_objective
+    assert any(picking_plan)
+
+
+def test_restored_dont_look_bits_search_the_rejected_tour_again(eil51):
+    route_optimizer = RouteOptimizer(eil51)
+    route = random_route(eil51.num_cities, 6)
+    picking_plan = [0] * eil51.num_items
+    state = route_optimizer.state()
+    improved, _ = route_optimizer.two_opt(route, picking_plan)
+    assert improved is not route
+
+    # Without the restore the cities are all looked at already, and the same tour comes back unchanged
+    assert route_optimizer.two_opt(route, picking_plan)[0] is route
+    # A revert puts the bits back with the tour, so the search finds the same moves again
+    route_optimizer.restore(state)
+    assert route_optimizer.two_opt(route, picking_plan)[0] == improved
+    # The restored state is a copy, searching did not change the saved one
+    assert all(state['queued'][name] == [True] * eil51.num_cities for name in state['queued'])
+
+
+def test_remap_picking_plans_keeps_every_item_picked_status(multi_item_solver, multi_item_route):
+    item_index = multi_item_solver.item_index
+    plans = random_plans(6, item_index.num_items, 0.5, seed=24)
+    new_route = random_route(multi_item_solver.num_cities, 25)
+    remapped = remap_picking_plans(plans, multi_item_route, new_route, item_index)
+    for plan, new_plan in zip(plans, remapped):
+        assert np.array_equal(item_picks(multi_item_solver, new_route, new_plan), item_picks(multi_item_solver, multi_item_route, plan))
+    # And back again to the original layout
+    assert np.array_equal(remap_picking_plans(remapped, new_route, multi_item_route, item_index), plans)
@@ -0,0 +1,54 @@
+# Description: Tests of the run budget: what it counts as a fitness evaluation and when it stops a run.
+
+# Importing required libraries
+import numpy as np
+from conftest import random_plans
+from fitness_function import TTPObjectiveEvaluator
+from route_optimization import RouteOptimizer
+from run_budget import RunBudget
+
+
+def test_budget_counts_evaluator_rows_and_scores(eil51, eil51_route):
+    budget = RunBudget(max_evaluations=30)
+    evaluator = budget.instrument_evaluator(TTPObjectiveEvaluator(eil51, eil51_route, eil51.tour_length(eil51_route)))
+    plans = random_plans(25, len(evaluator.values), seed=15)
+    evaluator.evaluate(plans)
+    assert budget.evaluations == 25
+    assert not budget.exhausted(1, 0.0)
+
+    evaluator.score(plans[0], *evaluator.plan_totals(plans[0]))
+    assert budget.evaluations == 26
+    evaluator.evaluate(plans[:4])
+    assert budget.exhausted(2, 0.0)
+    assert budget.report()['stop_reason'] == 'evaluations'
+
+
+def test_budget_counts_route_operator_rows(eil51, eil51_route):
+    route_optimizer = RouteOptimizer(eil51)
+    # Rows actually scored, counted from the results independently of the budget
+    scored = []
+    route_objectives = route_optimizer.route_objectives
+
+    def recorded_route_objectives(routes, item_picks):
+        objectives = route_objectives(routes, item_picks)
+        scored.append(len(np.atleast_1d(objectives)))
+        return objectives
+    route_optimizer.route_objectives = recorded_route_objectives
+
+    budget = RunBudget()
+    budget.instrument_route_optimizer(route_optimizer)
+    picking_plan = random_plans(1, eil51.num_items, 0.2, seed=16)[0].astype(int).tolist()
+    route = list(eil51_route)
+    for _ in range(5):
+        route, picking_plan = route_optimizer.optimize('two_opt_bitflip', route, picking_plan)
+    assert scored
+    assert budget.evaluations == sum(scored)
+
+
+def test_budget_stops_on_stagnation():
+    budget = RunBudget(stagnation=3)
+    assert not budget.exhausted(0, 1.0)
+    assert not budget.exhausted(2, 1.0)
+    assert not budget.exhausted(3, 2.0)
+    assert budget.exhausted(6, 2.0)
+    assert budget.report()['stop_reason'] == 'stagnation'
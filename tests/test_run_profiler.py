@@ -0,0 +1,67 @@
+# Description: Tests of the run profiler: per-generation evaluation counts and phase timings, and the JSONL and CSV traces.
+
+# Importing required libraries
+import csv
+import json
+import random
+import numpy as np
+import pytest
+from conftest import EIL51, random_plans
+from fitness_function import BatchFitnessEvaluator
+from genetic_algorithm import GeneticAlgorithm
+from main import run_genetic_algorithm
+from operator_pipeline import OperatorPipeline
+from run_profiler import PHASES, RunProfiler
+
+
+# read_trace function is used to load the rows of a JSONL or CSV trace as dictionaries
+def read_trace(path: str) -> list:
+    with open(path, newline='') as f:
+        if path.endswith('.csv'):
+            return [{name: float(value) for name, value in row.items()} for row in csv.DictReader(f)]
+        return [json.loads(line) for line in f]
+
+
+@pytest.mark.parametrize('extension', ['jsonl', 'csv'])
+def test_evaluations_and_phases_are_counted_per_generation(tmp_path, eil51, eil51_route, extension):
+    path = str(tmp_path / f'trace.{extension}')
+    pipeline = OperatorPipeline(GeneticAlgorithm(10, 0.1, 1), eil51)
+    profiler = RunProfiler(path, pipeline, capacity=2)
+    evaluator = profiler.instrument_evaluator(BatchFitnessEvaluator(eil51, eil51_route, eil51.tour_length(eil51_route)))
+
+    # Generation 0: one matrix of 7 plans and one single plan; generation 1: a selection call of the pipeline
+    plans = random_plans(7, eil51.num_items)
+    evaluator.evaluate(plans)
+    plan = plans[0].astype(int).tolist()
+    evaluator.score(plan, *evaluator.plan_totals(plan))
+    profiler.end_generation(0, 1.0)
+    pipeline.stages[(0, 0, 0, 0, 0)].select(list(range(10)))
+    profiler.end_generation(1, 2.0)
+    profiler.end_generation(2, 3.0)
+    totals = profiler.close()
+
+    rows = read_trace(path)
+    assert [row['generation'] for row in rows] == [0, 1, 2]
+    assert [row['evaluations'] for row in rows] == [8, 0, 0]
+    assert [row['total_evaluations'] for row in rows] == [8, 8, 8]
+    assert totals['evaluations'] == 8
+    # plan_totals is timed with the evaluations but not counted as one
+    assert [row['evaluation_calls'] for row in rows] == [3, 0, 0]
+    assert [row['selection_calls'] for row in rows] == [0, 1, 0]
+    assert all(row[f'{phase}_calls'] == 0 for row in rows for phase in PHASES if phase not in ('evaluation', 'selection'))
+    assert rows[0]['evaluation_s'] > 0 and rows[1]['selection_s'] > 0
+
+
+def test_profiled_run_writes_one_row_per_generation(tmp_path):
+    path = str(tmp_path / 'trace.jsonl')
+    random.seed(2)
+    np.random.seed(2)
+    generations = 25
+    run_genetic_algorithm('test', EIL51, 10, 0.05, generations, 'ttp', profile=path)
+
+    rows = read_trace(path)
+    # Row 0 covers initialization, the last row the work after the last generation
+    assert [row['generation'] for row in rows] == list(range(generations + 1))
+    assert rows[0]['evaluations'] > 0
+    assert np.array_equal(np.cumsum([row['evaluations'] for row in rows]), [row['total_evaluations'] for row in rows])
+    assert sum(row['selection_calls'] for row in rows) == generations
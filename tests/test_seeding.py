@@ -0,0 +1,52 @@
+# Description: Tests of the greedy seeding: the packed plans fit the knapsack and start ahead of random repaired plans.
+
+# Importing required libraries
+import numpy as np
+import pytest
+from conftest import random_plans
+from fitness_function import BatchFitnessEvaluator, TTPObjectiveEvaluator
+from repair import RepairOperator
+from seeding import greedy_pack, pack_iterative, seed_picking_plans
+
+POPULATION_SIZE = 30
+
+
+@pytest.fixture(params=[BatchFitnessEvaluator, TTPObjectiveEvaluator], ids=['profit', 'ttp'])
+def evaluator(request, eil51, eil51_route):
+    return request.param(eil51, eil51_route, eil51.tour_length(eil51_route))
+
+
+def test_greedy_pack_fills_in_score_order_within_capacity():
+    scores = np.array([[5.0, 4.0, 3.0, 2.0, 1.0, 0.0],
+                       [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]])
+    weights = np.array([4.0, 5.0, 1.0, 2.0, 3.0, 1.0])
+    picking_plans, order = greedy_pack(scores, weights, np.array([6.0, 10.0]))
+    assert order.tolist() == [[0, 1, 2, 3, 4, 5], [5, 4, 3, 2, 1, 0]]
+    # Row 0: item 1 does not fit behind item 0 and is dropped, the next pass packs item 2; item 5 has no score
+    assert picking_plans[0].tolist() == [True, False, True, False, False, False]
+    # Row 1: items 5, 4, 3, 2 fit (7 of 10), item 1 does not fit the 3 left and item 0 has no score
+    assert picking_plans[1].tolist() == [False, False, True, True, True, True]
+    assert np.all(picking_plans @ weights <= [6.0, 10.0])
+
+
+def test_pack_iterative_plan_fits_capacity(eil51, evaluator):
+    carried_distance = np.maximum(eil51.carried_distances(evaluator.route), 1e-9)
+    plan, theta, _ = pack_iterative(evaluator, carried_distance, eil51.capacity)
+    assert plan.dtype == bool and plan.any()
+    assert evaluator.weights @ plan <= eil51.capacity
+    assert theta >= 0.0
+
+
+def test_seeded_plans_fit_and_beat_random_repaired_plans(eil51, evaluator):
+    np.random.seed(13)
+    seeded = seed_picking_plans(eil51, evaluator, POPULATION_SIZE)
+    assert seeded.shape == (POPULATION_SIZE, eil51.num_items)
+    assert np.all(seeded @ evaluator.weights <= eil51.capacity)
+    seeded_fitness, _ = evaluator.evaluate(seeded)
+
+    random_repaired, _ = RepairOperator(eil51).repair_matrix(random_plans(POPULATION_SIZE, eil51.num_items, density=0.5, seed=13), evaluator)
+    random_fitness, _ = evaluator.evaluate(random_repaired)
+
+    # The PackIterative plan in row 0 is the best seed and beats every random plan
+    assert seeded_fitness[0] == seeded_fitness.max()
+    assert seeded_fitness[0] > random_fitness.max()
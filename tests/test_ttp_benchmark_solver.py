@@ -0,0 +1,79 @@
+# Description: Tests of the streaming benchmark parser and its memory-mapped binary cache.
+
+# Importing required libraries
+import os
+import shutil
+import numpy as np
+import pytest
+from conftest import EIL51
+from ttp_benchmark_solver import parse_instance, load_instance, CACHE_VERSION
+
+
+# assert_same_instance function is used to compare two parsed instances field by field
+def assert_same_instance(instance: dict, expected: dict):
+    assert instance.keys() == expected.keys()
+    for key, value in expected.items():
+        if isinstance(value, np.ndarray):
+            assert np.array_equal(np.asarray(instance[key]), value)
+        else:
+            assert instance[key] == value
+
+
+# Tab separated with CRLF line ends and a trailing space, like the bundled instances
+SMALL_INSTANCE = ('PROBLEM NAME: \tsmall-TTP\r\nDIMENSION:\t3\r\nNUMBER OF ITEMS: \t2\r\nCAPACITY OF KNAPSACK: \t15\r\n'
+                  'MIN SPEED: \t0.1\r\nMAX SPEED: \t1\r\nRENTING RATIO: \t2.5\r\nEDGE_WEIGHT_TYPE:\tCEIL_2D\r\n'
+                  'NODE_COORD_SECTION\t(INDEX, X, Y): \r\n1\t0\t0\r\n2\t3\t4\r\n3\t6\t0\r\n'
+                  'ITEMS SECTION\t(INDEX, PROFIT, WEIGHT, ASSIGNED NODE NUMBER): \r\n1\t20\t7\t2\r\n2\t30\t9\t3 \r\n')
+
+
+def test_parse_instance_reads_header_and_sections(tmp_path):
+    filename = tmp_path / 'small.ttp'
+    filename.write_bytes(SMALL_INSTANCE.encode())
+    instance = parse_instance(str(filename))
+    assert instance['name'] == 'small-TTP'
+    assert (instance['dimension'], instance['num_items'], instance['capacity']) == (3, 2, 15)
+    assert (instance['min_speed'], instance['max_speed'], instance['renting_ratio']) == (0.1, 1.0, 2.5)
+    assert instance['edge_weight_type'] == 'CEIL_2D'
+    assert instance['coordinates'].tolist() == [[0, 0], [3, 4], [6, 0]]
+    assert instance['items'].tolist() == [[20, 7], [30, 9]]
+    assert instance['assigned_nodes'].tolist() == [2, 3]
+
+    # A city count that disagrees with DIMENSION is reported
+    filename.write_bytes(SMALL_INSTANCE.replace('DIMENSION:\t3', 'DIMENSION:\t4').encode())
+    with pytest.raises(ValueError):
+        parse_instance(str(filename))
+
+
+def test_load_instance_writes_then_maps_the_cache(tmp_path):
+    expected = parse_instance(EIL51)
+    cache_dir = str(tmp_path / 'cache')
+
+    assert_same_instance(load_instance(EIL51, cache_dir), expected)
+    entries = os.listdir(cache_dir)
+    assert len(entries) == 1 and entries[0].startswith(f"{os.path.basename(EIL51)}.v{CACHE_VERSION}.")
+
+    # The second load reads the entry back, with the arrays memory-mapped
+    cached = load_instance(EIL51, cache_dir)
+    assert_same_instance(cached, expected)
+    assert isinstance(cached['items'], np.memmap)
+    assert os.listdir(cache_dir) == entries
+
+
+def test_changed_file_gets_a_new_cache_entry(tmp_path):
+    filename = str(tmp_path / os.path.basename(EIL51))
+    shutil.copy(EIL51, filename)
+    cache_dir = str(tmp_path / 'cache')
+    load_instance(filename, cache_dir)
+
+    with open(filename, 'rb') as f:
+        text = f.read()
+    with open(filename, 'wb') as f:
+        f.write(text.replace(b'CAPACITY OF KNAPSACK: \t4029', b'CAPACITY OF KNAPSACK: \t5029', 1))
+    assert load_instance(filename, cache_dir)['capacity'] == 5029
+    assert len(os.listdir(cache_dir)) == 2
+
+
+def test_use_cache_false_writes_nothing(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    assert_same_instance(load_instance(EIL51, cache_dir, use_cache=False), parse_instance(EIL51))
+    assert not os.path.exists(cache_dir)
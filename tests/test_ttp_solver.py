@@ -0,0 +1,61 @@
+# Description: Tests of the TTPSolver distance cache: the dense matrix and the on-demand path of large instances give the same distances.
+
+# Importing required libraries
+import math
+import numpy as np
+import pytest
+import ttp_solver as ttp_solver_module
+from ttp_solver import TTPSolver
+
+
+# on_demand function is used to build a copy of a solver that has no dense matrix, as an instance above the limit would
+def on_demand(solver: TTPSolver, monkeypatch) -> TTPSolver:
+    monkeypatch.setattr(ttp_solver_module, 'DENSE_MATRIX_LIMIT', 0)
+    copy = TTPSolver(solver.coordinates, solver.items, solver.capacity, solver.min_speed, solver.max_speed,
+                     solver.renting_ratio, solver.edge_weight_type)
+    assert copy.distance_matrix is None
+    return copy
+
+
+# A float32 matrix and coordinates in the thousands, where EUC_2D distances are not exact in float32
+@pytest.fixture
+def euclidean_solver() -> TTPSolver:
+    coordinates = np.random.default_rng(5).uniform(0, 5000, (60, 2))
+    return TTPSolver(coordinates, [(1.0, 1.0)], 10.0, 0.1, 1.0, 1.0, edge_weight_type='EUC_2D')
+
+
+def test_ceil_2d_distances_are_rounded_up_euclidean(eil51, monkeypatch):
+    assert eil51.edge_weight_type == 'CEIL_2D'
+    sparse = on_demand(eil51, monkeypatch)
+    for city1 in range(eil51.num_cities):
+        for city2 in range(eil51.num_cities):
+            (x1, y1), (x2, y2) = eil51.cities[city1], eil51.cities[city2]
+            expected = math.ceil(math.hypot(x1 - x2, y1 - y2))
+            assert eil51.distance(city1, city2) == expected
+            assert sparse.distance(city1, city2) == expected
+
+
+@pytest.mark.parametrize('solver_name', ['eil51', 'euclidean_solver'])
+def test_dense_and_on_demand_distances_agree(solver_name, request, monkeypatch):
+    dense = request.getfixturevalue(solver_name)
+    assert dense.distance_matrix is not None
+    sparse = on_demand(dense, monkeypatch)
+    pairs = np.array([(city1, city2) for city1 in range(dense.num_cities) for city2 in range(dense.num_cities)])
+
+    # Scalar lookups, array lookups and the neighbour distances all give the float32 matrix entries
+    assert [sparse.distance(city1, city2) for city1, city2 in pairs.tolist()] == dense.distance_matrix[pairs[:, 0], pairs[:, 1]].tolist()
+    assert np.array_equal(sparse.distances(pairs[:, 0], pairs[:, 1]), dense.distances(pairs[:, 0], pairs[:, 1]))
+    assert np.array_equal(sparse.neighbour_table(), dense.neighbour_table())
+    assert np.array_equal(sparse.neighbour_distances(), dense.neighbour_distances())
+
+
+def test_neighbour_distances_follow_the_neighbour_table(euclidean_solver):
+    table = euclidean_solver.neighbour_table(8)
+    distances = euclidean_solver.neighbour_distances(8)
+    assert distances.shape == table.shape and distances.dtype == np.float32
+    for city, row in enumerate(table.tolist()):
+        assert distances[city].tolist() == [euclidean_solver.distance(city, neighbour) for neighbour in row]
+    # Closest first
+    assert np.all(np.diff(distances, axis=1) >= 0)
+    # A shorter table is a prefix of the longer one
+    assert np.array_equal(euclidean_solver.neighbour_distances(3), distances[:, :3])
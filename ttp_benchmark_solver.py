@@ -1,79 +1,164 @@
 # Description: This file contains the functions to read the benchmark files and generate the items for the TTP problem.
 '''File Contains:
-    1. read_benchmark_file function: This function is used to read the benchmark file and extract the required data.
-    2. generate_items function: This function is used to generate the items from the given file.'''
+    1. parse_instance function: This function is used to read a benchmark file in one streaming pass into NumPy arrays.
+    2. load_instance function: This function is used to get a parsed instance from the binary cache, parsing and caching it on a miss.
+    3. read_benchmark_file function: This function is used to read the benchmark file and extract the required data.
+    4. generate_items function: This function is used to generate the items from the given file.
+    5. load_ttp_solver function: This function is used to build the TTPSolver for the given file.'''
 
 # Importing required libraries
-import random
-from typing import List,Tuple
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from typing import Dict, List, Tuple
+from ttp_solver import TTPSolver
+
+# Header fields of the benchmark format: key before the ':' -> (field name, type)
+HEADER_FIELDS = {
+    'PROBLEM NAME': ('name', str),
+    'KNAPSACK DATA TYPE': ('knapsack_data_type', str),
+    'DIMENSION': ('dimension', int),
+    'NUMBER OF ITEMS': ('num_items', int),
+    'CAPACITY OF KNAPSACK': ('capacity', int),
+    'MIN SPEED': ('min_speed', float),
+    'MAX SPEED': ('max_speed', float),
+    'RENTING RATIO': ('renting_ratio', float),
+    'EDGE_WEIGHT_TYPE': ('edge_weight_type', str),
+}
+
+# Arrays of a parsed instance, each one is cached as its own .npy file so it can be memory-mapped
+INSTANCE_ARRAYS = ('coordinates', 'items', 'assigned_nodes')
+
+# Bump when the cached layout changes, old cache entries are then simply not found
+CACHE_VERSION = 1
+
+# Cache directory used when TTP_CACHE_DIR is not set, created next to the benchmark file
+DEFAULT_CACHE_DIR = '.ttp_cache'
+
+
+# parse_instance function is used to read a benchmark file in one streaming pass into NumPy arrays
+def parse_instance(filename: str) -> Dict:
+    header = {'dimension': 0, 'num_items': 0, 'capacity': 0, 'min_speed': 0.0, 'max_speed': 0.0,
+              'renting_ratio': 0.0, 'edge_weight_type': 'EUC_2D'}
+    # Section lines are only collected while streaming, the numbers are converted once per section
+    sections = {'NODE_COORD_SECTION': [], 'ITEMS SECTION': []}
+    columns = {'NODE_COORD_SECTION': 3, 'ITEMS SECTION': 4}
+    section = None
 
-# read_benchmark_file function is used to read the benchmark file and extract the required data
-def read_benchmark_file(filename: str):
-    cities = []
-    dimension = 0
-    capacity = 0
-    min_speed = 0.0
-    max_speed = 0.0
-    renting_ratio = 0.0
-    
-    # Read the file line by line
     with open(filename, 'r') as f:
-        lines = f.readlines()
-        
-        for line in lines:
+        for line in f:
             line = line.strip()
-            if 'DIMENSION' in line:
-                dimension = int(line.split(':')[1].strip())
-            elif 'NUMBER OF ITEMS' in line:
-                items = int(line.split(':')[1].strip())
-            elif 'CAPACITY OF KNAPSACK' in line:
-                capacity = int(line.split(':')[1].strip())
-            elif 'MIN SPEED' in line:
-                min_speed = float(line.split(':')[1].strip())
-            elif 'MAX SPEED' in line:
-                max_speed = float(line.split(':')[1].strip())
-            elif 'RENTING RATIO' in line:
-                renting_ratio = float(line.split(':')[1].strip())
-            elif line and line[0].isdigit():
-                parts = line.split()
-                if len(parts) == 3:
-                    _, x, y = map(float, parts)
-                    cities.append((x, y))
-    
+            if not line:
+                continue
+            if line[0].isdigit():
+                if section is not None:
+                    sections[section].append(line)
+                continue
+            section = next((name for name in sections if line.startswith(name)), None)
+            if section is None and ':' in line:
+                key, value = line.split(':', 1)
+                field = HEADER_FIELDS.get(key.strip())
+                if field is not None:
+                    header[field[0]] = field[1](value.strip())
+
+    tables = {}
+    for name, lines in sections.items():
+        values = np.array(' '.join(lines).split(), dtype=np.float64)
+        if len(values) % columns[name]:
+            raise ValueError(f"{filename}: every line of {name} needs {columns[name]} columns")
+        tables[name] = values.reshape(-1, columns[name])
+
+    coordinates = tables['NODE_COORD_SECTION']
+    items = tables['ITEMS SECTION']
+    if header['dimension'] and len(coordinates) != header['dimension']:
+        raise ValueError(f"{filename}: DIMENSION is {header['dimension']} but {len(coordinates)} cities were read")
+
+    return dict(header,
+                coordinates=np.ascontiguousarray(coordinates[:, 1:]),
+                items=np.ascontiguousarray(items[:, 1:3]),
+                # ASSIGNED NODE NUMBER column as in the file (1-based, 0 for the dummy depot item)
+                assigned_nodes=items[:, 3].astype(np.int64))
+
+
+# _file_hash function returns the content hash that keys the cache entry of a benchmark file
+def _file_hash(filename: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# load_instance function is used to get a parsed instance from the binary cache, parsing and caching it on a miss
+def load_instance(filename: str, cache_dir: str = None, use_cache: bool = True) -> Dict:
+    """Parsed instance with the cached arrays memory-mapped read-only.
+    cache_dir defaults to $TTP_CACHE_DIR, or .ttp_cache next to the benchmark file."""
+    if not use_cache:
+        return parse_instance(filename)
+
+    if cache_dir is None:
+        cache_dir = os.environ.get('TTP_CACHE_DIR') or os.path.join(os.path.dirname(os.path.abspath(filename)), DEFAULT_CACHE_DIR)
+    entry = os.path.join(cache_dir, f"{os.path.basename(filename)}.v{CACHE_VERSION}.{_file_hash(filename)}")
+
+    if not os.path.isdir(entry):
+        instance = parse_instance(filename)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Written to a temporary directory and renamed, so parallel sweep workers never see a half-written entry
+        staging = tempfile.mkdtemp(dir=cache_dir)
+        try:
+            for key in INSTANCE_ARRAYS:
+                np.save(os.path.join(staging, f"{key}.npy"), instance[key])
+            with open(os.path.join(staging, 'header.json'), 'w') as f:
+                json.dump({key: value for key, value in instance.items() if key not in INSTANCE_ARRAYS}, f)
+            os.rename(staging, entry)
+        except OSError:
+            # Another process finished the same entry first, or the cache is not writable
+            shutil.rmtree(staging, ignore_errors=True)
+            return instance
+
+    with open(os.path.join(entry, 'header.json'), 'r') as f:
+        instance = json.load(f)
+    for key in INSTANCE_ARRAYS:
+        instance[key] = np.load(os.path.join(entry, f"{key}.npy"), mmap_mode='r')
+    return instance
+
+
+# read_benchmark_file function is used to read the benchmark file and extract the required data
+def read_benchmark_file(filename: str):
+    instance = load_instance(filename)
+
     # Return the extracted data
     return {
-        'dimension': dimension,
-        'items': items,
-        'capacity': capacity,
-        'min_speed': min_speed,
-        'max_speed': max_speed,
-        'renting_ratio': renting_ratio,
-        'cities': cities
+        'dimension': instance['dimension'],
+        'items': instance['num_items'],
+        'capacity': instance['capacity'],
+        'min_speed': instance['min_speed'],
+        'max_speed': instance['max_speed'],
+        'renting_ratio': instance['renting_ratio'],
+        'edge_weight_type': instance['edge_weight_type'],
+        'cities': [tuple(city) for city in instance['coordinates'].tolist()]
     }
 
 
 # generate_items function is used to generate the items from the given file
-def generate_items(filename: str) -> List[Tuple[int, float, float, int]]:
-    items = []
-    with open(filename, 'r') as f:
-        lines = f.readlines()
-
-    in_items_section = False
+def generate_items(filename: str) -> List[Tuple[float, float]]:
+    # (profit, weight) per line of the ITEMS SECTION, including the dummy item of the depot
+    return [tuple(item) for item in load_instance(filename)['items'].tolist()]
 
-    for line in lines:
-        line = line.strip()
-        if line.startswith('ITEMS SECTION'):
-            in_items_section = True
-            continue 
 
-        if in_items_section:
-            if not line:
-                break
-            
-            parts = line.split()
-            if len(parts) == 4:
-                profit = float(parts[1])
-                weight = float(parts[2])
-                items.append((profit, weight))
-    
-    return items
\ No newline at end of file
+# load_ttp_solver function is used to build the TTPSolver for the given file
+def load_ttp_solver(filename: str) -> TTPSolver:
+    instance = load_instance(filename)
+    return TTPSolver(
+        cities=instance['coordinates'],
+        items=instance['items'],
+        capacity=instance['capacity'],
+        min_speed=instance['min_speed'],
+        max_speed=instance['max_speed'],
+        renting_ratio=instance['renting_ratio'],
+        edge_weight_type=instance['edge_weight_type'],
+        assigned_nodes=instance['assigned_nodes']
+    )
\ No newline at end of file
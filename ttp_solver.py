@@ -4,22 +4,163 @@
     1. TTPSolver class: This class is used to solve the TTP problem by implementing the necessary functions.'''
 
 ''' Inside TTPSolver class
-    1. __init__ function: This function initializes the TTPSolver class with the given parameters.'''
+    1. __init__ function: This function initializes the TTPSolver class with the given parameters.
+    2. distance_matrix property: This property lazily builds the float32 distance matrix for small instances.
+    3. distances function: This function is used to look up or compute the distances between pairs of cities.
+    4. distance function: This function is used to get the distance between two cities.
+    5. neighbour_table function: This function is used to get the k nearest neighbours of every city.
+    6. neighbour_distances function: This function is used to get the distances to those neighbours.
+    7. route_leg_distances function: This function is used to get the distance of every leg of a route.
+    8. tour_length function: This function is used to get the total length of a route.
+    9. item_index property: This property lazily builds the city -> item ids index from the assigned nodes.
+    10. tour_items function: This function is used to get the item ids of a route in tour order.
+    11. carried_distances function: This function is used to get how far the item at every plan position is carried.'''
 
 
 # Importing required libraries
+import math
+import struct
 import numpy as np
 from typing import List, Tuple
+from item_index import ItemIndex, TourLayout
+
+# scipy is optional, without it the neighbour table is built from blocks of distance rows
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+# Instances up to this many cities get a full float32 distance matrix (36 MB at the limit)
+DENSE_MATRIX_LIMIT = 3000
+
+# Rounds a Python float to float32, so distances computed on demand equal the entries of a dense matrix
+FLOAT32 = struct.Struct('f')
 
 # TTPSolver class is used to solve the TTP problem
 class TTPSolver:
-    def __init__(self, cities: List[Tuple[int, int]], items: List[Tuple[float, float]], 
-                 capacity: float, min_speed: float, max_speed: float, renting_ratio: float):
+    def __init__(self, cities: List[Tuple[int, int]], items: List[Tuple[float, float]],
+                 capacity: float, min_speed: float, max_speed: float, renting_ratio: float,
+                 edge_weight_type: str = 'EUC_2D', distance_matrix: np.ndarray = None, neighbour_table: np.ndarray = None,
+                 assigned_nodes: np.ndarray = None):
         self.cities = cities
-        self.items = items  
+        self.items = items
         self.capacity = capacity
         self.min_speed = min_speed
         self.max_speed = max_speed
         self.renting_ratio = renting_ratio
         self.num_cities = len(cities)
-        self.num_items = len(items)
\ No newline at end of file
+        self.num_items = len(items)
+        # ASSIGNED NODE NUMBER of every item as read from the benchmark file (1-based), None when not known
+        self.assigned_nodes = assigned_nodes
+
+        # Distance cache, built on first use unless prebuilt arrays (e.g. in shared memory) are handed in
+        self.edge_weight_type = edge_weight_type
+        self.coordinates = np.asarray(cities, dtype=np.float64).reshape(-1, 2)
+        self._distance_matrix = distance_matrix
+        self._neighbour_table = neighbour_table
+        self._neighbour_distances = None
+        # Coordinates as plain floats for the scalar distance path of large instances, built on first use
+        self._points = None
+        self._item_index = None
+
+    # Euclidean distances between coordinate arrays, rounded up for the benchmark's CEIL_2D instances
+    def _compute_distances(self, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        delta = self.coordinates[sources] - self.coordinates[targets]
+        distances = np.hypot(delta[..., 0], delta[..., 1])
+        if self.edge_weight_type == 'CEIL_2D':
+            distances = np.ceil(distances)
+        return distances
+
+    @property
+    def distance_matrix(self):
+        """Full float32 distance matrix, or None when the instance is too large to hold one."""
+        if self._distance_matrix is None and self.num_cities <= DENSE_MATRIX_LIMIT:
+            index = np.arange(self.num_cities)
+            self._distance_matrix = self._compute_distances(index[:, None], index[None, :]).astype(np.float32)
+        return self._distance_matrix
+
+    def distances(self, sources, targets) -> np.ndarray:
+        """Distances between the paired cities of two index arrays."""
+        sources = np.asarray(sources, dtype=np.intp)
+        targets = np.asarray(targets, dtype=np.intp)
+        if self.distance_matrix is not None:
+            return self._distance_matrix[sources, targets].astype(np.float64)
+        return self._compute_distances(sources, targets).astype(np.float32).astype(np.float64)
+
+    def distance(self, city1: int, city2: int) -> float:
+        """One distance, the float32 value of the dense matrix whether the instance has one or not."""
+        if self.distance_matrix is not None:
+            return float(self._distance_matrix[city1, city2])
+        # Plain floats: NumPy scalars would cost microseconds per call in the route operators' inner loops
+        if self._points is None:
+            self._points = self.coordinates.tolist()
+        x1, y1 = self._points[city1]
+        x2, y2 = self._points[city2]
+        distance = math.hypot(x1 - x2, y1 - y2)
+        if self.edge_weight_type == 'CEIL_2D':
+            distance = math.ceil(distance)
+        return FLOAT32.unpack(FLOAT32.pack(distance))[0]
+
+    def neighbour_table(self, k: int = 10) -> np.ndarray:
+        """(num_cities, k) table of the k nearest other cities of every city, closest first."""
+        k = min(k, self.num_cities - 1)
+        if self._neighbour_table is None or self._neighbour_table.shape[1] < k:
+            if cKDTree is not None:
+                _, table = cKDTree(self.coordinates).query(self.coordinates, k=k + 1)
+            else:
+                table = self._neighbour_table_by_rows(k + 1)
+            self._neighbour_table = self._drop_self(table, k)
+            self._neighbour_distances = None
+        return self._neighbour_table[:, :k]
+
+    def neighbour_distances(self, k: int = 10) -> np.ndarray:
+        """(num_cities, k) float32 distances from every city to its neighbour_table(k) entries, in the same order."""
+        table = self.neighbour_table(k)
+        if self._neighbour_distances is None:
+            full_table = self._neighbour_table.astype(np.intp)
+            self._neighbour_distances = self.distances(np.arange(self.num_cities)[:, None], full_table).astype(np.float32)
+        return self._neighbour_distances[:, :table.shape[1]]
+
+    # Exact k-nearest search on blocks of distance rows, O(n^2) time but bounded memory
+    def _neighbour_table_by_rows(self, k: int, block_size: int = 512) -> np.ndarray:
+        table = np.empty((self.num_cities, k), dtype=np.intp)
+        for start in range(0, self.num_cities, block_size):
+            rows = np.arange(start, min(start + block_size, self.num_cities))
+            block = self._compute_distances(rows[:, None], np.arange(self.num_cities)[None, :])
+            nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+            order = np.argsort(np.take_along_axis(block, nearest, axis=1), axis=1, kind='stable')
+            table[rows] = np.take_along_axis(nearest, order, axis=1)
+        return table
+
+    # Duplicate coordinates can push a city out of the first column, so drop it wherever it appears
+    def _drop_self(self, table: np.ndarray, k: int) -> np.ndarray:
+        not_self = table != np.arange(self.num_cities)[:, None]
+        not_self[not_self.sum(axis=1) > k, -1] = False
+        return table[not_self].reshape(self.num_cities, k).astype(np.int32)
+
+    def route_leg_distances(self, route: List[int]) -> np.ndarray:
+        """Distance of leg i, from route[i] to route[i + 1]."""
+        route = np.asarray(route, dtype=np.intp)
+        return self.distances(route[:-1], route[1:])
+
+    def tour_length(self, route: List[int]) -> float:
+        return float(self.route_leg_distances(route).sum())
+
+    @property
+    def item_index(self) -> ItemIndex:
+        """City -> item ids index. Without assigned nodes item k is taken to be at city k."""
+        if self._item_index is None:
+            if self.assigned_nodes is not None:
+                self._item_index = ItemIndex.from_assigned_nodes(self.assigned_nodes, self.num_cities)
+            else:
+                self._item_index = ItemIndex(np.arange(self.num_items), self.num_cities)
+        return self._item_index
+
+    def tour_items(self, route: List[int]) -> TourLayout:
+        """Picking plan layout of a route: plan position p refers to item tour_items(route).items[p]."""
+        return self.item_index.tour_layout(route)
+
+    def carried_distances(self, route: List[int]) -> np.ndarray:
+        """Distance from the stop of the item at every plan position to the end of the tour."""
+        remaining_distance = np.cumsum(self.route_leg_distances(route)[::-1])[::-1]
+        return remaining_distance[self.tour_items(route).stops]
\ No newline at end of file